@@ -1,3 +1,3 @@
 """Core package for RéseauxSociaux."""
 
-__all__ = ["data_models", "graph_builder", "optimizer", "scenarios"]
+__all__ = ["attribute_index", "catalog", "compiled_graph", "data_models", "delta", "edge_store", "graph_builder", "incremental", "ingest", "lazy_attributes", "multi_source", "optimizer", "reach_index", "scenarios"]
@@ -0,0 +1,189 @@
+"""Bitmap index over influencer attributes for fast candidate filtering.
+
+Each indexed column (platform, region, gender, age bucket, fake band, risk band)
+keeps one packed bitmap per distinct value, built once when a dataset is loaded.
+Values come from the influencer table; with a lazily loaded dataset the
+audience columns still in the file are read for the indexed nodes only
+(`DeferredAttributes.frame`), without loading them into the graph.
+Filter combinations are resolved with bitwise OR within a column and AND across
+columns, so the cost of a query is a handful of vectorized operations over
+`len(graph) / 8` bytes instead of a Python scan over every node dict.
+"""
+from typing import Dict, Iterable, List, Optional
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from core.data_models import get_influencer_table
+
+# Bucket of ages below the first range, then the ranges; the AudienceFilter age
+# tree shows one checkbox per label in AGE_LABELS
+UNDER_AGE = "<18"
+AGE_BUCKETS = [("18-24", 18, 24), ("25-34", 25, 34), ("35-44", 35, 44), ("45+", 45, None)]
+AGE_LABELS = [UNDER_AGE] + [label for label, _, _ in AGE_BUCKETS]
+
+# Same thresholds as the risk borders drawn by NetworkView
+RISK_BANDS = [("low", 0.1), ("medium", 0.2), ("high", 0.3), ("critical", None)]
+
+# Fake-follower share; above 0.3 nodes are greyed out on the canvas
+FAKE_BANDS = [("clean", 0.1), ("suspect", 0.3), ("fake", None)]
+
+COLUMNS = ('platform', 'region', 'gender', 'age', 'fake', 'risk')
+# Columns a lazily loaded dataset may still hold only in its users file
+AUDIENCE_COLUMNS = ('region', 'gender', 'age')
+
+
+def _missing(value) -> bool:
+    return value is None or value == '' or (isinstance(value, float) and np.isnan(value))
+
+
+def age_bucket(age) -> Optional[str]:
+    if _missing(age):
+        return None
+    age = int(age)
+    for label, lo, hi in AGE_BUCKETS:
+        if age >= lo and (hi is None or age <= hi):
+            return label
+    return UNDER_AGE
+
+
+def _band(value, bands) -> Optional[str]:
+    if _missing(value):
+        return None
+    value = float(value)
+    for label, upper in bands:
+        if upper is None or value < upper:
+            return label
+    return None
+
+
+def _deferred_columns(graph: nx.Graph, nodes: List) -> Dict[str, List]:
+    """AUDIENCE_COLUMNS of `nodes` still in the users file of a lazily loaded graph (None where absent)."""
+    deferred = graph.graph.get('deferred_attributes')
+    columns = [c for c in AUDIENCE_COLUMNS if deferred is not None and c in deferred.columns]
+    if not columns:
+        return {}
+    frame = deferred.frame(nodes, columns).set_index('id').reindex(pd.Index(nodes, dtype=object))
+    return {c: frame[c].astype(object).where(frame[c].notna(), None).tolist() for c in columns}
+
+
+def _keys(graph: nx.Graph, nodes: List) -> Dict[str, List]:
+    """Index keys of `nodes` for each of COLUMNS, read column-wise from the influencer table (and users file)."""
+    table = get_influencer_table(graph)
+    raw = {c: table.labels(c, nodes).tolist() for c in ('platform', 'region', 'gender')}
+    raw['age'] = [None if v != v else v for v in table.values('age', nodes, default=None).tolist()]
+    # Values set on a node (edits, deltas) win over the file
+    for c, fill in _deferred_columns(graph, nodes).items():
+        raw[c] = [f if v is None else v for v, f in zip(raw[c], fill)]
+    keys = {c: [v or None for v in raw[c]] for c in ('platform', 'region', 'gender')}
+    keys['age'] = [age_bucket(v) for v in raw['age']]
+    keys['fake'] = [_band(v, FAKE_BANDS) for v in table.values('fake', nodes, default=None).tolist()]
+    keys['risk'] = [_band(v, RISK_BANDS) for v in table.values('risk', nodes, default=None).tolist()]
+    return keys
+
+
+class AttributeIndex:
+    """Column-oriented bitmap index over the node attributes of a graph.
+
+    Nodes with a missing attribute are stored under the `None` value of that
+    column and always pass a filter on it: missing data never excludes anyone.
+    """
+
+    def __init__(self, graph: nx.Graph):
+        self.nodes: List = list(graph.nodes())
+        self.size = len(self.nodes)
+        self.bitmaps: Dict[str, Dict[Optional[str], np.ndarray]] = {}
+        keys = _keys(graph, self.nodes)
+        for column in COLUMNS:
+            values = keys[column]
+            codes: Dict[Optional[str], int] = {}
+            inverse = np.fromiter((codes.setdefault(v, len(codes)) for v in values), dtype=np.int32, count=self.size)
+            self.bitmaps[column] = {v: np.packbits(inverse == code) for v, code in codes.items()}
+
+    def refresh(self, graph: nx.Graph, changed: Iterable) -> None:
+        """Patch the bitmaps after the nodes in `changed` were added, edited or removed.
+
+        Unchanged nodes keep their bits; the node order follows `graph` (removed
+        nodes drop out, new ones are appended as networkx does).
+        """
+        changed = set(changed)
+        old_pos = {n: i for i, n in enumerate(self.nodes)}
+        nodes = list(graph.nodes())
+        kept = np.fromiter((old_pos.get(n, -1) if n not in changed else -1 for n in nodes), dtype=np.int64,
+                           count=len(nodes))
+        redo = [i for i, n in enumerate(nodes) if n in changed or n not in old_pos]
+        redo_keys = _keys(graph, [nodes[i] for i in redo])
+        for column in COLUMNS:
+            old = {v: np.unpackbits(bm, count=self.size).astype(bool) for v, bm in self.bitmaps[column].items()}
+            new = {}
+            for v, bits in old.items():
+                new[v] = np.where(kept >= 0, bits[np.maximum(kept, 0)], False)
+            for i, key in zip(redo, redo_keys[column]):
+                new.setdefault(key, np.zeros(len(nodes), dtype=bool))[i] = True
+            self.bitmaps[column] = {v: np.packbits(bits) for v, bits in new.items() if bits.any()}
+        self.nodes = nodes
+        self.size = len(nodes)
+
+    def _all(self) -> np.ndarray:
+        return np.packbits(np.ones(self.size, dtype=bool))
+
+    def _none(self) -> np.ndarray:
+        return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def bitmap(self, column: str, values: Optional[Iterable[str]]) -> np.ndarray:
+        """Packed bitmap of nodes whose `column` is one of `values` (or missing).
+
+        `values=None` means no filter on that column.
+        """
+        if values is None:
+            return self._all()
+        col = self.bitmaps[column]
+        out = col.get(None, self._none()).copy()
+        for v in values:
+            bm = col.get(v)
+            if bm is not None:
+                np.bitwise_or(out, bm, out=out)
+        return out
+
+    def mask(self, platforms: Optional[Iterable[str]] = None, regions: Optional[Iterable[str]] = None,
+             genders: Optional[Iterable[str]] = None, ages: Optional[Iterable[str]] = None,
+             fake_bands: Optional[Iterable[str]] = None, risk_bands: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Boolean mask (in `self.nodes` order) of nodes passing every given filter."""
+        out = self._all()
+        for column, values in (('platform', platforms), ('region', regions), ('gender', genders),
+                               ('age', ages), ('fake', fake_bands), ('risk', risk_bands)):
+            if values is not None:
+                np.bitwise_and(out, self.bitmap(column, values), out=out)
+        return np.unpackbits(out, count=self.size).astype(bool)
+
+    def candidate_mask(self, params: Dict) -> np.ndarray:
+        """Mask for a constraint dict as produced by `ConstraintPanel.as_dict()`."""
+        platforms = params.get('platforms')
+        if isinstance(platforms, dict):
+            platforms = [p for p, on in platforms.items() if on]
+        audience = params.get('audience') or {}
+        return self.mask(platforms=platforms,
+                         regions=audience.get('region'),
+                         genders=audience.get('gender'),
+                         ages=audience.get('age'),
+                         fake_bands=params.get('fake_bands'),
+                         risk_bands=params.get('risk_bands'))
+
+    def candidates(self, params: Dict) -> List:
+        """Node ids passing the filters in a constraint dict."""
+        m = self.candidate_mask(params)
+        return [self.nodes[i] for i in np.flatnonzero(m)]
+
+
+def get_attribute_index(graph: nx.Graph) -> AttributeIndex:
+    """Return the index cached on `graph.graph`, building it if missing or stale.
+
+    Caching writes to the graph: call this from the GUI thread (the solve workers
+    take the candidate list computed there).
+    """
+    index = graph.graph.get('attribute_index')
+    if index is None or index.size != graph.number_of_nodes():
+        index = AttributeIndex(graph)
+        graph.graph['attribute_index'] = index
+    return index
@@ -0,0 +1,177 @@
+"""SQLite catalog of the full influencer universe.
+
+The catalog keeps every influencer and edge in one local database file so a
+campaign can load just its slice instead of the whole export. Users and edges
+CSVs are streamed in chunk by chunk (validated by `core.ingest`) and written with
+`executemany`; `platform`, `region`, `followers` and `risk` are indexed, and edges
+are indexed on both endpoints.
+
+`InfluencerCatalog.query` selects the influencers passing a filter and the
+edges between them, and returns a `GraphSnapshot` that converts to the usual
+`nx.Graph`. Only the known users columns are stored; extra vendor columns are
+dropped on import.
+"""
+from typing import Iterable, List, Optional, Tuple
+import sqlite3
+
+import networkx as nx
+import pandas as pd
+
+from core.ingest import CHUNK_ROWS, USER_DTYPES, GraphSnapshot, iter_edges, iter_users, snapshot
+
+USER_COLUMNS = ('id', 'name', 'platform', 'followers', 'cost', 'risk', 'fake', 'age', 'region', 'gender', 'eng_rate')
+EDGE_COLUMNS = ('source', 'target', 'weight', 'prob', 'delay_hours')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY, name TEXT, platform TEXT, followers INTEGER, cost REAL, risk REAL,
+    fake REAL, age INTEGER, region TEXT, gender TEXT, eng_rate REAL
+);
+CREATE TABLE IF NOT EXISTS edges (
+    source TEXT NOT NULL, target TEXT NOT NULL, weight REAL, prob REAL, delay_hours REAL,
+    UNIQUE (source, target)
+);
+CREATE INDEX IF NOT EXISTS users_platform ON users (platform);
+CREATE INDEX IF NOT EXISTS users_region ON users (region);
+CREATE INDEX IF NOT EXISTS users_followers ON users (followers);
+CREATE INDEX IF NOT EXISTS users_risk ON users (risk);
+CREATE INDEX IF NOT EXISTS edges_target ON edges (target);
+"""
+
+
+def _rows(df: pd.DataFrame, columns: Tuple[str, ...]) -> Iterable[tuple]:
+    """Row tuples of plain Python values (None for missing) for `executemany`."""
+    values = []
+    for c in columns:
+        if c not in df:
+            values.append([None] * len(df))
+            continue
+        col = df[c]
+        values.append(col.astype(object).where(col.notna(), None).tolist() if col.hasnans else col.tolist())
+    return zip(*values)
+
+
+class InfluencerCatalog:
+    """Influencers and edges in a SQLite file, queried by attribute filters.
+
+    Re-importing an id or an edge replaces the stored row, so a newer export can
+    be loaded on top of an older one.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'InfluencerCatalog':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- ingestion -----------------------------------------------------
+
+    def import_users(self, path: str, chunksize: int = CHUNK_ROWS) -> int:
+        """Insert or replace the rows of a users CSV; returns the number of rows read."""
+        sql = f"INSERT OR REPLACE INTO users ({', '.join(USER_COLUMNS)}) VALUES ({', '.join('?' * len(USER_COLUMNS))})"
+        total = 0
+        for chunk in iter_users(path, chunksize):
+            with self.conn:
+                self.conn.executemany(sql, _rows(chunk, USER_COLUMNS))
+            total += len(chunk)
+        return total
+
+    def import_edges(self, path: str, chunksize: int = CHUNK_ROWS) -> int:
+        """Insert or replace the rows of an edges CSV; returns the number of rows read."""
+        sql = f"INSERT OR REPLACE INTO edges ({', '.join(EDGE_COLUMNS)}) VALUES ({', '.join('?' * len(EDGE_COLUMNS))})"
+        total = 0
+        for chunk in iter_edges(path, chunksize):
+            with self.conn:
+                self.conn.executemany(sql, _rows(chunk, EDGE_COLUMNS))
+            total += len(chunk)
+        return total
+
+    def import_csv(self, users_csv: str, edges_csv: Optional[str] = None,
+                   chunksize: int = CHUNK_ROWS) -> Tuple[int, int]:
+        """Import a users (and edges) CSV pair; returns (users rows, edge rows)."""
+        users = self.import_users(users_csv, chunksize)
+        edges = self.import_edges(edges_csv, chunksize) if edges_csv else 0
+        return users, edges
+
+    # --- queries -------------------------------------------------------
+
+    @staticmethod
+    def _where(platforms: Optional[Iterable[str]] = None, regions: Optional[Iterable[str]] = None,
+               min_followers: Optional[int] = None, max_followers: Optional[int] = None,
+               max_risk: Optional[float] = None) -> Tuple[str, List]:
+        """SQL condition and parameters for a filter; a missing region passes, as in `AttributeIndex`."""
+        clauses, params = [], []
+        if platforms is not None:
+            platforms = list(platforms)
+            clauses.append(f"platform IN ({', '.join('?' * len(platforms))})")
+            params += platforms
+        if regions is not None:
+            regions = list(regions)
+            clauses.append(f"(region IN ({', '.join('?' * len(regions))}) OR region IS NULL)")
+            params += regions
+        if min_followers is not None:
+            clauses.append("followers >= ?")
+            params.append(int(min_followers))
+        if max_followers is not None:
+            clauses.append("followers <= ?")
+            params.append(int(max_followers))
+        if max_risk is not None:
+            clauses.append("risk <= ?")
+            params.append(float(max_risk))
+        return (' AND '.join(clauses) or '1'), params
+
+    def count(self, **filters) -> int:
+        """Number of influencers passing `filters` (same keywords as `query`)."""
+        where, params = self._where(**filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM users WHERE {where}", params).fetchone()[0]
+
+    def query(self, platforms: Optional[Iterable[str]] = None, regions: Optional[Iterable[str]] = None,
+              min_followers: Optional[int] = None, max_followers: Optional[int] = None,
+              max_risk: Optional[float] = None) -> GraphSnapshot:
+        """Snapshot of the influencers passing every given filter and the edges among them.
+
+        `None` means no filter on that column. Users keep their import order and
+        edges their file order, so the snapshot matches loading a pre-filtered CSV.
+        """
+        where, params = self._where(platforms, regions, min_followers, max_followers, max_risk)
+        users = pd.read_sql_query(f"SELECT {', '.join(USER_COLUMNS)} FROM users WHERE {where} ORDER BY rowid",
+                                  self.conn, params=params)
+        users = users.astype({c: t for c, t in USER_DTYPES.items() if t == 'float64' and c not in ('followers', 'age')})
+        users['followers'] = users['followers'].astype('int64')
+        users['age'] = users['age'].astype('Float64').round().astype('Int64')
+
+        # The selected ids go into a temp table; edges are found by range scans of the
+        # (source, target) index per selected source. The unary `+` keeps SQLite from
+        # probing that index for every (source, target) pair of the selection instead.
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS selection (id TEXT PRIMARY KEY)")
+        with self.conn:
+            self.conn.execute("DELETE FROM selection")
+            self.conn.executemany("INSERT INTO selection VALUES (?)", ((i,) for i in users['id'].tolist()))
+        edges = pd.read_sql_query(
+            f"SELECT {', '.join(EDGE_COLUMNS)} FROM edges "
+            "WHERE source IN (SELECT id FROM selection) AND +target IN (SELECT id FROM selection) ORDER BY rowid",
+            self.conn)
+        edges = edges.astype({c: 'float64' for c in ('weight', 'prob', 'delay_hours')})
+        if edges['delay_hours'].isna().all():
+            edges = edges.drop(columns='delay_hours')
+        return snapshot(users, edges)
+
+    def load_graph(self, **filters) -> nx.Graph:
+        """`query(**filters)` as the `nx.Graph` used by the GUI and optimizer."""
+        return self.query(**filters).to_networkx()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def platforms(self) -> List[str]:
+        """Distinct platforms in the catalog, e.g. to populate a filter."""
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT platform FROM users ORDER BY platform")]
+
@@ -0,0 +1,236 @@
+"""Compiled on-disk graph format for fast dataset reopening.
+
+The first load of a users/edges CSV pair writes a directory of `.npy` arrays:
+CSR adjacency (`indptr`, `indices`, `adj_prob`), the edge list (`src`, `dst`,
+`weight`, `prob`, `delay_hours`), one array per node attribute column (numeric
+columns as float64/int64, categorical ones as integer codes) and the node ids as
+a fixed-width string array, plus `manifest.json` describing columns and the
+sources. Later loads open the arrays with `numpy.load(mmap_mode='r')` instead of
+parsing the CSVs. `CompiledGraph.csr` and `column` only touch the pages they
+read; `to_snapshot` / `to_networkx` read every array once, so building the
+`nx.Graph` stays O(V + E) and saves the parsing, not that pass.
+
+When the cache directory cannot be written, `load_graph_cached` logs a warning
+and returns the graph parsed from the CSVs.
+
+A compiled directory is valid while each source file keeps its size and mtime;
+when only the mtime changed the content hash decides, so touching or copying an
+unchanged file does not force a rebuild.
+"""
+from typing import Dict, Optional
+import hashlib
+import json
+import logging
+import os
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from core.ingest import GraphSnapshot, load_snapshot
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+CATEGORICAL = ('platform', 'region', 'gender')
+
+
+def default_cache_dir(users_csv: str, edges_csv: Optional[str] = None) -> str:
+    """Per-dataset directory under the application data folder."""
+    from core.scenarios import get_default_appdir
+    key = hashlib.sha1('|'.join(os.path.abspath(p) for p in (users_csv, edges_csv) if p).encode('utf-8')).hexdigest()
+    return os.path.join(os.path.dirname(get_default_appdir()), 'graph_cache', key[:16])
+
+
+def _file_hash(path: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source_info(path: str, with_hash: bool = True) -> Dict:
+    st = os.stat(path)
+    info = {'path': os.path.abspath(path), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+    if with_hash:
+        info['hash'] = _file_hash(path)
+    return info
+
+
+def _text_array(values) -> np.ndarray:
+    """Fixed-width unicode array (memmappable, unlike object arrays); None becomes ''."""
+    arr = np.asarray(['' if v is None or (isinstance(v, float) and np.isnan(v)) else str(v) for v in values])
+    return arr if arr.size else np.zeros(0, dtype='<U1')
+
+
+def compile_snapshot(snap: GraphSnapshot, out_dir: str, sources: Optional[list] = None) -> str:
+    """Write `snap` as a compiled directory; returns `out_dir`."""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {'version': FORMAT_VERSION, 'nodes': snap.node_count, 'users': len(snap.users),
+                'edges': snap.edge_count, 'sources': sources or [], 'columns': {}}
+
+    def save(name: str, arr: np.ndarray) -> None:
+        np.save(os.path.join(out_dir, name + '.npy'), arr, allow_pickle=False)
+
+    indptr, indices, adj_prob = snap.csr()
+    save('indptr', indptr)
+    save('indices', indices)
+    save('adj_prob', adj_prob)
+    save('ids', _text_array(snap.ids))
+    save('src', snap.src)
+    save('dst', snap.dst)
+    for col in ('weight', 'prob', 'delay_hours'):
+        if col in snap.edges:
+            save('edge_' + col, snap.edges[col].to_numpy(dtype=float))
+    for col in snap.users.columns:
+        if col == 'id':
+            continue
+        series = snap.users[col]
+        if col in CATEGORICAL:
+            codes, cats = pd.factorize(series, use_na_sentinel=True)
+            save('col_' + col, codes.astype(np.int32))
+            manifest['columns'][col] = {'kind': 'category', 'categories': [str(c) for c in cats]}
+        elif pd.api.types.is_integer_dtype(series) and not series.hasnans:
+            save('col_' + col, series.to_numpy(dtype=np.int64))
+            manifest['columns'][col] = {'kind': 'int'}
+        elif pd.api.types.is_numeric_dtype(series):
+            save('col_' + col, series.to_numpy(dtype=float, na_value=np.nan))
+            manifest['columns'][col] = {'kind': 'float', 'nullable_int': str(series.dtype) == 'Int64'}
+        else:
+            save('col_' + col, _text_array(series.tolist()))
+            manifest['columns'][col] = {'kind': 'text'}
+    # The manifest goes last: a directory without one is never treated as valid
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return out_dir
+
+
+class CompiledGraph:
+    """Read-only view of a compiled directory; every array is memory-mapped."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def array(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.path, name + '.npy'), mmap_mode='r')
+        return self._arrays[name]
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self.array('ids')
+
+    def csr(self):
+        """(indptr, indices, prob) of the undirected adjacency."""
+        return self.array('indptr'), self.array('indices'), self.array('adj_prob')
+
+    def column(self, name: str) -> pd.Series:
+        """Node attribute column for the users rows, decoded to its loader dtype."""
+        info = self.manifest['columns'][name]
+        raw = self.array('col_' + name)
+        if info['kind'] == 'category':
+            cats = np.asarray(info['categories'], dtype=object)
+            out = np.full(len(raw), None, dtype=object)
+            ok = raw >= 0
+            out[ok] = cats[raw[ok]]
+            return pd.Series(out, name=name)
+        if info['kind'] == 'text':
+            return pd.Series(np.where(raw == '', None, raw.astype(object)), name=name)
+        series = pd.Series(np.asarray(raw), name=name)
+        if info.get('nullable_int'):
+            series = series.round().astype('Int64')
+        return series
+
+    def to_snapshot(self) -> GraphSnapshot:
+        """The snapshot of the compiled dataset; reads every array (O(V + E))."""
+        n_users = self.manifest['users']
+        ids = np.asarray(self.ids).astype(object)
+        users = pd.DataFrame({'id': ids[:n_users]})
+        for name in self.manifest['columns']:
+            users[name] = self.column(name)
+        edges = pd.DataFrame({'source': ids[np.asarray(self.array('src'))],
+                              'target': ids[np.asarray(self.array('dst'))]})
+        for col in ('weight', 'prob', 'delay_hours'):
+            if os.path.exists(os.path.join(self.path, f'edge_{col}.npy')):
+                edges[col] = np.asarray(self.array('edge_' + col))
+        return GraphSnapshot(ids=ids, users=users, src=np.asarray(self.array('src')),
+                             dst=np.asarray(self.array('dst')), edges=edges)
+
+    def to_networkx(self) -> nx.Graph:
+        return self.to_snapshot().to_networkx()
+
+    def is_fresh(self, users_csv: str, edges_csv: Optional[str] = None) -> bool:
+        """True while the recorded sources still match the given files."""
+        if self.manifest.get('version') != FORMAT_VERSION:
+            return False
+        paths = [p for p in (users_csv, edges_csv) if p]
+        recorded = self.manifest.get('sources', [])
+        if [s['path'] for s in recorded] != [os.path.abspath(p) for p in paths]:
+            return False
+        touched = False
+        for src, path in zip(recorded, paths):
+            try:
+                now = _source_info(path, with_hash=False)
+            except OSError:
+                return False
+            if now['size'] != src['size']:
+                return False
+            if now['mtime_ns'] != src['mtime_ns']:
+                if _file_hash(path) != src.get('hash'):
+                    return False
+                src['mtime_ns'] = now['mtime_ns']
+                touched = True
+        if touched:
+            try:
+                with open(os.path.join(self.path, 'manifest.json'), 'w', encoding='utf-8') as f:
+                    json.dump(self.manifest, f, indent=2)
+            except OSError:
+                pass
+        return True
+
+
+def _fresh_compiled(out_dir: str, users_csv: str, edges_csv: Optional[str]) -> Optional[CompiledGraph]:
+    """The compiled graph in `out_dir` if it matches the sources; a stale manifest is removed."""
+    manifest = os.path.join(out_dir, 'manifest.json')
+    if not os.path.exists(manifest):
+        return None
+    try:
+        compiled = CompiledGraph(out_dir)
+        if compiled.is_fresh(users_csv, edges_csv):
+            return compiled
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Ignoring unreadable compiled graph in %s (%s)", out_dir, e)
+    try:
+        os.remove(manifest)
+    except OSError:
+        pass
+    return None
+
+
+def open_compiled(users_csv: str, edges_csv: Optional[str] = None, cache_dir: Optional[str] = None) -> CompiledGraph:
+    """Open the compiled form of a dataset, (re)compiling it from the CSVs when stale."""
+    out_dir = cache_dir or default_cache_dir(users_csv, edges_csv)
+    compiled = _fresh_compiled(out_dir, users_csv, edges_csv)
+    if compiled is None:
+        sources = [_source_info(p) for p in (users_csv, edges_csv) if p]
+        compiled = CompiledGraph(compile_snapshot(load_snapshot(users_csv, edges_csv), out_dir, sources))
+    return compiled
+
+
+def load_graph_cached(users_csv: str, edges_csv: Optional[str] = None, cache_dir: Optional[str] = None) -> nx.Graph:
+    """Like `core.ingest.load_graph`, going through the compiled cache when it can be written."""
+    out_dir = cache_dir or default_cache_dir(users_csv, edges_csv)
+    compiled = _fresh_compiled(out_dir, users_csv, edges_csv)
+    if compiled is None:
+        snap = load_snapshot(users_csv, edges_csv)
+        try:
+            sources = [_source_info(p) for p in (users_csv, edges_csv) if p]
+            compiled = CompiledGraph(compile_snapshot(snap, out_dir, sources))
+        except OSError as e:
+            logger.warning("Cannot write the compiled graph cache in %s (%s); loading without it", out_dir, e)
+            return snap.to_networkx()
+    return compiled.to_networkx()
@@ -1,6 +1,8 @@
 """Data models for InfluenceOpt"""
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 
 @dataclass
@@ -36,3 +38,247 @@ class Campaign:
     reach_weight: float
     platforms: Optional[list] = None
     notes: Optional[str] = None
+
+
+# Columns held by InfluencerTable: categoricals as int32 codes (-1 = missing),
+# numerics as float64 (NaN = missing)
+CATEGORICAL_COLUMNS = ('platform', 'region', 'gender')
+NUMERIC_COLUMNS = ('followers', 'cost', 'risk', 'fake', 'age', 'eng_rate')
+# Everything the table holds; graphs loaded from files keep these out of the node dicts
+TABLE_COLUMNS = ('name',) + CATEGORICAL_COLUMNS + NUMERIC_COLUMNS
+# Numeric columns handed out as int
+INTEGER_COLUMNS = ('followers', 'age')
+
+
+class InfluencerTable:
+    """Struct-of-arrays store of influencer attributes, one row per graph node.
+
+    `ids[i]` is the node of row i. Platform, region and gender are integer codes
+    into per-column category lists; the numeric columns are float64 arrays with
+    NaN for missing values. Solvers read whole columns (`values`, `labels`)
+    instead of one attribute dict per node; `user` materializes a `User` only
+    when the GUI needs one.
+
+    Graphs loaded from files (`GraphSnapshot.to_networkx`) hold the
+    TABLE_COLUMNS only here, not in their node dicts. Change node attributes
+    with `set_node_attributes`, which keeps the table and the node dicts in
+    step; writing a node dict directly leaves the solvers reading the old value.
+    """
+
+    def __init__(self, ids: Sequence, names: Optional[Sequence] = None,
+                 numeric: Optional[Dict[str, np.ndarray]] = None,
+                 codes: Optional[Dict[str, np.ndarray]] = None,
+                 categories: Optional[Dict[str, List]] = None):
+        self.ids = np.asarray(list(ids), dtype=object)
+        self.pos: Dict = {n: i for i, n in enumerate(self.ids.tolist())}
+        n = len(self.ids)
+        # Own copies: `update` writes in place, and pandas may hand out read-only views
+        self.names = np.array(names, dtype=object) if names is not None else np.full(n, None, dtype=object)
+        numeric = numeric or {}
+        codes = codes or {}
+        categories = categories or {}
+        self.numeric = {c: np.array(numeric[c], dtype=float) if c in numeric else np.full(n, np.nan)
+                        for c in NUMERIC_COLUMNS}
+        self.codes = {c: np.array(codes[c], dtype=np.int32) if c in codes else np.full(n, -1, dtype=np.int32)
+                      for c in CATEGORICAL_COLUMNS}
+        self.categories = {c: list(categories.get(c, [])) for c in CATEGORICAL_COLUMNS}
+        self._users: Dict = {}
+
+    @classmethod
+    def from_graph(cls, graph) -> 'InfluencerTable':
+        """Build the table from the node attribute dicts of `graph` (in node order)."""
+        ids = list(graph.nodes())
+        attrs = [graph.nodes[n] for n in ids]
+        numeric = {}
+        for c in NUMERIC_COLUMNS:
+            col = [a.get(c) for a in attrs]
+            numeric[c] = np.array([np.nan if v is None else float(v) for v in col], dtype=float)
+        codes, categories = {}, {}
+        for c in CATEGORICAL_COLUMNS:
+            codes[c], categories[c] = _factorize([a.get(c) for a in attrs])
+        return cls(ids, [a.get('name') for a in attrs], numeric, codes, categories)
+
+    @classmethod
+    def from_frame(cls, users, ids: Optional[Sequence] = None) -> 'InfluencerTable':
+        """Build the table from a users DataFrame (an `id` column plus attribute columns).
+
+        `ids` fixes the row order and may include nodes without a users row; those
+        get missing values everywhere.
+        """
+        import pandas as pd
+        frame = users.set_index('id')
+        if ids is not None:
+            frame = frame.reindex(pd.Index(list(ids), dtype=object))
+        numeric = {c: frame[c].to_numpy(dtype=float, na_value=np.nan) for c in NUMERIC_COLUMNS if c in frame}
+        codes, categories = {}, {}
+        for c in CATEGORICAL_COLUMNS:
+            if c in frame:
+                raw, cats = pd.factorize(frame[c])
+                codes[c], categories[c] = raw, cats.tolist()
+        names = frame['name'].astype(object).where(frame['name'].notna(), None).to_numpy() if 'name' in frame else None
+        return cls(frame.index.tolist(), names, numeric, codes, categories)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, n) -> bool:
+        return n in self.pos
+
+    def index(self, nodes: Optional[Iterable] = None) -> np.ndarray:
+        """Row positions of `nodes` (all rows when None)."""
+        if nodes is None:
+            return np.arange(len(self.ids))
+        return np.fromiter((self.pos[n] for n in nodes), dtype=np.int64)
+
+    def values(self, column: str, nodes: Optional[Iterable] = None, default: Optional[float] = 0.0) -> np.ndarray:
+        """Numeric column for `nodes` as float64; missing values become `default` (None keeps NaN)."""
+        col = self.numeric[column]
+        out = col if nodes is None else col[self.index(nodes)]
+        if default is not None:
+            out = np.where(np.isnan(out), default, out)
+        return out
+
+    def labels(self, column: str, nodes: Optional[Iterable] = None) -> np.ndarray:
+        """Categorical column for `nodes` decoded to an object array (None = missing)."""
+        codes = self.codes[column] if nodes is None else self.codes[column][self.index(nodes)]
+        cats = np.asarray(self.categories[column] + [None], dtype=object)
+        return cats[codes]
+
+    def mapping(self, column: str, nodes: Iterable, default: Optional[float] = 0.0) -> Dict:
+        """{node: value} for `nodes`, for code that looks values up by node id."""
+        nodes = list(nodes)
+        values = self.labels(column, nodes) if column in self.codes else self.values(column, nodes, default)
+        return dict(zip(nodes, values.tolist()))
+
+    def code_of(self, column: str, value) -> int:
+        """Code of a category value, or -1 when it does not occur."""
+        try:
+            return self.categories[column].index(value)
+        except ValueError:
+            return -1
+
+    def update(self, n, **attrs) -> None:
+        """Write attribute values of node `n` (e.g. after a manual edit)."""
+        i = self.pos[n]
+        for key, value in attrs.items():
+            if key == 'name':
+                self.names[i] = value
+            elif key in self.numeric:
+                self.numeric[key][i] = np.nan if value is None else float(value)
+            elif key in self.codes:
+                code = -1
+                if value is not None:
+                    code = self.code_of(key, value)
+                    if code < 0:
+                        self.categories[key].append(value)
+                        code = len(self.categories[key]) - 1
+                self.codes[key][i] = code
+        self._users.pop(n, None)
+
+    def drop(self, nodes: Iterable) -> None:
+        """Remove the rows of `nodes` (unknown ids are ignored)."""
+        gone = [self.pos[n] for n in nodes if n in self.pos]
+        if not gone:
+            return
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[gone] = False
+        self.ids, self.names = self.ids[keep], self.names[keep]
+        self.numeric = {c: v[keep] for c, v in self.numeric.items()}
+        self.codes = {c: v[keep] for c, v in self.codes.items()}
+        self.pos = {n: i for i, n in enumerate(self.ids.tolist())}
+        self._users = {n: u for n, u in self._users.items() if n in self.pos}
+
+    def append(self, graph, nodes: Iterable) -> None:
+        """Add rows for `nodes` of `graph` (ids already present are updated instead)."""
+        new = [n for n in dict.fromkeys(nodes) if n not in self.pos]
+        for n in nodes:
+            if n in self.pos:
+                self.update(n, **graph.nodes[n])
+        if not new:
+            return
+        start = len(self.ids)
+        self.ids = np.concatenate([self.ids, np.asarray(new, dtype=object)])
+        self.names = np.concatenate([self.names, np.full(len(new), None, dtype=object)])
+        self.numeric = {c: np.concatenate([v, np.full(len(new), np.nan)]) for c, v in self.numeric.items()}
+        self.codes = {c: np.concatenate([v, np.full(len(new), -1, dtype=np.int32)]) for c, v in self.codes.items()}
+        for k, n in enumerate(new):
+            self.pos[n] = start + k
+            self.update(n, **graph.nodes[n])
+
+    def record(self, n) -> Dict:
+        """Non-missing values of node `n` as an attribute dict (followers and age as int)."""
+        i = self.pos[n]
+        out = {}
+        if self.names[i] is not None:
+            out['name'] = self.names[i]
+        for c in CATEGORICAL_COLUMNS:
+            code = self.codes[c][i]
+            if code >= 0:
+                out[c] = self.categories[c][code]
+        for c in NUMERIC_COLUMNS:
+            v = self.numeric[c][i]
+            if not np.isnan(v):
+                out[c] = int(round(v)) if c in INTEGER_COLUMNS else float(v)
+        return out
+
+    def user(self, n) -> User:
+        """The `User` record of node `n`, materialized on first request."""
+        u = self._users.get(n)
+        if u is None:
+            i = self.pos[n]
+            num = {c: (None if np.isnan(self.numeric[c][i]) else float(self.numeric[c][i])) for c in NUMERIC_COLUMNS}
+            cat = {c: (self.categories[c][self.codes[c][i]] if self.codes[c][i] >= 0 else None)
+                   for c in CATEGORICAL_COLUMNS}
+            u = User(id=n, name=self.names[i] if self.names[i] is not None else str(n),
+                     platform=cat['platform'] or 'IG', followers=int(num['followers'] or 0),
+                     cost=num['cost'] or 0.0, risk=num['risk'] or 0.0, fake=num['fake'] or 0.0,
+                     age=None if num['age'] is None else int(round(num['age'])),
+                     region=cat['region'], gender=cat['gender'], eng_rate=num['eng_rate'])
+            self._users[n] = u
+        return u
+
+
+def _factorize(values: List) -> Tuple[np.ndarray, List]:
+    cats: Dict = {}
+    codes = np.fromiter((-1 if v is None else cats.setdefault(v, len(cats)) for v in values),
+                        dtype=np.int32, count=len(values))
+    return codes, list(cats)
+
+
+def get_influencer_table(graph) -> InfluencerTable:
+    """Return the table cached on `graph.graph`, building it from the node dicts if missing.
+
+    When nodes were added or removed without going through the table (the row
+    count differs), rows of removed nodes are dropped and new nodes get a row
+    from their node dict; the other rows keep their values. Only the count is
+    checked, so sync after each batch of additions or removals, and write the
+    attributes of existing nodes with `set_node_attributes`.
+    """
+    table = graph.graph.get('influencer_table')
+    if table is None:
+        table = InfluencerTable.from_graph(graph)
+        graph.graph['influencer_table'] = table
+    elif len(table) != graph.number_of_nodes():
+        table.drop([n for n in table.ids.tolist() if n not in graph])
+        table.append(graph, [n for n in graph.nodes() if n not in table])
+    return table
+
+
+def set_node_attributes(graph, n, **attrs) -> None:
+    """Set attributes of node `n`, the one write path for nodes after loading.
+
+    TABLE_COLUMNS go to the cached influencer table (a row is added for a new
+    node); the node dict gets the other attributes, and table columns only where
+    it already holds a copy (graphs built node by node). Without a cached table
+    everything goes to the node dict. Callers refresh the attribute and reach
+    indexes as for any other edit (`core.delta.refresh_caches`).
+    """
+    d = graph.nodes[n]
+    table = graph.graph.get('influencer_table')
+    if table is None:
+        d.update(attrs)
+        return
+    if n not in table:
+        table.append(graph, [n])
+    table.update(n, **{k: v for k, v in attrs.items() if k in TABLE_COLUMNS})
+    d.update({k: v for k, v in attrs.items() if k not in TABLE_COLUMNS or k in d})
@@ -0,0 +1,203 @@
+"""Incremental dataset refresh from delta CSVs.
+
+A users delta has the users columns plus an `op` column: `upsert` (the default
+when empty) creates the influencer or overwrites the non-empty cells of an
+existing one; `delete` removes it with its edges. An edges delta has `source`,
+`target`, optional `weight`/`prob`/`delay_hours` and the same `op` column.
+
+`apply_delta` patches the graph in place and returns a `DeltaReport` listing
+exactly which nodes and edges changed; the cached influencer table, attribute
+index and reach indexes on `graph.graph` are patched for that subset only.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple, Union
+
+import networkx as nx
+import pandas as pd
+
+from core.data_models import set_node_attributes
+from core.ingest import (CHUNK_ROWS, EDGE_DEFAULTS, EDGE_DTYPES, USER_DEFAULTS, USER_DTYPES, IngestError,
+                         _check_range, _read_csv, _records)
+from core.lazy_attributes import node_attributes
+
+OPS = ('upsert', 'delete')
+EDGE_ATTRS = ('weight', 'prob', 'delay_hours')
+
+
+@dataclass
+class DeltaReport:
+    """What a delta changed; node lists are in delta order."""
+    added: List = field(default_factory=list)
+    updated: List = field(default_factory=list)
+    removed: List = field(default_factory=list)
+    edges_added: List[Tuple] = field(default_factory=list)
+    edges_updated: List[Tuple] = field(default_factory=list)
+    edges_removed: List[Tuple] = field(default_factory=list)
+
+    @property
+    def attributes_changed(self) -> Set:
+        """Nodes whose attribute row was created, edited or removed."""
+        return set(self.added) | set(self.updated) | set(self.removed)
+
+    @property
+    def topology_changed(self) -> Set:
+        """Nodes that appeared, disappeared or gained/lost/re-weighted an edge."""
+        out = set(self.added) | set(self.removed)
+        for u, v in self.edges_added + self.edges_updated + self.edges_removed:
+            out.update((u, v))
+        return out
+
+    @property
+    def changed(self) -> Set:
+        return self.attributes_changed | self.topology_changed
+
+    def __bool__(self) -> bool:
+        return bool(self.changed)
+
+    def summary(self) -> str:
+        edges = len(self.edges_added) + len(self.edges_updated) + len(self.edges_removed)
+        return (f"{len(self.added)} added, {len(self.updated)} updated, {len(self.removed)} removed, "
+                f"{edges} edge(s) changed")
+
+
+def _ops(df: pd.DataFrame, path: str) -> pd.Series:
+    op = df['op'].fillna('upsert').str.strip().str.lower() if 'op' in df else pd.Series('upsert', index=df.index)
+    bad = ~op.isin(OPS)
+    if bad.any():
+        raise IngestError(f"{path}: unknown op {op[bad].iloc[0]!r} (expected upsert or delete)")
+    return op
+
+
+def read_user_delta(path: str, chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+    """Parse a users delta; empty cells stay NaN/None so upserts leave those attributes alone."""
+    df = _read_csv(path, dict(USER_DTYPES, op='str'), ('id',), chunksize)
+    if df['id'].isna().any():
+        raise IngestError(f"{path}: {int(df['id'].isna().sum())} row(s) without id")
+    df['op'] = _ops(df, path)
+    _check_range(df, path, 'id')
+    return df
+
+
+def read_edge_delta(path: str, chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+    df = _read_csv(path, dict(EDGE_DTYPES, op='str'), ('source', 'target'), chunksize)
+    if df['source'].isna().any() or df['target'].isna().any():
+        raise IngestError(f"{path}: edge rows with an empty source or target")
+    df['op'] = _ops(df, path)
+    if 'prob' in df:
+        bad = (df['prob'] < 0) | (df['prob'] > 1)
+        if bad.any():
+            raise IngestError(f"{path}: {int(bad.sum())} edge(s) with prob outside [0, 1]")
+    return df
+
+
+def _new_user(n, attrs: Dict) -> Dict:
+    out = {'name': n}
+    out.update(USER_DEFAULTS)
+    out.update({k: v for k, v in attrs.items() if v is not None})
+    return out
+
+
+def _clean(key: str, value):
+    if value is None:
+        return None
+    if key == 'followers':
+        return int(value)
+    if key == 'age':
+        return int(round(value))
+    return value
+
+
+def apply_delta(graph: nx.Graph, users: Union[str, pd.DataFrame, None] = None,
+                edges: Union[str, pd.DataFrame, None] = None) -> DeltaReport:
+    """Apply a users and/or edges delta (paths or parsed frames) to `graph` in place.
+
+    User rows are applied before edge rows, each in file order. Edge endpoints
+    that do not exist yet are added without attributes, as a full load would.
+    Cached indexes on `graph.graph` are patched for the changed nodes.
+    """
+    if isinstance(users, str):
+        users = read_user_delta(users)
+    if isinstance(edges, str):
+        edges = read_edge_delta(edges)
+    report = DeltaReport()
+    added, updated = {}, {}
+    table = graph.graph.get('influencer_table')
+
+    if users is not None and len(users):
+        cols = [c for c in users.columns if c not in ('id', 'op')]
+        for n, op, row in zip(users['id'].tolist(), users['op'].tolist(), _records(users[cols])):
+            if op == 'delete':
+                if n in graph:
+                    for v in list(graph[n]):
+                        report.edges_removed.append((n, v))
+                    graph.remove_node(n)
+                    if added.pop(n, None) is None:
+                        report.removed.append(n)
+                    updated.pop(n, None)
+                continue
+            attrs = {k: _clean(k, v) for k, v in row.items()}
+            if n not in graph:
+                graph.add_node(n)
+                if table is not None and n in table:
+                    # Deleted earlier in this delta; start from a fresh row
+                    table.drop([n])
+                set_node_attributes(graph, n, **_new_user(n, attrs))
+                added[n] = True
+                if n in report.removed:
+                    report.removed.remove(n)
+                    del added[n]
+                    updated[n] = True
+                continue
+            current = node_attributes(graph, n)
+            diff = {k: v for k, v in attrs.items() if v is not None and current.get(k) != v}
+            if diff:
+                set_node_attributes(graph, n, **diff)
+                if n not in added:
+                    updated[n] = True
+
+    if edges is not None and len(edges):
+        cols = [c for c in EDGE_ATTRS if c in edges]
+        for u, v, op, row in zip(edges['source'].tolist(), edges['target'].tolist(), edges['op'].tolist(),
+                                 _records(edges[cols])):
+            if op == 'delete':
+                if graph.has_edge(u, v):
+                    graph.remove_edge(u, v)
+                    report.edges_removed.append((u, v))
+                continue
+            attrs = {k: val for k, val in row.items() if val is not None}
+            if graph.has_edge(u, v):
+                data = graph.edges[u, v]
+                diff = {k: val for k, val in attrs.items() if data.get(k) != val}
+                if diff:
+                    data.update(diff)
+                    report.edges_updated.append((u, v))
+                continue
+            for n in (u, v):
+                if n not in graph:
+                    graph.add_node(n)
+                    added[n] = True
+            graph.add_edge(u, v, **dict(EDGE_DEFAULTS, **attrs))
+            report.edges_added.append((u, v))
+
+    report.added = list(added)
+    report.updated = list(updated)
+    refresh_caches(graph, report)
+    return report
+
+
+def refresh_caches(graph: nx.Graph, report: DeltaReport) -> None:
+    """Patch the indexes cached on `graph.graph` for the nodes in `report`."""
+    if not report:
+        return
+    table = graph.graph.get('influencer_table')
+    if table is not None:
+        # Edited and upserted rows were written by set_node_attributes; new edge
+        # endpoints still need an (empty) row
+        table.drop(report.removed)
+        table.append(graph, [n for n in report.added if n not in table])
+    index = graph.graph.get('attribute_index')
+    if index is not None:
+        index.refresh(graph, report.attributes_changed)
+    topology = report.topology_changed
+    for reach in (graph.graph.get('reach_index') or {}).values():
+        reach.refresh(graph, topology)
@@ -0,0 +1,359 @@
+"""Out-of-core edge storage for graphs larger than RAM.
+
+`build_edge_store` converts an edges CSV once into binary CSR chunks on disk:
+nodes are ranked by degree (hubs first) and each chunk holds the complete
+undirected adjacency rows of a contiguous rank range, sized to about
+`chunk_entries` neighbor entries. The conversion streams the CSV, spills edges
+to bucket files and sorts one bucket at a time, so peak memory is a few
+node-length arrays plus one chunk.
+
+`EdgeStore` opens the chunks with `numpy.load(mmap_mode='r')` and runs the
+selection analyses as passes over them: one-hop coverage scores, coverage of a
+selection, a lazy greedy on marginal reach and Monte Carlo cascades. Memory stays
+bounded by O(nodes) arrays and one chunk at a time; the OS page cache decides how
+much of the store stays resident.
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import heapq
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.ingest import CHUNK_ROWS, IngestError, iter_edges, read_users
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+# Neighbor entries per chunk (12 bytes each on disk: int32 row, int32 col, float32 prob)
+CHUNK_ENTRIES = 8_000_000
+_ENTRY = np.dtype([('row', '<i4'), ('col', '<i4'), ('prob', '<f4')])
+
+
+class _Interner:
+    """Maps string ids to int32 positions: users-file ids first, unknown endpoints appended."""
+
+    def __init__(self, known: Optional[pd.Index] = None):
+        self.base = known if known is not None else pd.Index([], dtype=object)
+        self.extra: List = []
+        self._extra_index = pd.Index([], dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.extra)
+
+    def positions(self, ids: np.ndarray) -> np.ndarray:
+        pos = self.base.get_indexer(ids)
+        miss = pos < 0
+        if miss.any():
+            missing = ids[miss]
+            new = pd.Index(pd.unique(missing))
+            new = new[~new.isin(self._extra_index)]
+            if len(new):
+                self.extra.extend(new.tolist())
+                self._extra_index = self._extra_index.append(new)
+            pos[miss] = len(self.base) + self._extra_index.get_indexer(missing)
+        return pos.astype(np.int32)
+
+    def ids(self) -> np.ndarray:
+        return np.concatenate([self.base.to_numpy(dtype=object), np.asarray(self.extra, dtype=object)])
+
+
+def build_edge_store(edges_csv: str, out_dir: str, users_csv: Optional[str] = None,
+                     chunk_entries: int = CHUNK_ENTRIES, chunksize: int = CHUNK_ROWS) -> 'EdgeStore':
+    """Convert `edges_csv` (and the solver columns of `users_csv`) into a chunked store in `out_dir`."""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    columns: Dict[str, np.ndarray] = {}
+    known = None
+    if users_csv:
+        users = read_users(users_csv, chunksize)
+        known = pd.Index(users['id'].to_numpy(dtype=object))
+        for col in ('followers', 'cost', 'risk', 'fake', 'eng_rate'):
+            columns[col] = users[col].to_numpy(dtype=float, na_value=np.nan)
+        del users
+    interner = _Interner(known)
+
+    # Pass 1: intern endpoints, spill (src, dst, prob) to disk and count degrees
+    raw_path = os.path.join(out_dir, '_edges.bin')
+    degree = np.zeros(len(interner), dtype=np.int64)
+    edges = 0
+    with open(raw_path, 'wb') as raw:
+        for chunk in iter_edges(edges_csv, chunksize):
+            src = interner.positions(chunk['source'].to_numpy(dtype=object))
+            dst = interner.positions(chunk['target'].to_numpy(dtype=object))
+            block = np.empty(len(chunk), dtype=_ENTRY)
+            block['row'], block['col'], block['prob'] = src, dst, chunk['prob'].to_numpy(dtype=np.float32)
+            block.tofile(raw)
+            if len(interner) > len(degree):
+                degree = np.concatenate([degree, np.zeros(len(interner) - len(degree), dtype=np.int64)])
+            loop = src == dst
+            degree += np.bincount(src[~loop], minlength=len(degree))
+            degree += np.bincount(dst[~loop], minlength=len(degree))
+            edges += len(chunk)
+    n = len(interner)
+
+    # Degree-sorted rank order and chunk boundaries (whole rows, ~chunk_entries each)
+    order = np.argsort(-degree, kind='stable')
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n)
+    cum = np.cumsum(degree[order])
+    bounds = [0]
+    while bounds[-1] < n:
+        start = cum[bounds[-1] - 1] if bounds[-1] else 0
+        hi = int(np.searchsorted(cum, start + chunk_entries, side='right'))
+        bounds.append(min(n, max(hi, bounds[-1] + 1)))
+    bounds = np.asarray(bounds, dtype=np.int64)
+
+    # Pass 2: spill both directions of every edge into the bucket of its row's rank
+    bucket_paths = [os.path.join(out_dir, f'_bucket_{k:04d}.bin') for k in range(len(bounds) - 1)]
+    raw_edges = np.memmap(raw_path, dtype=_ENTRY, mode='r') if edges else np.zeros(0, dtype=_ENTRY)
+    step = max(1, chunk_entries // 2)
+    for start in range(0, edges, step):
+        block = np.asarray(raw_edges[start:start + step])
+        # Interleaved directions keep file order, so the last duplicate stays last
+        both = np.repeat(block, 2)
+        both['row'][1::2], both['col'][1::2] = block['col'], block['row']
+        bucket = np.searchsorted(bounds, rank[both['row']], side='right') - 1
+        order_b = np.argsort(bucket, kind='stable')
+        both, bucket = both[order_b], bucket[order_b]
+        cuts = np.flatnonzero(np.diff(bucket)) + 1
+        for part in np.split(np.arange(len(both)), cuts):
+            if len(part):
+                with open(bucket_paths[bucket[part[0]]], 'ab') as f:
+                    both[part].tofile(f)
+    del raw_edges
+    os.remove(raw_path)
+
+    # Pass 3: sort each bucket into a CSR chunk over its rank range
+    chunks = []
+    for k, path in enumerate(bucket_paths):
+        lo, hi = int(bounds[k]), int(bounds[k + 1])
+        entries = np.fromfile(path, dtype=_ENTRY) if os.path.exists(path) else np.zeros(0, dtype=_ENTRY)
+        # Self-loops add nothing to a closed neighborhood; repeated edges keep their
+        # last row, as nx.Graph.add_edge does
+        entries = entries[entries['row'] != entries['col']]
+        local = rank[entries['row']] - lo
+        srt = np.lexsort((entries['col'], local))
+        entries, local = entries[srt], local[srt]
+        last = np.ones(len(entries), dtype=bool)
+        last[:-1] = (local[1:] != local[:-1]) | (entries['col'][1:] != entries['col'][:-1])
+        entries, local = entries[last], local[last]
+        indptr = np.zeros(hi - lo + 1, dtype=np.int64)
+        np.cumsum(np.bincount(local, minlength=hi - lo), out=indptr[1:])
+        degree[order[lo:hi]] = np.diff(indptr)
+        name = f'chunk_{k:04d}'
+        np.save(os.path.join(out_dir, name + '.indptr.npy'), indptr)
+        np.save(os.path.join(out_dir, name + '.indices.npy'), entries['col'])
+        np.save(os.path.join(out_dir, name + '.prob.npy'), entries['prob'])
+        chunks.append({'name': name, 'lo': lo, 'hi': hi, 'entries': int(len(entries))})
+        if os.path.exists(path):
+            os.remove(path)
+
+    np.save(os.path.join(out_dir, 'ids.npy'), np.asarray([str(i) for i in interner.ids()]) if n else np.zeros(0, dtype='<U1'))
+    np.save(os.path.join(out_dir, 'order.npy'), order)
+    np.save(os.path.join(out_dir, 'degree.npy'), degree)
+    for col, values in columns.items():
+        full = np.full(n, np.nan)
+        full[:len(values)] = values
+        np.save(os.path.join(out_dir, f'col_{col}.npy'), full)
+    edges = int(degree.sum() // 2)
+    manifest = {'version': FORMAT_VERSION, 'nodes': n, 'edges': edges, 'chunks': chunks,
+                'columns': sorted(columns), 'sources': [os.path.abspath(p) for p in (users_csv, edges_csv) if p]}
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    logger.info("Edge store %s: %d nodes, %d edges in %d chunk(s)", out_dir, n, edges, len(chunks))
+    return EdgeStore(out_dir)
+
+
+def _row_entries(indptr: np.ndarray, local: np.ndarray) -> np.ndarray:
+    """Entry positions of the rows `local` of a CSR chunk, concatenated."""
+    starts = np.asarray(indptr[local], dtype=np.int64)
+    lens = np.asarray(indptr[local + 1], dtype=np.int64) - starts
+    offsets = np.cumsum(lens) - lens
+    return np.repeat(starts - offsets, lens) + np.arange(int(lens.sum()))
+
+
+class EdgeStore:
+    """Memory-mapped chunked adjacency written by `build_edge_store`.
+
+    Node positions follow the users file (unknown edge endpoints appended);
+    `order[r]` is the position of the node with degree rank r, and chunk k holds
+    the rows of ranks [lo, hi) with neighbor positions in `indices`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise IngestError(f"{path}: not an edge store ({e})") from e
+        if self.manifest.get('version') != FORMAT_VERSION:
+            raise IngestError(f"{path}: unsupported edge store version {self.manifest.get('version')}")
+        self.size = int(self.manifest['nodes'])
+        self.edges = int(self.manifest['edges'])
+        self.order = self._load('order')
+        self.degree = self._load('degree')
+        self._pos: Optional[Dict] = None
+
+    def _load(self, name: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, name + '.npy'), mmap_mode='r')
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._load('ids')
+
+    def position(self, n) -> int:
+        """Position of node id `n` (builds the id lookup on first use)."""
+        if self._pos is None:
+            self._pos = {n: i for i, n in enumerate(self.ids.tolist())}
+        return self._pos[n]
+
+    def column(self, name: str, default: float = 0.0) -> np.ndarray:
+        """Users column (followers, cost, risk, fake, eng_rate) by node position; missing -> `default`."""
+        if name not in self.manifest['columns']:
+            return np.full(self.size, default)
+        values = np.asarray(self._load('col_' + name))
+        return np.where(np.isnan(values), default, values)
+
+    def chunks(self) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Yield (rows, indptr, indices, prob) per chunk; rows are node positions."""
+        for c in self.manifest['chunks']:
+            base = os.path.join(self.path, c['name'])
+            yield (np.asarray(self.order[c['lo']:c['hi']]), np.load(base + '.indptr.npy', mmap_mode='r'),
+                   np.load(base + '.indices.npy', mmap_mode='r'), np.load(base + '.prob.npy', mmap_mode='r'))
+
+    def _positions(self, nodes: Iterable) -> np.ndarray:
+        return np.fromiter((self.position(n) for n in nodes), dtype=np.int64)
+
+    # -- streaming analyses -------------------------------------------------
+
+    def coverage_scores(self, weight: Optional[np.ndarray] = None) -> np.ndarray:
+        """One-hop score of every node: total `weight` of its closed neighborhood (node count by default)."""
+        if weight is None:
+            return np.asarray(self.degree, dtype=float) + 1.0
+        weight = np.asarray(weight, dtype=float)
+        score = weight.copy()
+        for rows, indptr, indices, _ in self.chunks():
+            csum = np.concatenate([[0.0], np.cumsum(weight[indices])])
+            score[rows] += csum[indptr[1:]] - csum[indptr[:-1]]
+        return score
+
+    def covered_mask(self, selected: Iterable) -> np.ndarray:
+        """Nodes in the closed one-hop neighborhood of `selected`, in one pass over the chunks."""
+        mask = np.zeros(self.size, dtype=bool)
+        sel = np.zeros(self.size, dtype=bool)
+        sel[self._positions(selected)] = True
+        mask |= sel
+        for rows, indptr, indices, _ in self.chunks():
+            hit = np.flatnonzero(sel[rows])
+            if len(hit):
+                mask[np.asarray(indices[_row_entries(indptr, hit)])] = True
+        return mask
+
+    def coverage(self, selected: Iterable, weight: Optional[np.ndarray] = None) -> float:
+        """Covered node count (or total `weight`) of `selected`."""
+        mask = self.covered_mask(selected)
+        return float(mask.sum()) if weight is None else float(np.asarray(weight)[mask].sum())
+
+    def greedy(self, budget: float, risk_max: float = float('inf'), weight: Optional[np.ndarray] = None,
+               candidates: Optional[Iterable] = None, cost_share: float = 0.5) -> List:
+        """Lazy greedy on marginal one-hop reach per unit of budget/risk share.
+
+        Initial gains come from one streaming pass (`coverage_scores`); afterwards
+        only the top heap entries are re-scored by reading their rows from the
+        memory-mapped chunks, as in the in-memory greedy. Platform bounds are not
+        modelled here.
+        """
+        weight = np.ones(self.size) if weight is None else np.asarray(weight, dtype=float)
+        cost, risk = self.column('cost'), self.column('risk')
+        res = np.zeros(self.size)
+        if budget > 0:
+            res += cost_share * cost / budget
+        if np.isfinite(risk_max) and risk_max > 0:
+            res += (1.0 - cost_share) * risk / risk_max
+        res = np.maximum(res, 1e-12)
+        allowed = np.ones(self.size, dtype=bool)
+        if candidates is not None:
+            allowed[:] = False
+            allowed[self._positions(candidates)] = True
+        # Row locations: chunk and local row of each node
+        where = np.empty((self.size, 2), dtype=np.int64)
+        parts = []
+        for k, (rows, indptr, indices, _) in enumerate(self.chunks()):
+            where[rows, 0] = k
+            where[rows, 1] = np.arange(len(rows))
+            parts.append((indptr, indices))
+
+        covered = np.zeros(self.size, dtype=bool)
+
+        def gain(i: int) -> float:
+            indptr, indices = parts[where[i, 0]]
+            r = where[i, 1]
+            row = np.asarray(indices[indptr[r]:indptr[r + 1]])
+            g = float(weight[row[~covered[row]]].sum())
+            return g + (0.0 if covered[i] else float(weight[i]))
+
+        score = self.coverage_scores(weight) / res
+        heap = [(-score[i], int(i)) for i in np.flatnonzero(allowed)]
+        heapq.heapify(heap)
+        selected, spent, used_risk = [], 0.0, 0.0
+        while heap:
+            neg, i = heapq.heappop(heap)
+            if spent + cost[i] > budget + 1e-9 or used_risk + risk[i] > risk_max + 1e-9:
+                continue
+            g = gain(i) / res[i]
+            if heap and -heap[0][0] > g + 1e-12:
+                heapq.heappush(heap, (-g, i))
+                continue
+            if g <= 0:
+                break
+            selected.append(i)
+            spent += cost[i]
+            used_risk += risk[i]
+            indptr, indices = parts[where[i, 0]]
+            r = where[i, 1]
+            covered[np.asarray(indices[indptr[r]:indptr[r + 1]])] = True
+            covered[i] = True
+        ids = self.ids
+        return [str(ids[i]) for i in selected]
+
+    def monte_carlo(self, selected: Iterable, trials: int = 100, perturb: float = 0.1,
+                    weight: Optional[np.ndarray] = None, seed: Optional[int] = None) -> List[float]:
+        """Independent-cascade simulations like `Optimizer.monte_carlo_robustness`.
+
+        Each edge probability is perturbed by +/- `perturb` and sampled when the
+        cascade first tries it; every cascade level is one pass over the chunks
+        that hold frontier rows. Returns the reached followers (or `weight`) per trial.
+        """
+        rng = np.random.default_rng(seed)
+        weight = self.column('followers') if weight is None else np.asarray(weight, dtype=float)
+        seeds = self._positions(selected)
+        results = []
+        for _ in range(trials):
+            reached = np.zeros(self.size, dtype=bool)
+            reached[seeds] = True
+            frontier = np.zeros(self.size, dtype=bool)
+            frontier[seeds] = True
+            while frontier.any():
+                nxt = np.zeros(self.size, dtype=bool)
+                for rows, indptr, indices, prob in self.chunks():
+                    local = np.flatnonzero(frontier[rows])
+                    if not len(local):
+                        continue
+                    take = _row_entries(indptr, local)
+                    if not len(take):
+                        continue
+                    nbr = np.asarray(indices[take])
+                    p = np.clip(np.asarray(prob[take], dtype=float) * (1 + rng.uniform(-perturb, perturb, len(take))), 0.0, 1.0)
+                    live = nbr[(rng.random(len(take)) <= p) & ~reached[nbr]]
+                    nxt[live] = True
+                nxt &= ~reached
+                reached |= nxt
+                frontier = nxt
+            results.append(float(weight[reached].sum()))
+        return results
@@ -0,0 +1,179 @@
+"""Incremental evaluation of a hand-picked selection.
+
+Manual curation on the canvas adds or removes one influencer at a time. Instead
+of recomputing the summary over the whole graph after every click, the evaluator
+keeps a cover count per node and running totals, so each toggle costs O(|row|)
+for the node's reach row (O(deg) with one hop). A lazily refreshed priority queue
+answers "which influencer should I add next?" without rescoring every node.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import heapq
+
+import networkx as nx
+import numpy as np
+
+from core.data_models import get_influencer_table
+from core.reach_index import get_reach_index
+
+
+class IncrementalEvaluator:
+    """Running cost, risk, reach and conversion totals of a changing selection.
+
+    Reach uses the same k-hop index as the solvers; `followers` and `eng_rate`
+    give the reached-followers and expected-conversion totals shown in the GUI.
+    """
+
+    def __init__(self, graph: nx.Graph, hops: int = 1, candidates: Optional[Iterable] = None):
+        self.graph = graph
+        self.index = get_reach_index(graph, hops)
+        self.candidates = set(candidates) if candidates is not None else None
+        nodes = self.index.nodes
+        table = get_influencer_table(graph)
+
+        def attr(key: str) -> np.ndarray:
+            return table.values(key, nodes)
+
+        self.cost = attr('cost')
+        self.risk = attr('risk')
+        self.followers = attr('followers')
+        self.conversions = self.followers * attr('eng_rate')
+        self.count = np.zeros(len(nodes), dtype=np.int32)
+        self.selected: set = set()
+        self.total_cost = 0.0
+        self.total_risk = 0.0
+        self.covered = 0
+        self.reached_followers = 0.0
+        self.expected_conversions = 0.0
+        self._heap: List[Tuple[float, int, int]] = []
+        self._version = np.zeros(len(nodes), dtype=np.int64)
+        self._heap_ready = False
+
+    # -- updates ----------------------------------------------------------
+
+    def add(self, n) -> List:
+        """Select `n`; returns the nodes it newly reaches."""
+        if n in self.selected:
+            return []
+        i = self.index.pos[n]
+        row = self.index.row(n)
+        fresh = row[self.count[row] == 0]
+        self.count[row] += 1
+        self.selected.add(n)
+        self.total_cost += float(self.cost[i])
+        self.total_risk += float(self.risk[i])
+        self._account(fresh, 1)
+        return [self.index.nodes[j] for j in fresh]
+
+    def remove(self, n) -> List:
+        """Deselect `n`; returns the nodes no longer reached."""
+        if n not in self.selected:
+            return []
+        i = self.index.pos[n]
+        row = self.index.row(n)
+        self.count[row] -= 1
+        lost = row[self.count[row] == 0]
+        self.selected.discard(n)
+        self.total_cost -= float(self.cost[i])
+        self.total_risk -= float(self.risk[i])
+        self._account(lost, -1)
+        if self._heap_ready:
+            # Gains only grow for `n` and nodes whose rows touch the uncovered
+            # nodes (rows are symmetric); requeue those with fresh scores
+            touched = {i}
+            for j in lost:
+                touched.update(self.index.indices[self.index.indptr[j]:self.index.indptr[j + 1]].tolist())
+            for j in touched:
+                self._push(j)
+        return [self.index.nodes[j] for j in lost]
+
+    def toggle(self, n) -> Tuple[bool, List]:
+        """Flip `n`; returns (now selected, nodes whose reached state changed)."""
+        if n in self.selected:
+            return False, self.remove(n)
+        return True, self.add(n)
+
+    def reset(self, selected: Iterable = ()) -> None:
+        """Start over from `selected`."""
+        self.count[:] = 0
+        self.selected = set()
+        self.total_cost = self.total_risk = 0.0
+        self.covered = 0
+        self.reached_followers = self.expected_conversions = 0.0
+        self._heap = []
+        self._heap_ready = False
+        for n in selected:
+            if n in self.index.pos:
+                self.add(n)
+
+    def _account(self, idx: np.ndarray, sign: int) -> None:
+        self.covered += sign * len(idx)
+        self.reached_followers += sign * float(self.followers[idx].sum())
+        self.expected_conversions += sign * float(self.conversions[idx].sum())
+
+    # -- queries ----------------------------------------------------------
+
+    def is_reached(self, n) -> bool:
+        return bool(self.count[self.index.pos[n]] > 0)
+
+    def gain(self, n) -> float:
+        """Followers newly reached if `n` were added."""
+        row = self.index.row(n)
+        return float(self.followers[row[self.count[row] == 0]].sum())
+
+    def summary(self, conv_value: float = 0.0) -> Dict:
+        """Totals in the same shape as the SolveWorker summary."""
+        return {
+            'selected': sorted(self.selected, key=self.index.pos.get),
+            'total_cost': self.total_cost,
+            'total_risk': self.total_risk,
+            'covered': self.covered,
+            'reached_followers': int(round(self.reached_followers)),
+            'expected_conversions': self.expected_conversions,
+            'roi': conv_value * self.expected_conversions - self.total_cost,
+        }
+
+    def _score(self, j: int) -> float:
+        return self.gain(self.index.nodes[j]) / max(self.cost[j], 1e-9)
+
+    def _push(self, j: int) -> None:
+        if self.candidates is not None and self.index.nodes[j] not in self.candidates:
+            return
+        self._version[j] += 1
+        heapq.heappush(self._heap, (-self._score(j), j, int(self._version[j])))
+
+    def best_next(self, budget: Optional[float] = None, risk_max: Optional[float] = None) -> Optional[Tuple]:
+        """Unselected node with the most newly reached followers per unit cost.
+
+        Returns (node, gain) or None. Heap entries are upper bounds (gains only
+        shrink as the selection grows), so only the top entries are rescored.
+        Nodes that do not fit the remaining budget or risk are skipped for now.
+        """
+        if not self._heap_ready:
+            self._heap = []
+            for j, n in enumerate(self.index.nodes):
+                if self.candidates is None or n in self.candidates:
+                    self._version[j] += 1
+                    self._heap.append((-self._score(j), j, int(self._version[j])))
+            heapq.heapify(self._heap)
+            self._heap_ready = True
+        skipped = []
+        best = None
+        while self._heap:
+            neg, j, version = heapq.heappop(self._heap)
+            n = self.index.nodes[j]
+            if version != self._version[j] or n in self.selected:
+                continue
+            if (budget is not None and self.total_cost + self.cost[j] > budget + 1e-9) or \
+                    (risk_max is not None and self.total_risk + self.risk[j] > risk_max + 1e-9):
+                skipped.append((neg, j, version))
+                continue
+            score = self._score(j)
+            if self._heap and -self._heap[0][0] > score + 1e-12:
+                heapq.heappush(self._heap, (-score, j, version))
+                continue
+            heapq.heappush(self._heap, (-score, j, version))
+            best = (n, self.gain(n))
+            break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return best
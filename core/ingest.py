@@ -0,0 +1,408 @@
+"""Columnar CSV ingestion for users and edges.
+
+One vectorized pass per file with pandas: explicit dtypes for the known columns,
+chunked reading so huge exports never need a second in-memory copy of the text,
+and validation of ids and value ranges. The result is a `GraphSnapshot` (NumPy /
+pandas columns plus integer edge endpoints) that can be turned into the
+`nx.Graph` used by the GUI and the optimizer.
+
+Missing optional values are normalised once here: `age`, `eng_rate`, `region` and
+`gender` become None, `name` falls back to the id, `platform` to 'IG' and the
+numeric solver columns to 0.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+import io
+import logging
+import os
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from core.data_models import TABLE_COLUMNS, InfluencerTable
+
+logger = logging.getLogger(__name__)
+
+# Rows per chunk handed to pandas; bounds the peak size of the text buffers
+CHUNK_ROWS = 500_000
+# Edge files at least this large are parsed in a process pool, in byte ranges of
+# about PARALLEL_CHUNK_BYTES split on line boundaries
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+PARALLEL_CHUNK_BYTES = 16 * 1024 * 1024
+
+USER_DTYPES = {
+    'id': 'str', 'name': 'str', 'platform': 'str', 'region': 'str', 'gender': 'str',
+    'followers': 'float64', 'cost': 'float64', 'risk': 'float64', 'fake': 'float64',
+    'age': 'float64', 'eng_rate': 'float64',
+}
+EDGE_DTYPES = {'source': 'str', 'target': 'str', 'weight': 'float64', 'prob': 'float64', 'delay_hours': 'float64'}
+
+# Defaults for absent columns or empty cells; None stays missing
+USER_DEFAULTS = {'platform': 'IG', 'followers': 0, 'cost': 0.0, 'risk': 0.0, 'fake': 0.0,
+                 'age': None, 'region': None, 'gender': None, 'eng_rate': None}
+EDGE_DEFAULTS = {'weight': 1.0, 'prob': 1.0}
+
+# Columns that must lie in [0, 1] and columns that must be >= 0
+UNIT_COLUMNS = ('risk', 'fake', 'eng_rate')
+NON_NEGATIVE_COLUMNS = ('followers', 'cost', 'age')
+
+
+# Leading bytes of the compressed formats read transparently (zstd needs `zstandard`)
+MAGIC = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+)
+
+
+class IngestError(ValueError):
+    """Raised when an input file is missing columns or holds invalid values."""
+
+
+def compression(path: str) -> Optional[str]:
+    """Compression of `path` detected from its magic bytes (None for plain text)."""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(6)
+    except OSError as e:
+        raise IngestError(f"{path}: cannot read CSV ({e})") from e
+    for magic, method in MAGIC:
+        if head.startswith(magic):
+            return method
+    return None
+
+
+def _header(path: str, required: Tuple[str, ...]) -> pd.Index:
+    try:
+        header = pd.read_csv(path, nrows=0, compression=compression(path)).columns
+    except ImportError as e:
+        raise IngestError(f"{path}: {compression(path)} input needs an optional package ({e})") from e
+    except (OSError, EOFError, pd.errors.EmptyDataError) as e:
+        raise IngestError(f"{path}: cannot read CSV ({e})") from e
+    missing = [c for c in required if c not in header]
+    if missing:
+        raise IngestError(f"{path}: missing required column(s) {', '.join(missing)}")
+    return header
+
+
+def _csv_chunks(path: str, header: pd.Index, dtypes: Dict[str, str], chunksize: int,
+                usecols: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    dtype = {c: t for c, t in dtypes.items() if c in header and (usecols is None or c in usecols)}
+    try:
+        # Only empty cells are missing: region codes such as 'NA' are real values.
+        # Compressed files are decompressed while pandas reads, never to disk.
+        yield from pd.read_csv(path, dtype=dtype, chunksize=chunksize, skipinitialspace=True, usecols=usecols,
+                               keep_default_na=False, na_values=[''], compression=compression(path))
+    except (ValueError, OSError, EOFError) as e:
+        raise IngestError(f"{path}: {e}") from e
+
+
+def _read_csv(path: str, dtypes: Dict[str, str], required: Tuple[str, ...], chunksize: int,
+              columns: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+    """Read `path` in chunks; `columns` restricts parsing to those (of the present) columns."""
+    header = _header(path, required)
+    usecols = None if columns is None else [c for c in header if c in columns]
+    chunks = list(_csv_chunks(path, header, dtypes, chunksize, usecols))
+    if not chunks:
+        return pd.DataFrame(columns=list(header) if usecols is None else usecols)
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+
+def _check_range(df: pd.DataFrame, path: str, key: str) -> None:
+    for col in UNIT_COLUMNS + NON_NEGATIVE_COLUMNS:
+        if col not in df:
+            continue
+        values = df[col]
+        bad = values < 0
+        if col in UNIT_COLUMNS:
+            bad |= values > 1
+        if bad.any():
+            sample = ', '.join(map(str, df.loc[bad, key].head(3)))
+            raise IngestError(f"{path}: {int(bad.sum())} row(s) with {col} out of range (e.g. {sample})")
+
+
+def read_users(path: str, chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+    """Parse and validate a users CSV into a DataFrame indexed 0..n-1.
+
+    Known columns get their dtype and defaults; extra vendor columns are kept
+    as read. Duplicate ids keep their last row, as repeated `add_node` did.
+    """
+    df = _read_csv(path, USER_DTYPES, ('id',), chunksize)
+    dup = df['id'].duplicated(keep='last')
+    if dup.any():
+        logger.warning("%s: %d duplicate id(s); keeping the last row of each", path, int(dup.sum()))
+        df = df[~dup].reset_index(drop=True)
+    return _check_users(df, path)
+
+
+def iter_users(path: str, chunksize: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Like `read_users`, but yields validated chunks; duplicate ids are not merged across chunks."""
+    header = _header(path, ('id',))
+    for chunk in _csv_chunks(path, header, USER_DTYPES, chunksize):
+        yield _check_users(chunk, path)
+
+
+def _check_users(df: pd.DataFrame, path: str) -> pd.DataFrame:
+    if df['id'].isna().any():
+        raise IngestError(f"{path}: {int(df['id'].isna().sum())} row(s) without id")
+    for col, default in USER_DEFAULTS.items():
+        if col not in df:
+            numeric = USER_DTYPES[col] == 'float64'
+            df[col] = default if default is not None else (np.nan if numeric else None)
+        elif default is not None:
+            df[col] = df[col].fillna(default)
+    df['name'] = df['name'].fillna(df['id']) if 'name' in df else df['id']
+    df['followers'] = df['followers'].astype('int64')
+    df['age'] = df['age'].round().astype('Int64')
+    _check_range(df, path, 'id')
+    return df
+
+
+def read_edges(path: str, chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+    """Parse and validate an edges CSV (source, target, weight, prob[, delay_hours])."""
+    return _check_edges(_read_csv(path, EDGE_DTYPES, ('source', 'target'), chunksize), path)
+
+
+def iter_edges(path: str, chunksize: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Like `read_edges`, but yields validated chunks of at most `chunksize` rows."""
+    header = _header(path, ('source', 'target'))
+    for chunk in _csv_chunks(path, header, EDGE_DTYPES, chunksize):
+        yield _check_edges(chunk, path)
+
+
+def _byte_ranges(path: str, chunk_bytes: int) -> Tuple[int, List[Tuple[int, int]]]:
+    """Split the body of `path` (after the header line) into ranges ending on newlines."""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        f.readline()
+        start = body = f.tell()
+        ranges = []
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            if f.tell() < size:
+                f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return body, ranges
+
+
+def _parse_edge_range(job: Tuple[str, List[str], int, int]) -> Dict[str, np.ndarray]:
+    """Parse one byte range of an edges file; endpoints come back factorized per range.
+
+    Returns 'ids' (the range's distinct endpoints in order of first appearance,
+    sources before targets), int32 'src'/'dst' codes into them and the value columns.
+    """
+    path, columns, start, end = job
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    dtype = {c: t for c, t in EDGE_DTYPES.items() if c in columns}
+    try:
+        df = pd.read_csv(io.BytesIO(data), names=columns, header=None, dtype=dtype, skipinitialspace=True,
+                         keep_default_na=False, na_values=[''])
+    except ValueError as e:
+        raise IngestError(f"{path}: {e}") from e
+    df = _check_edges(df, path)
+    n = len(df)
+    codes, ids = pd.factorize(np.concatenate([df['source'].to_numpy(dtype=object), df['target'].to_numpy(dtype=object)]))
+    out = {'ids': np.asarray(ids, dtype=object), 'src': codes[:n].astype(np.int32), 'dst': codes[n:].astype(np.int32)}
+    for col in ('weight', 'prob', 'delay_hours'):
+        if col in df:
+            out[col] = df[col].to_numpy(dtype=float)
+    return out
+
+
+def read_edges_parallel(path: str, workers: Optional[int] = None,
+                        chunk_bytes: int = PARALLEL_CHUNK_BYTES) -> Tuple[np.ndarray, np.ndarray, np.ndarray, pd.DataFrame]:
+    """Parse an edges CSV in a process pool; returns (endpoints, src, dst, values).
+
+    The file is cut into byte ranges on line boundaries (quoted fields must not
+    span lines). Each worker parses and validates one range and factorizes its
+    endpoints; the parent remaps the per-range codes onto one endpoint index with
+    array lookups, so no Python code runs per row. `endpoints` is ordered like
+    `pd.unique(sources + targets)` so the result matches the serial reader, `src`
+    and `dst` index into it and `values` holds weight, prob (and delay_hours).
+    Falls back to parsing the ranges in-process if a pool cannot be created.
+    """
+    import concurrent.futures as cf
+    import multiprocessing
+
+    columns = list(_header(path, ('source', 'target')))
+    if compression(path):
+        # A compressed stream cannot be split at byte offsets; parse it serially
+        df = read_edges(path)
+        n = len(df)
+        codes, ids = pd.factorize(np.concatenate([df['source'].to_numpy(dtype=object),
+                                                  df['target'].to_numpy(dtype=object)]))
+        values = df[[c for c in ('weight', 'prob', 'delay_hours') if c in df]].astype(float).reset_index(drop=True)
+        return np.asarray(ids, dtype=object), codes[:n].astype(np.int32), codes[n:].astype(np.int32), values
+    _, ranges = _byte_ranges(path, chunk_bytes)
+    jobs = [(path, columns, start, end) for start, end in ranges]
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    parts: List[Dict[str, np.ndarray]] = []
+    if workers > 1 and len(jobs) > 1:
+        try:
+            # spawn: safe to use from a GUI worker thread on every platform
+            ctx = multiprocessing.get_context('spawn')
+            with cf.ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                parts = list(pool.map(_parse_edge_range, jobs))
+        except IngestError:
+            raise
+        except Exception as e:
+            logger.warning("Process pool unavailable (%s); parsing %s sequentially", e, path)
+            parts = []
+    if not parts:
+        parts = [_parse_edge_range(job) for job in jobs]
+    if not parts:
+        empty = _check_edges(pd.DataFrame({c: pd.Series(dtype=t) for c, t in EDGE_DTYPES.items() if c in columns}), path)
+        return np.zeros(0, dtype=object), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32), \
+            empty.drop(columns=['source', 'target'])
+
+    # One index over all per-range endpoints, then remap each range's codes
+    merged = pd.Index(pd.unique(np.concatenate([p['ids'] for p in parts])))
+    src = np.concatenate([merged.get_indexer(p['ids'])[p['src']] for p in parts])
+    dst = np.concatenate([merged.get_indexer(p['ids'])[p['dst']] for p in parts])
+    # Reorder endpoints by first appearance among all sources, then all targets
+    m, e = len(merged), len(src)
+    first = np.full(m, 2 * e, dtype=np.int64)
+    uniq, at = np.unique(dst, return_index=True)
+    first[uniq] = e + at
+    uniq, at = np.unique(src, return_index=True)
+    first[uniq] = at
+    order = np.argsort(first, kind='stable')
+    relabel = np.empty(m, dtype=np.int32)
+    relabel[order] = np.arange(m, dtype=np.int32)
+    values = pd.DataFrame({c: np.concatenate([p[c] for p in parts]) for c in ('weight', 'prob', 'delay_hours')
+                           if c in parts[0]})
+    return merged.to_numpy(dtype=object)[order], relabel[src], relabel[dst], values
+
+
+def _check_edges(df: pd.DataFrame, path: str) -> pd.DataFrame:
+    if df['source'].isna().any() or df['target'].isna().any():
+        raise IngestError(f"{path}: edge rows with an empty source or target")
+    for col, default in EDGE_DEFAULTS.items():
+        df[col] = df[col].fillna(default) if col in df else default
+    bad = (df['prob'] < 0) | (df['prob'] > 1)
+    if bad.any():
+        raise IngestError(f"{path}: {int(bad.sum())} edge(s) with prob outside [0, 1]")
+    return df
+
+
+def _records(df: pd.DataFrame) -> List[Dict]:
+    """Row dicts with NaN turned into None (column-wise, much faster than `to_dict('records')`)."""
+    cols = list(df.columns)
+    if not cols:
+        return [{} for _ in range(len(df))]
+    values = [df[c].astype(object).where(df[c].notna(), None).tolist() if df[c].hasnans else df[c].tolist()
+              for c in cols]
+    return [dict(zip(cols, row)) for row in zip(*values)]
+
+
+@dataclass
+class GraphSnapshot:
+    """Columnar view of a dataset: `ids[i]` is node i, edges are position pairs.
+
+    The first `len(users)` ids are the users rows in order. Edge endpoints that are
+    not in the users file are appended after them without attributes, matching
+    what `nx.Graph.add_edge` does.
+    """
+    ids: np.ndarray
+    users: pd.DataFrame
+    src: np.ndarray
+    dst: np.ndarray
+    edges: pd.DataFrame
+
+    @property
+    def node_count(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.src)
+
+    def csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Undirected adjacency as (indptr, indices, prob), neighbors sorted per row."""
+        n = self.node_count
+        rows = np.concatenate([self.src, self.dst])
+        cols = np.concatenate([self.dst, self.src])
+        prob = np.concatenate([self.edges['prob'].to_numpy(float)] * 2)
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return indptr, cols[order].astype(np.int32), prob[order]
+
+    def to_networkx(self) -> nx.Graph:
+        G = nx.Graph()
+        # The table columns live in the influencer table only; node dicts keep the rest
+        add_users(G, self.users.drop(columns=[c for c in TABLE_COLUMNS if c in self.users]))
+        add_edges(G, self.edges)
+        G.graph['influencer_table'] = InfluencerTable.from_frame(self.users, list(G.nodes()))
+        return G
+
+
+def snapshot(users: pd.DataFrame, edges: Optional[pd.DataFrame] = None) -> GraphSnapshot:
+    """Build a snapshot from parsed users and edges, interning edge endpoints with a hash index."""
+    if edges is None:
+        edges = pd.DataFrame({c: pd.Series(dtype=t) for c, t in EDGE_DTYPES.items()})
+    n = len(edges)
+    codes, endpoints = pd.factorize(np.concatenate([edges['source'].to_numpy(dtype=object),
+                                                    edges['target'].to_numpy(dtype=object)]))
+    return _merge_endpoints(users, np.asarray(endpoints, dtype=object), codes[:n], codes[n:], edges)
+
+
+def _merge_endpoints(users: pd.DataFrame, endpoints: np.ndarray, src: np.ndarray, dst: np.ndarray,
+                     edges: pd.DataFrame) -> GraphSnapshot:
+    """Snapshot from edges given as codes into `endpoints`; users ids come first."""
+    known = pd.Index(users['id'].to_numpy(dtype=object))
+    endpoints = pd.Index(endpoints, dtype=object)
+    extra = endpoints[~endpoints.isin(known)]
+    if len(extra):
+        logger.info("%d edge endpoint(s) not in the users file; adding them without attributes", len(extra))
+        known = known.append(extra)
+    mapping = known.get_indexer(endpoints).astype(np.int32)
+    src, dst = mapping[src], mapping[dst]
+    if 'source' not in edges:
+        ids = known.to_numpy(dtype=object)
+        edges = pd.concat([pd.DataFrame({'source': ids[src], 'target': ids[dst]}), edges], axis=1)
+    return GraphSnapshot(ids=known.to_numpy(dtype=object), users=users, src=src, dst=dst, edges=edges)
+
+
+def load_snapshot(users_csv: str, edges_csv: Optional[str] = None, chunksize: int = CHUNK_ROWS,
+                  workers: Optional[int] = None) -> GraphSnapshot:
+    """Parse users (and edges) CSVs into a snapshot.
+
+    On multi-core machines edge files of at least PARALLEL_MIN_BYTES (or any
+    size with `workers` > 1) are parsed by `read_edges_parallel`; `workers=1`
+    forces the serial reader.
+    """
+    users = read_users(users_csv, chunksize)
+    if workers:
+        parallel = workers > 1
+    else:
+        parallel = (os.cpu_count() or 1) > 1 and bool(edges_csv) and os.path.getsize(edges_csv) >= PARALLEL_MIN_BYTES \
+            and compression(edges_csv) is None
+    if edges_csv and parallel:
+        endpoints, src, dst, values = read_edges_parallel(edges_csv, workers)
+        return _merge_endpoints(users, endpoints, src, dst, values)
+    edges = read_edges(edges_csv, chunksize) if edges_csv else None
+    return snapshot(users, edges)
+
+
+def load_graph(users_csv: str, edges_csv: Optional[str] = None, chunksize: int = CHUNK_ROWS) -> nx.Graph:
+    """Parse users (and edges) CSVs into the `nx.Graph` used by the GUI and optimizer."""
+    return load_snapshot(users_csv, edges_csv, chunksize).to_networkx()
+
+
+def add_users(G: nx.Graph, users: pd.DataFrame) -> None:
+    """Add (or update) one node per users row; the `id` column becomes the node id."""
+    ids = users['id'].tolist()
+    G.add_nodes_from(zip(ids, _records(users.drop(columns='id'))))
+
+
+def add_edges(G: nx.Graph, edges: pd.DataFrame) -> None:
+    """Add one edge per row with weight, prob and (when present) delay_hours attributes."""
+    cols = [c for c in ('weight', 'prob', 'delay_hours') if c in edges]
+    G.add_edges_from(zip(edges['source'].tolist(), edges['target'].tolist(), _records(edges[cols])))
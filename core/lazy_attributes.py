@@ -0,0 +1,208 @@
+"""Topology-first dataset loading with attributes fetched on demand.
+
+`load_graph_lazy` parses only the edges and the columns needed to draw and
+solve (`EAGER_COLUMNS`). For every users row it records the byte span of its
+line instead, so the other columns (age, region, gender and any vendor columns)
+are read from the file when something asks for them:
+
+- `node_attributes(graph, n)` merges one node's deferred columns, influencer
+  table row and node dict (tooltips, `NodeEditDialog`);
+- `all_node_attributes(graph)` does the same for every node, reading the file
+  once (session saving);
+- `DeferredAttributes.frame(nodes, columns)` parses the lines of just those
+  nodes into a DataFrame, optionally only some columns (exporters, the audience
+  columns of `core.attribute_index`).
+
+Deferred values are never copied into the influencer table or the node dicts:
+reading them leaves the graph as loaded, so worker threads may read too.
+
+`node_attributes` is also how to read any loaded graph: the influencer table
+columns are not copied into node dicts (see `core.data_models`). Values set on a
+node (edits, deltas) take precedence over the file. Line spans
+need one users row per physical line, so quoted fields must not span lines;
+compressed files are loaded eagerly.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import io
+import logging
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from core.data_models import TABLE_COLUMNS
+from core.ingest import (CHUNK_ROWS, USER_DEFAULTS, USER_DTYPES, _check_users, _header, _read_csv, _records,
+                         compression, load_graph, read_edges, snapshot)
+
+logger = logging.getLogger(__name__)
+
+# Columns parsed at load time: what the canvas draws and the solvers read
+EAGER_COLUMNS = ('name', 'platform', 'followers', 'cost', 'risk', 'fake', 'eng_rate')
+# Bytes scanned per read when indexing line offsets
+BLOCK_BYTES = 16 * 1024 * 1024
+# Users files with at least this many vendor columns are worth opening lazily
+WIDE_EXTRA_COLUMNS = 4
+
+
+def line_spans(path: str, block_bytes: int = BLOCK_BYTES) -> Tuple[np.ndarray, np.ndarray]:
+    """(start, end) byte offsets of the non-blank data lines of `path`, header excluded.
+
+    `end` excludes the line terminator (`\\n` or `\\r\\n`). Blank lines are
+    skipped, as pandas skips them.
+    """
+    newlines, cr = [], []
+    prev = b''
+    with open(path, 'rb') as f:
+        base = 0
+        while True:
+            block = f.read(block_bytes)
+            if not block:
+                break
+            buf = np.frombuffer(block, dtype=np.uint8)
+            at = np.flatnonzero(buf == 10)
+            before = np.empty(len(at), dtype=bool)
+            if len(at):
+                inner = at > 0
+                before[inner] = buf[at[inner] - 1] == 13
+                before[~inner] = prev == b'\r'
+            newlines.append(at + base)
+            cr.append(before)
+            prev = block[-1:]
+            base += len(block)
+    size = base
+    nl = np.concatenate(newlines) if newlines else np.zeros(0, dtype=np.int64)
+    ends = nl - np.concatenate(cr).astype(np.int64) if cr else nl
+    starts = np.concatenate([[0], nl + 1])
+    ends = np.concatenate([ends, [size]])
+    # A last line without a trailing newline is a row; an empty tail is not
+    if starts[-1] >= size:
+        starts, ends = starts[:-1], ends[:-1]
+    starts, ends = starts[1:], ends[1:]
+    keep = ends > starts
+    return starts[keep].astype(np.int64), ends[keep].astype(np.int64)
+
+
+class DeferredAttributes:
+    """Byte-offset index of the users rows of a CSV, for the columns not loaded eagerly."""
+
+    def __init__(self, path: str, ids: Iterable, starts: np.ndarray, ends: np.ndarray, columns: List[str]):
+        self.path = path
+        self.index = pd.Index(list(ids), dtype=object)
+        self.starts = starts
+        self.ends = ends
+        self.columns = list(columns)
+        with open(path, 'rb') as f:
+            self._header = f.readline().rstrip(b'\r\n')
+        self._cache: Dict = {}
+
+    def __contains__(self, n) -> bool:
+        return n in self.index
+
+    def _normalise(self, frame: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Loader dtypes for the deferred columns; known columns absent from the file become missing."""
+        if 'age' in frame:
+            frame['age'] = frame['age'].round().astype('Int64')
+        for col in USER_DEFAULTS:
+            if col not in frame and col not in EAGER_COLUMNS and (columns is None or col in columns):
+                frame[col] = None
+        return frame
+
+    def _parse(self, data: bytes, columns: List[str]) -> pd.DataFrame:
+        read = [c for c in columns if c in self.columns]
+        dtype = {c: t for c, t in USER_DTYPES.items() if c in read or c == 'id'}
+        frame = pd.read_csv(io.BytesIO(data), dtype=dtype, skipinitialspace=True, usecols=['id', *read],
+                            keep_default_na=False, na_values=[''])
+        return self._normalise(frame, columns)
+
+    def frame(self, nodes: Iterable, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """`id` plus the deferred `columns` (default all) for the given nodes (those in the file), in node order."""
+        columns = self.columns if columns is None else list(columns)
+        pos = self.index.get_indexer(pd.Index(list(nodes), dtype=object))
+        pos = pos[pos >= 0]
+        lines = [self._header]
+        with open(self.path, 'rb') as f:
+            # Read in file order, then put the rows back in the requested order
+            order = np.argsort(self.starts[pos], kind='stable')
+            for i in pos[order].tolist():
+                f.seek(self.starts[i])
+                lines.append(f.read(self.ends[i] - self.starts[i]))
+        frame = self._parse(b"\n".join(lines) + b"\n", columns)
+        back = np.empty(len(order), dtype=np.int64)
+        back[order] = np.arange(len(order))
+        return frame.iloc[back].reset_index(drop=True)
+
+    def get(self, n) -> Dict:
+        """Deferred columns of node `n` ({} when it has no users row); cached per node."""
+        if n not in self._cache:
+            frame = self.frame([n])
+            self._cache[n] = _records(frame.drop(columns='id'))[0] if len(frame) else {}
+        return self._cache[n]
+
+    def read_all(self, chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+        """`id` plus the deferred columns for every indexed row, in one pass over the file."""
+        frame = _read_csv(self.path, USER_DTYPES, ('id',), chunksize, columns=('id', *self.columns))
+        frame = frame[~frame['id'].duplicated(keep='last')].reset_index(drop=True)
+        return self._normalise(frame)
+
+
+def is_wide(users_csv: str) -> bool:
+    """True for an uncompressed users file with at least WIDE_EXTRA_COLUMNS vendor columns."""
+    if compression(users_csv):
+        return False
+    extra = [c for c in _header(users_csv, ('id',)) if c not in USER_DTYPES]
+    return len(extra) >= WIDE_EXTRA_COLUMNS
+
+
+def load_graph_lazy(users_csv: str, edges_csv: Optional[str] = None, chunksize: int = CHUNK_ROWS) -> nx.Graph:
+    """Like `core.ingest.load_graph`, parsing only `EAGER_COLUMNS` of the users file.
+
+    The remaining columns are indexed in `graph.graph['deferred_attributes']`.
+    Falls back to a full load for compressed files or when rows and lines do not
+    line up (quoted line breaks).
+    """
+    if compression(users_csv):
+        return load_graph(users_csv, edges_csv, chunksize)
+    header = _header(users_csv, ('id',))
+    deferred = [c for c in header if c != 'id' and c not in EAGER_COLUMNS]
+    if not deferred:
+        return load_graph(users_csv, edges_csv, chunksize)
+    users = _read_csv(users_csv, USER_DTYPES, ('id',), chunksize, columns=('id', *EAGER_COLUMNS))
+    starts, ends = line_spans(users_csv)
+    if len(starts) != len(users):
+        logger.info("%s: rows do not match lines; loading every column", users_csv)
+        return load_graph(users_csv, edges_csv, chunksize)
+    keep = ~users['id'].duplicated(keep='last').to_numpy()
+    users = _check_users(users[keep].reset_index(drop=True), users_csv)
+    users = users[['id', *EAGER_COLUMNS]]
+    edges = read_edges(edges_csv, chunksize) if edges_csv else None
+    G = snapshot(users, edges).to_networkx()
+    G.graph['deferred_attributes'] = DeferredAttributes(users_csv, users['id'], starts[keep], ends[keep], deferred)
+    return G
+
+
+def _merged(n, attrs: Dict, table, deferred_row: Optional[Dict]) -> Dict:
+    # Missing table columns are left out, as `InfluencerTable.record` does
+    out = {k: v for k, v in (deferred_row or {}).items() if v is not None or k not in TABLE_COLUMNS}
+    if table is not None and n in table:
+        out.update(table.record(n))
+    out.update(attrs)
+    return out
+
+
+def node_attributes(graph: nx.Graph, n) -> Dict:
+    """All attributes of node `n`: deferred columns, then table row, then node dict (later ones win)."""
+    deferred = graph.graph.get('deferred_attributes')
+    row = deferred.get(n) if deferred is not None and n in deferred else None
+    return _merged(n, graph.nodes[n], graph.graph.get('influencer_table'), row)
+
+
+def all_node_attributes(graph: nx.Graph) -> List[Tuple]:
+    """(node, `node_attributes`) for every node, in node order."""
+    deferred = graph.graph.get('deferred_attributes')
+    rows: Dict = {}
+    if deferred is not None:
+        frame = deferred.read_all()
+        rows = dict(zip(frame['id'].tolist(), _records(frame.drop(columns='id'))))
+    table = graph.graph.get('influencer_table')
+    return [(n, _merged(n, d, table, rows.get(n))) for n, d in graph.nodes(data=True)]
+
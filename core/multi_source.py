@@ -0,0 +1,156 @@
+"""Multi-source ingestion: merge per-platform vendor files into one creator graph.
+
+The same creator often appears as separate accounts (one IG row, one TT row, ...)
+in different vendor files. An identity table with columns `id` (account id, as
+used in the users and edges files) and `creator` (canonical id) says which
+accounts belong together; accounts it does not list stay creators of their own.
+
+Everything is done with pandas joins and group-bys, never a Python loop over
+rows:
+
+- users files are concatenated (a later file overrides an earlier row with the
+  same account id) and joined to the identity table;
+- each creator gets the usual attributes, aggregated over its accounts:
+  followers and cost are summed, risk is the maximum, fake and eng_rate are
+  follower-weighted means, platform is the platform of the largest account and
+  the remaining columns take the first non-missing value in file order;
+- per-platform sub-attributes are added as `<platform>_<attr>` columns
+  (e.g. `TT_followers`, `IG_id`), missing where the creator has no such account;
+- a repeated (source, target) account row overrides the earlier one, as for
+  users; then edge endpoints are mapped to creators, edges between two accounts
+  of one creator are dropped and parallel edges are combined (weights summed,
+  prob as the chance that at least one of them fires, earliest delay).
+"""
+from typing import Optional, Sequence, Union
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from core.ingest import CHUNK_ROWS, GraphSnapshot, IngestError, _read_csv, read_edges, read_users, snapshot
+
+# Account attributes kept per platform as `<platform>_<attr>` columns
+SUB_ATTRIBUTES = ('id', 'followers', 'cost', 'risk', 'eng_rate')
+
+
+def read_identity(path: str, chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+    """Parse an identity table (`id`, `creator`); each account may map to one creator only."""
+    df = _read_csv(path, {'id': 'str', 'creator': 'str'}, ('id', 'creator'), chunksize)
+    return _check_identity(df[['id', 'creator']], path)
+
+
+def _check_identity(df: pd.DataFrame, path: str) -> pd.DataFrame:
+    if df['id'].isna().any() or df['creator'].isna().any():
+        raise IngestError(f"{path}: identity rows with an empty id or creator")
+    df = df.drop_duplicates()
+    dup = df['id'].duplicated()
+    if dup.any():
+        sample = ', '.join(map(str, df.loc[dup, 'id'].head(3)))
+        raise IngestError(f"{path}: {int(dup.sum())} account(s) mapped to several creators (e.g. {sample})")
+    return df
+
+
+def _weighted_mean(values: pd.Series, weights: pd.Series, keys: np.ndarray) -> pd.Series:
+    """Per-key mean of `values` weighted by `weights`; plain mean where all weights are 0."""
+    w = weights.where(values.notna(), 0.0).astype(float)
+    num = (values.fillna(0.0) * w).groupby(keys).sum()
+    den = w.groupby(keys).sum()
+    plain = values.groupby(keys).mean()
+    return (num / den.where(den > 0)).fillna(plain)
+
+
+def merge_users(users: pd.DataFrame, identity: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """One row per creator from account rows as returned by `read_users`."""
+    if identity is not None and len(identity):
+        # Identity ids are unique (`_check_identity`), so this is a many-to-one hash join
+        users = users.merge(identity, on='id', how='left')
+        users['creator'] = users['creator'].fillna(users['id'])
+    else:
+        users = users.assign(creator=users['id'])
+    # Group by integer codes: creators in order of first appearance, then platforms
+    keys, creators = pd.factorize(users['creator'])
+    platform_codes, platforms = pd.factorize(users['platform'])
+    groups = users.drop(columns=['id', 'creator']).groupby(keys)
+
+    out = groups.first()
+    out['followers'] = groups['followers'].sum()
+    out['cost'] = groups['cost'].sum()
+    out['risk'] = groups['risk'].max()
+    out['fake'] = _weighted_mean(users['fake'], users['followers'], keys)
+    out['eng_rate'] = _weighted_mean(users['eng_rate'], users['followers'], keys)
+    largest = np.lexsort((-users['followers'].to_numpy(), keys))
+    first = np.r_[True, keys[largest][1:] != keys[largest][:-1]]
+    out['platform'] = users['platform'].to_numpy(dtype=object)[largest[first]]
+
+    pair = keys.astype(np.int64) * len(platforms) + platform_codes
+    accounts = users[list(SUB_ATTRIBUTES)].groupby(pair).agg(
+        {'id': 'first', 'followers': 'sum', 'cost': 'sum', 'risk': 'max', 'eng_rate': 'mean'})
+    rows, cols = np.divmod(accounts.index.to_numpy(), len(platforms))
+    for attr in SUB_ATTRIBUTES:
+        for p, platform in enumerate(platforms):
+            at = cols == p
+            column = pd.Series(accounts[attr].to_numpy()[at], index=rows[at]).reindex(out.index)
+            out[f"{platform}_{attr}"] = column.astype('Int64') if attr == 'followers' else column
+
+    out.insert(0, 'id', creators.to_numpy(dtype=object)[out.index.to_numpy()])
+    out = out.reset_index(drop=True)
+    out['followers'] = out['followers'].astype('int64')
+    return out
+
+
+def merge_edges(edges: pd.DataFrame, identity: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Edges between creators from edges between accounts (see the module docstring)."""
+    # The same account edge listed twice (e.g. in two exports) is one edge, not two
+    edges = edges[~edges[['source', 'target']].duplicated(keep='last')].reset_index(drop=True)
+    n = len(edges)
+    codes, endpoints = pd.factorize(np.concatenate([edges['source'].to_numpy(dtype=object),
+                                                    edges['target'].to_numpy(dtype=object)]))
+    creators = np.asarray(endpoints, dtype=object)
+    if identity is not None and len(identity) and len(creators):
+        # Only the distinct endpoints go through the identity join
+        lookup = pd.Series(identity['creator'].to_numpy(dtype=object), index=identity['id'].to_numpy(dtype=object))
+        mapped = pd.Series(creators).map(lookup).fillna(pd.Series(creators))
+        relabel, creators = pd.factorize(mapped)
+        codes = relabel[codes]
+        creators = np.asarray(creators, dtype=object)
+    a, b = codes[:n].astype(np.int64), codes[n:].astype(np.int64)
+    keep = a != b
+    a, b = a[keep], b[keep]
+    values = edges.drop(columns=['source', 'target'])[keep].reset_index(drop=True)
+
+    # Undirected key of each creator pair; groups come in order of first appearance
+    groups, pairs = pd.factorize(np.minimum(a, b) * max(len(creators), 1) + np.maximum(a, b))
+    if len(pairs) < len(groups):
+        with np.errstate(divide='ignore'):
+            miss = np.log1p(-values['prob'].to_numpy(dtype=float))
+        spec = {'a': 'first', 'b': 'first', 'weight': 'sum', 'miss': 'sum'}
+        if 'delay_hours' in values:
+            spec['delay_hours'] = 'min'
+        merged = values.assign(a=a, b=b, miss=miss).groupby(groups).agg(spec)
+        a, b = merged.pop('a').to_numpy(), merged.pop('b').to_numpy()
+        merged.insert(1, 'prob', -np.expm1(merged.pop('miss')))
+        values = merged.reset_index(drop=True)
+    out = pd.DataFrame({'source': creators[a], 'target': creators[b]})
+    return pd.concat([out, values], axis=1)
+
+
+def merge_sources(users_csvs: Sequence[str], identity: Union[str, pd.DataFrame, None] = None,
+                  edges_csvs: Sequence[str] = (), chunksize: int = CHUNK_ROWS) -> GraphSnapshot:
+    """Snapshot of the creator graph merged from several users/edges files."""
+    if isinstance(identity, str):
+        identity = read_identity(identity, chunksize)
+    elif identity is not None:
+        identity = _check_identity(identity[['id', 'creator']].astype(object), 'identity table')
+    users = pd.concat([read_users(p, chunksize) for p in users_csvs], ignore_index=True)
+    # A later vendor file overrides an earlier row of the same account
+    users = users[~users['id'].duplicated(keep='last')].reset_index(drop=True)
+    edges = None
+    if edges_csvs:
+        edges = merge_edges(pd.concat([read_edges(p, chunksize) for p in edges_csvs], ignore_index=True), identity)
+    return snapshot(merge_users(users, identity), edges)
+
+
+def load_merged_graph(users_csvs: Sequence[str], identity: Union[str, pd.DataFrame, None] = None,
+                      edges_csvs: Sequence[str] = (), chunksize: int = CHUNK_ROWS) -> nx.Graph:
+    """`merge_sources` as the `nx.Graph` used by the GUI and optimizer."""
+    return merge_sources(users_csvs, identity, edges_csvs, chunksize).to_networkx()
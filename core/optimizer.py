@@ -1,19 +1,46 @@
 """Optimizer wrapper: tries Gurobi, falls back to a simple greedy solver for tests.
 """
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
 
 import networkx as nx
+import numpy as np
+import heapq
 import random
+import time
+from itertools import combinations
 from statistics import mean
 
+from core.data_models import Campaign, InfluencerTable, get_influencer_table
+from core.reach_index import ReachIndex, get_reach_index
+
 logger = logging.getLogger(__name__)
 
 
 class Optimizer:
-    def __init__(self, graph: nx.Graph):
+    # Seconds of a portfolio race reserved for spawning workers and collecting answers
+    PORTFOLIO_STARTUP = 1.0
+    # Graphs with more nodes add the MILP reach constraints lazily (see _solve_gurobi)
+    LAZY_REACH_NODES = 50000
+
+    def __init__(self, graph: nx.Graph, candidates: Optional[Iterable[str]] = None,
+                 hops: int = 1, min_prob: float = 0.0, table: Optional[InfluencerTable] = None,
+                 reach: Optional[ReachIndex] = None):
         self.graph = graph
+        # Nodes allowed to be selected (e.g. from AttributeIndex.candidates); None means all.
+        # Non-candidates can still be reached as followers.
+        self.candidates = set(candidates) if candidates is not None else None
+        # Reach model: nodes within `hops` edges along paths of probability >= `min_prob`
+        self.hops = hops
+        self.min_prob = min_prob
         self.use_gurobi = False
+        self._model = None
+        self._cancelled = False
+        # Attribute table and reach index already resolved by the caller (e.g. on the
+        # GUI thread, so a worker thread never writes the graph's caches); when None
+        # they are looked up on the graph on first use
+        self._table = table
+        self._reach = reach
         try:
             import gurobipy as gp  # type: ignore
             self.gp = gp
@@ -22,106 +49,1356 @@ class Optimizer:
         except Exception:
             logger.info("Gurobi not available; falling back to greedy solver")
 
+    @property
+    def table(self) -> InfluencerTable:
+        """Columnar node attributes (cost, risk, platform, ...) cached on the graph."""
+        if self._table is not None:
+            return self._table
+        return get_influencer_table(self.graph)
+
     def greedy_seed(self, budget: float) -> List[str]:
         # Simple greedy: cost-effectiveness by followers/cost
         nodes = []
-        items = [(n, d.get('followers', 0)/max(1.0, d.get('cost', 1.0))) for n, d in self.graph.nodes(data=True)]
+        table = self.table
+        cost = table.values('cost').tolist()
+        score = (table.values('followers') / np.maximum(1.0, table.values('cost', default=1.0))).tolist()
+        items = [(i, score[i]) for i, n in enumerate(table.ids) if self._is_candidate(n)]
         items.sort(key=lambda x: x[1], reverse=True)
         spent = 0.0
-        for n, score in items:
-            cost = float(self.graph.nodes[n].get('cost', 0))
-            if spent + cost <= budget:
-                nodes.append(n)
-                spent += cost
+        for i, _ in items:
+            if spent + cost[i] <= budget:
+                nodes.append(table.ids[i])
+                spent += cost[i]
         return nodes
 
-    def solve(self, budget: float, risk_max: float, coverage: float, time_limit: int = 60) -> Dict:
-        # returns dict with selection and stats
+    def constrained_greedy(self, budget: float, risk_max: float, cost_share: float = 0.5,
+                           rng: Optional[random.Random] = None, noise: float = 0.0) -> List[str]:
+        """Greedy selection that respects budget, risk and platform percentage bounds.
+
+        Candidates are scored by marginal reach (newly covered nodes of their closed
+        neighborhood) per unit of a combined resource, `cost_share` of the budget
+        plus the rest of the risk limit. Each platform keeps a lazily refreshed
+        priority queue, so a pick costs O(deg log V) and the whole run O(E log V).
+        Picks that would push a platform above its max percentage are deferred while
+        another platform can take the slot; a final repair pass adds from platforms
+        below their min and drops the least useful picks of platforms above their max.
+
+        With `rng`, ties are broken in random order and each node's score is scaled
+        by a fixed factor drawn from [1 - noise, 1 + noise] (used by `multi_start`).
+        """
+        nodes = list(self.graph.nodes())
+        cost = self.table.mapping('cost', nodes)
+        risk = self.table.mapping('risk', nodes)
+        platform = self.table.mapping('platform', nodes)
+        bounds = self._platform_bounds()
+        if rng is not None:
+            scale = {n: 1.0 + noise * rng.uniform(-1.0, 1.0) for n in nodes}
+            shuffled = list(nodes)
+            rng.shuffle(shuffled)
+            order = {n: i for i, n in enumerate(shuffled)}
+        else:
+            scale = {n: 1.0 for n in nodes}
+            order = {n: i for i, n in enumerate(nodes)}
+
+        def resource(n) -> float:
+            r = 0.0
+            if cost[n] > 0:
+                r += cost_share * cost[n] / budget if budget > 0 else float('inf')
+            if risk[n] > 0:
+                r += (1.0 - cost_share) * risk[n] / risk_max if risk_max > 0 else float('inf')
+            return max(r, 1e-12) / max(scale[n], 1e-6)
+
+        covered = {n: 0 for n in nodes}
+        selected: List[str] = []
+        count = {p: 0 for p in bounds}
+        used = {'cost': 0.0, 'risk': 0.0}
+        stamp = [0]
+
+        def gain(n) -> int:
+            return sum(1 for v in self._closed_neighborhood(n) if covered[v] == 0)
+
+        def loss(n) -> int:
+            return sum(1 for v in self._closed_neighborhood(n) if covered[v] == 1)
+
+        def fits(n) -> bool:
+            return used['cost'] + cost[n] <= budget + 1e-9 and used['risk'] + risk[n] <= risk_max + 1e-9
+
+        def add(n) -> None:
+            selected.append(n)
+            count[platform[n]] += 1
+            used['cost'] += cost[n]
+            used['risk'] += risk[n]
+            for v in self._closed_neighborhood(n):
+                covered[v] += 1
+            stamp[0] += 1
+
+        def drop(n) -> None:
+            selected.remove(n)
+            count[platform[n]] -= 1
+            used['cost'] -= cost[n]
+            used['risk'] -= risk[n]
+            for v in self._closed_neighborhood(n):
+                covered[v] -= 1
+            stamp[0] += 1
+
+        heaps: Dict[Optional[str], list] = {p: [] for p in bounds}
+        for n in nodes:
+            if self._is_candidate(n) and resource(n) != float('inf'):
+                heaps[platform[n]].append((-self.reach.count(n) / resource(n), order[n], n, 0))
+        for h in heaps.values():
+            heapq.heapify(h)
+
+        def top(p):
+            """Best fitting candidate of platform `p` with an up-to-date score, or None."""
+            h = heaps[p]
+            while h:
+                score, i, n, st = h[0]
+                if not fits(n):
+                    # remaining budget/risk only shrink during construction
+                    heapq.heappop(h)
+                    continue
+                if st == stamp[0]:
+                    return h[0]
+                g = gain(n)
+                if g == 0:
+                    heapq.heappop(h)
+                    continue
+                heapq.heapreplace(h, (-g / resource(n), i, n, stamp[0]))
+            return None
+
+        while True:
+            tops = {p: e for p, e in ((p, top(p)) for p in heaps) if e is not None}
+            if not tops:
+                break
+            size = len(selected)
+            allowed = {p: e for p, e in tops.items() if 100 * (count[p] + 1) <= bounds[p][1] * (size + 1)}
+            p, e = min((allowed or tops).items(), key=lambda kv: kv[1][:2])
+            heapq.heappop(heaps[p])
+            add(e[2])
+
+        # Repair platform percentages
+        for _ in range(2 * len(nodes) + 1):
+            size = len(selected)
+            under = [p for p in bounds if 100 * count[p] < bounds[p][0] * size - 1e-9]
+            over = [p for p in bounds if 100 * count[p] > bounds[p][1] * size + 1e-9]
+            if not under and not over:
+                break
+            if under:
+                p = under[0]
+                e = top(p)
+                if e is not None:
+                    heapq.heappop(heaps[p])
+                    add(e[2])
+                    continue
+                victims = [n for n in selected if platform[n] != p]
+            else:
+                p = over[0]
+                others = [(q, top(q)) for q in heaps if q != p and q not in over]
+                others = [(q, e) for q, e in others if e is not None]
+                if others:
+                    q, e = min(others, key=lambda kv: kv[1][:2])
+                    heapq.heappop(heaps[q])
+                    add(e[2])
+                    continue
+                victims = [n for n in selected if platform[n] == p]
+            if not victims:
+                break
+            drop(min(victims, key=lambda n: (loss(n), -cost[n])))
+        return selected
+
+    def local_search(self, selected: Iterable[str], budget: float, risk_max: float,
+                     time_limit: float = 1.0, max_pairs: int = 10) -> List[str]:
+        """Improve a selection's reach with add, 1-swap and 2-for-1 swap moves.
+
+        Keeps a per-node count of how many selected influencers cover it, so the
+        gain of adding `i` (nodes of N[i] with count 0) and the loss of dropping `j`
+        (nodes of N[j] with count 1) cost O(deg). Only moves that keep budget, risk
+        and platform bounds satisfied are taken; ties in reach are broken by lower
+        cost. 2-for-1 swaps try pairs among the `max_pairs` least useful picks.
+        Stops at a local optimum or after `time_limit` seconds.
+        """
+        deadline = time.monotonic() + time_limit
+        nodes = list(self.graph.nodes())
+        cost = self.table.mapping('cost', nodes)
+        risk = self.table.mapping('risk', nodes)
+        platform = self.table.mapping('platform', nodes)
+        bounds = self._platform_bounds()
+        nbrs = {}
+
+        def N(n) -> set:
+            if n not in nbrs:
+                nbrs[n] = self._closed_neighborhood(n)
+            return nbrs[n]
+
+        covered = {n: 0 for n in nodes}
+        state = {'cost': 0.0, 'risk': 0.0, 'cov': 0}
+        count = {p: 0 for p in bounds}
+        sel = []
+        in_sel = set()
+
+        def apply(n, sign: int) -> None:
+            if sign > 0:
+                sel.append(n)
+                in_sel.add(n)
+            else:
+                sel.remove(n)
+                in_sel.discard(n)
+            state['cost'] += sign * cost[n]
+            state['risk'] += sign * risk[n]
+            count[platform[n]] += sign
+            for v in N(n):
+                if sign > 0:
+                    covered[v] += 1
+                    if covered[v] == 1:
+                        state['cov'] += 1
+                else:
+                    covered[v] -= 1
+                    if covered[v] == 0:
+                        state['cov'] -= 1
+
+        def gain(n) -> int:
+            return sum(1 for v in N(n) if covered[v] == 0)
+
+        def loss(n) -> int:
+            return sum(1 for v in N(n) if covered[v] == 1)
+
+        def can_add(n) -> bool:
+            """Whether adding `n` to the current (possibly reduced) selection stays feasible."""
+            if state['cost'] + cost[n] > budget + 1e-9 or state['risk'] + risk[n] > risk_max + 1e-9:
+                return False
+            size = len(sel) + 1
+            for p, (lo, hi) in bounds.items():
+                c = count[p] + (1 if platform[n] == p else 0)
+                if 100 * c < lo * size - 1e-9 or 100 * c > hi * size + 1e-9:
+                    return False
+            return True
+
+        for n in selected:
+            if n in covered and n not in in_sel:
+                apply(n, 1)
+        pool = sorted((n for n in nodes if self._is_candidate(n)), key=lambda n: -len(N(n)))
+
+        def best_insert(needed: int, freed_cost: float):
+            """First candidate whose gain beats `needed` (or ties it more cheaply)."""
+            for i in pool:
+                if len(N(i)) < needed:
+                    break
+                if i in in_sel or not can_add(i):
+                    continue
+                g = gain(i)
+                if g > needed or (g == needed and cost[i] < freed_cost - 1e-9):
+                    return i
+            return None
+
+        improved = True
+        while improved and time.monotonic() < deadline:
+            improved = False
+            # Plain additions while room is left
+            for i in pool:
+                if i not in in_sel and can_add(i) and gain(i) > 0:
+                    apply(i, 1)
+                    improved = True
+            # 1-swaps, least useful selected node first
+            for j in sorted(sel, key=loss):
+                if time.monotonic() >= deadline:
+                    break
+                lj = loss(j)
+                apply(j, -1)
+                i = best_insert(lj, cost[j])
+                if i is not None:
+                    apply(i, 1)
+                    improved = True
+                    break
+                apply(j, 1)
+            if improved:
+                continue
+            # 2-for-1 swaps: one influencer replacing two weak ones
+            for a, b in combinations(sorted(sel, key=loss)[:max_pairs], 2):
+                if time.monotonic() >= deadline:
+                    break
+                before = state['cov']
+                apply(a, -1)
+                apply(b, -1)
+                i = best_insert(before - state['cov'], cost[a] + cost[b])
+                if i is not None:
+                    apply(i, 1)
+                    improved = True
+                    break
+                apply(a, 1)
+                apply(b, 1)
+        return sel
+
+    def repair(self, selected: Iterable[str], budget: float, risk_max: float) -> List[str]:
+        """Make an earlier selection feasible under new constraints by dropping nodes.
+
+        Unknown nodes and filtered-out candidates are removed first. Then, while
+        budget or risk is exceeded, the node losing the fewest covered nodes per unit
+        of freed resource is dropped; platform bounds are restored by dropping the
+        least useful node of an over-represented platform (or of the other platforms
+        when one falls below its min). Follow with `local_search` to use freed room.
+        """
+        sel = [n for n in dict.fromkeys(selected) if n in self.graph and self._is_candidate(n)]
+        cost = self.table.mapping('cost', sel)
+        risk = self.table.mapping('risk', sel)
+        platform = self.table.mapping('platform', sel)
+        bounds = self._platform_bounds()
+        covered: Dict = {}
+        for n in sel:
+            for v in self._closed_neighborhood(n):
+                covered[v] = covered.get(v, 0) + 1
+
+        def loss(n) -> int:
+            return sum(1 for v in self._closed_neighborhood(n) if covered[v] == 1)
+
+        def drop(n) -> None:
+            sel.remove(n)
+            for v in self._closed_neighborhood(n):
+                covered[v] -= 1
+
+        def freed(n, over_b: bool, over_r: bool) -> float:
+            # Share of the exceeded limits that dropping `n` gives back
+            return (cost[n] / max(budget, 1e-9) if over_b else 0.0) + (risk[n] / max(risk_max, 1e-9) if over_r else 0.0)
+
+        while sel:
+            spent = sum(cost[n] for n in sel)
+            risked = sum(risk[n] for n in sel)
+            if spent <= budget + 1e-9 and risked <= risk_max + 1e-9:
+                break
+            over_b = spent > budget + 1e-9
+            over_r = risked > risk_max + 1e-9
+            drop(min(sel, key=lambda n: loss(n) / max(freed(n, over_b, over_r), 1e-12)))
+        while sel:
+            size = len(sel)
+            count = {p: 0 for p in bounds}
+            for n in sel:
+                count[platform[n]] += 1
+            over = [p for p in bounds if 100 * count[p] > bounds[p][1] * size + 1e-9]
+            under = [p for p in bounds if 100 * count[p] < bounds[p][0] * size - 1e-9]
+            if over:
+                victims = [n for n in sel if platform[n] == over[0]]
+            elif under:
+                victims = [n for n in sel if platform[n] != under[0]]
+            else:
+                break
+            drop(min(victims, key=lambda n: (loss(n), -cost[n])))
+        return sel
+
+    def multi_start(self, budget: float, risk_max: float, starts: int = 8, workers: Optional[int] = None,
+                    noise: float = 0.2, seed: int = 0, time_limit: float = 10.0,
+                    seeds: Optional[List[List[str]]] = None) -> Dict:
+        """Run randomized constraint-aware greedy constructions in a process pool.
+
+        Start 0 is the deterministic greedy, the others use their own seed for
+        random tie-breaking and score noise; every construction is polished by
+        local search. `seeds` are feasible selections (e.g. repaired warm starts)
+        polished in-process while the pool runs and compared like any other start.
+        Returns the best feasible selection (most reach, then lowest cost) and
+        diversity statistics over all starts. Falls back to running the starts
+        in-process if a pool cannot be created.
+        """
+        import concurrent.futures as cf
+        import multiprocessing
+        import os
+
+        deadline = time.monotonic() + time_limit
+        ls_time = self._local_search_time(time_limit)
+        jobs = [(budget, risk_max, seed + k if k else None, noise, ls_time) for k in range(max(1, starts))]
+        workers = workers or min(len(jobs), os.cpu_count() or 1)
+        runs: List[Tuple[List[str], Dict]] = []
+        seeded: Optional[List[Tuple[List[str], Dict]]] = None
+        pooled = False
+
+        def polish_seeds() -> List[Tuple[List[str], Dict]]:
+            polished = (self.local_search(st, budget, risk_max, time_limit=ls_time) for st in seeds or [])
+            return [(sel, self.evaluate(sel, budget, risk_max)) for sel in polished]
+
+        if workers > 1 and len(jobs) > 1:
+            try:
+                # spawn: safe to use from a GUI worker thread on every platform
+                ctx = multiprocessing.get_context('spawn')
+                pool = cf.ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_pool_worker,
+                                              initargs=(_pool_graph(self.graph), self.candidates, self.hops,
+                                                        self.min_prob))
+                try:
+                    futures = [pool.submit(_greedy_start, job) for job in jobs]
+                    seeded = polish_seeds()
+                    done, _ = cf.wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+                    runs = [f.result() for f in done if f.exception() is None]
+                finally:
+                    # Starts still running past the deadline are abandoned, not waited for
+                    pool.shutdown(wait=False, cancel_futures=True)
+                pooled = True
+            except Exception as e:
+                logger.warning("Process pool unavailable (%s); running starts sequentially", e)
+                runs = []
+        if not pooled:
+            for job in jobs:
+                runs.append(_greedy_start(job, self))
+                if time.monotonic() >= deadline:
+                    break
+        runs += seeded if seeded is not None else polish_seeds()
+        if not runs:
+            # No start finished in time: fall back to the plain greedy, unpolished
+            sel = self.constrained_greedy(budget, risk_max)
+            runs.append((sel, self.evaluate(sel, budget, risk_max)))
+
+        feasible = [r for r in runs if r[1]['feasible']] or runs
+        best_sel, best_ev = max(feasible, key=lambda r: (r[1]['covered'], -r[1]['cost']))
+        sets = [frozenset(sel) for sel, _ in runs]
+        dists = [1.0 - len(a & b) / len(a | b) if (a | b) else 0.0 for a, b in combinations(sets, 2)]
+        covs = [ev['covered'] for _, ev in runs]
+        return {
+            'selected': best_sel,
+            'covered': best_ev['covered'],
+            'cost': best_ev['cost'],
+            'feasible': best_ev['feasible'],
+            'diversity': {
+                'starts': len(runs),
+                'distinct': len(set(sets)),
+                'mean_jaccard_distance': sum(dists) / len(dists) if dists else 0.0,
+                'coverage_min': min(covs),
+                'coverage_mean': mean(covs),
+                'coverage_max': max(covs),
+            },
+        }
+
+    def solve_portfolio(self, budget: float, risk_max: float, coverage: float, time_limit: float = 60,
+                        engines: Optional[List[str]] = None, workers: Optional[int] = None,
+                        starts: Optional[List[List[str]]] = None) -> Dict:
+        """Race several backends under one wall-clock limit and return the best answer.
+
+        The lazy (CELF-style) constraint-aware greedy polished by local search runs
+        first, in-process, and becomes the incumbent (a repaired entry of `starts`
+        takes its place when it reaches more nodes). 'multistart', 'evolve' and,
+        when Gurobi is available, 'milp' then run in parallel processes; the MILP is
+        warm-started from the incumbent. Answers are ranked by feasibility, then by
+        meeting the coverage target, then by the MILP objective (cost - coverage x
+        reach) for those meeting it or by reach for those that do not.
+
+        Returns the winner's selection plus `engine` (which backend produced it) and
+        `engines` (per-backend cost/reach/feasibility).
+        """
+        import concurrent.futures as cf
+        import multiprocessing
+        import os
+
+        deadline = time.monotonic() + time_limit
+        if engines is None:
+            engines = ['greedy', 'multistart', 'evolve'] + (['milp'] if self.use_gurobi else [])
+        total = self.graph.number_of_nodes()
+        incumbent = self.local_search(self.constrained_greedy(budget, risk_max), budget, risk_max,
+                                      time_limit=self._local_search_time(time_limit))
+        for st in starts or []:
+            st = self.local_search(self.repair(st, budget, risk_max), budget, risk_max,
+                                   time_limit=self._local_search_time(time_limit))
+            if self.evaluate(st, budget, risk_max)['covered'] > self.evaluate(incumbent, budget, risk_max)['covered']:
+                incumbent = st
+        answers = {'greedy': incumbent} if 'greedy' in engines else {}
+        remote = [e for e in engines if e != 'greedy']
+        if remote:
+            # Leave engines a margin for process start-up and returning their answer
+            engine_time = max(0.1, deadline - time.monotonic() - self.PORTFOLIO_STARTUP)
+            jobs = {e: (e, budget, risk_max, coverage, engine_time, incumbent) for e in remote}
+            workers = workers or min(len(jobs), os.cpu_count() or 1)
+            pooled = False
+            if workers > 1:
+                try:
+                    ctx = multiprocessing.get_context('spawn')
+                    pool = cf.ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_pool_worker,
+                                                  initargs=(_pool_graph(self.graph), self.candidates, self.hops,
+                                                            self.min_prob))
+                    try:
+                        futures = {pool.submit(_run_engine, job): e for e, job in jobs.items()}
+                        done, _ = cf.wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+                        for f in done:
+                            if f.exception() is None:
+                                answers[futures[f]] = f.result()
+                            else:
+                                logger.warning("Portfolio engine %s failed: %s", futures[f], f.exception())
+                    finally:
+                        # Late engines stop on their own time limit; don't wait for them
+                        pool.shutdown(wait=False, cancel_futures=True)
+                    pooled = True
+                except Exception as e:
+                    logger.info("Running portfolio engines in-process (%s)", e)
+            if not pooled:
+                for e_name, job in jobs.items():
+                    if time.monotonic() >= deadline:
+                        break
+                    job = job[:4] + (max(0.1, deadline - time.monotonic()),) + job[5:]
+                    answers[e_name] = _run_engine(job, self)
+        if not answers:
+            answers['greedy'] = incumbent
+
+        def rank(ev: Dict) -> Tuple:
+            meets = ev['covered'] >= float(coverage) * total - 1e-9
+            score = -self._objective(ev, coverage) if meets else ev['covered']
+            return (ev['feasible'], meets, score)
+
+        report = {e: self.evaluate(sel, budget, risk_max) for e, sel in answers.items()}
+        engine = max(report, key=lambda e: rank(report[e]))
+        return {
+            'selected': answers[engine],
+            'objective': self._objective(report[engine], coverage),
+            'engine': engine,
+            'engines': report,
+        }
+
+    def _closed_csr(self) -> Tuple[List, np.ndarray, np.ndarray, np.ndarray]:
+        """Reach sets as CSR arrays: (nodes, indptr, indices, prob).
+
+        Row `v` lists the sorted positions reached from `v` (itself with prob 1)
+        with the best path probability to each; see `ReachIndex`.
+        """
+        index = self.reach
+        return index.nodes, index.indptr, index.indices, index.prob
+
+    def evolve(self, budget: float, risk_max: float, objective: str = 'coverage', population: int = 64,
+               time_limit: float = 5.0, generations: Optional[int] = None, conv_value: float = 0.0,
+               mutation: Optional[float] = None, seed: int = 0, patience: Optional[int] = 50) -> Dict:
+        """Genetic search for objectives the MILP cannot express.
+
+        The population is a boolean matrix (individuals x nodes). Fitness for the
+        whole population comes from one sparse product with the closed-neighborhood
+        adjacency (scipy.sparse when installed, else a numpy gather + reduceat):
+
+        - 'coverage': number of nodes reached (the MILP objective)
+        - 'expected_reach': expected followers reached when each edge fires with its `prob`
+        - 'roi': `conv_value` x expected conversions (followers x eng_rate) minus cost
+        - 'fake_adjusted': followers reached weighted by (1 - fake)
+
+        Budget and risk are repaired in a vectorized way by keeping, per individual,
+        the prefix of its genes (in greedy efficiency order) that fits both limits.
+        Platform bounds are enforced through a fitness penalty. The constraint-aware
+        greedy seeds the population, so the result is never worse than it. The run
+        stops at `time_limit`, after `generations`, or once the best fitness has not
+        improved for `patience` generations.
+        """
+        if objective not in ('coverage', 'expected_reach', 'roi', 'fake_adjusted'):
+            raise ValueError(f"Unknown objective: {objective}")
+        deadline = time.monotonic() + time_limit
+        rs = np.random.default_rng(seed)
+        nodes, indptr, indices, prob = self._closed_csr()
+        n = len(nodes)
+        if n == 0:
+            return {'selected': [], 'fitness': 0.0, 'objective': objective, 'generations': 0, 'feasible': True}
+        def attr(key: str) -> np.ndarray:
+            return self.table.values(key, nodes)
+
+        cost, risk, followers = attr('cost'), attr('risk'), attr('followers')
+        cand = np.array([self._is_candidate(v) for v in nodes])
+        if objective == 'coverage':
+            value = np.ones(n)
+        elif objective == 'expected_reach':
+            value = followers
+        elif objective == 'roi':
+            value = conv_value * followers * attr('eng_rate')
+        else:
+            value = followers * (1.0 - attr('fake'))
+
+        # Row v of the adjacency holds N[v]; it is symmetric for undirected graphs
+        rows = np.repeat(np.arange(n), np.diff(indptr))
+        logq = np.log(np.clip(1.0 - prob, 1e-12, 1.0))
+        try:
+            import scipy.sparse as sp  # optional
+            hit = sp.csr_matrix((np.ones(len(indices)), (indices, rows)), shape=(n, n))
+            logm = sp.csr_matrix((logq, (indices, rows)), shape=(n, n))
+        except ImportError:
+            hit = logm = None
+        starts = indptr[:-1]
+
+        def spread(P: np.ndarray, M, w) -> np.ndarray:
+            # Per individual, the sum of `w` over the selected members of each N[v]: a
+            # sparse product when scipy is available, else a reduceat over the CSR rows
+            if M is not None:
+                return np.asarray((M.T @ P.T.astype(float)).T)
+            return np.add.reduceat(P[:, indices] * w, starts, axis=1)
+
+        bounds = self._platform_bounds()
+        plat = self.table.labels('platform', nodes)
+        plat_masks = {p: plat == p for p in bounds}
+
+        def fitness(P: np.ndarray) -> np.ndarray:
+            if objective == 'expected_reach':
+                logs = spread(P, logm, logq)
+                reached = 1.0 - np.exp(logs)
+            else:
+                counts = spread(P, hit, 1.0)
+                reached = (counts > 0).astype(float)
+            f = reached @ value
+            if objective == 'roi':
+                f = f - P @ cost
+            size = P.sum(axis=1)
+            viol = np.zeros(len(P))
+            for p, (lo, hi) in bounds.items():
+                c = 100.0 * P[:, plat_masks[p]].sum(axis=1)
+                viol += np.maximum(0.0, lo * size - c) + np.maximum(0.0, c - hi * size)
+            return f - viol * (abs(value).sum() + cost.sum() + 1.0)
+
+        deg = np.diff(indptr).astype(float)
+        res_w = 0.5 * cost / max(budget, 1e-9) + 0.5 * risk / max(risk_max, 1e-9)
+        order = np.argsort(-(deg * np.maximum(value, 1e-9)) / np.maximum(res_w, 1e-12), kind='stable')
+
+        def repair(P: np.ndarray) -> np.ndarray:
+            P = P & cand
+            Po = P[:, order]
+            keep = Po & (np.cumsum(Po * cost[order], axis=1) <= budget + 1e-9) \
+                & (np.cumsum(Po * risk[order], axis=1) <= risk_max + 1e-9)
+            out = np.zeros_like(P)
+            out[:, order] = keep
+            return out
+
+        idx = {v: i for i, v in enumerate(nodes)}
+        seed_row = np.zeros(n, dtype=bool)
+        seed_row[[idx[v] for v in self.constrained_greedy(budget, risk_max)]] = True
+        density = min(0.5, budget / max(cost[cand].sum(), 1e-9)) if cand.any() else 0.0
+        P = rs.random((population, n)) < density
+        P[0] = seed_row
+        P = repair(P)
+        F = fitness(P)
+        rate = mutation if mutation is not None else 2.0 / n
+        elite = max(1, population // 10)
+        gen = 0
+        best_fit, stall = F.max(), 0
+        while time.monotonic() < deadline and (generations is None or gen < generations):
+            if patience is not None and stall >= patience:
+                break
+            gen += 1
+            # Binary tournaments, uniform crossover, bit-flip mutation
+            a = rs.integers(0, population, (2, population))
+            b = rs.integers(0, population, (2, population))
+            pa = np.where(F[a[0]] >= F[a[1]], a[0], a[1])
+            pb = np.where(F[b[0]] >= F[b[1]], b[0], b[1])
+            mix = rs.random((population, n)) < 0.5
+            C = np.where(mix, P[pa], P[pb]) ^ (rs.random((population, n)) < rate)
+            C = repair(C)
+            FC = fitness(C)
+            # Elitism: the best individuals of the previous generation survive
+            keep = np.argsort(-F)[:elite]
+            worst = np.argsort(FC)[:elite]
+            C[worst] = P[keep]
+            FC[worst] = F[keep]
+            P, F = C, FC
+            if F.max() > best_fit + 1e-9:
+                best_fit, stall = F.max(), 0
+            else:
+                stall += 1
+        best = int(np.argmax(F))
+        selected = [nodes[i] for i in np.flatnonzero(P[best])]
+        return {
+            'selected': selected,
+            'fitness': float(F[best]),
+            'objective': objective,
+            'generations': gen,
+            'feasible': self.evaluate(selected, budget, risk_max)['feasible'],
+        }
+
+    def _platform_bounds(self) -> Dict[Optional[str], Tuple[float, float]]:
+        """(min_pct, max_pct) per platform present in the graph, from graph.graph['platform_bounds']."""
+        conf = self.graph.graph.get('platform_bounds') or {}
+        out = {}
+        table = self.table
+        # Platforms in order of first appearance, as iterating the nodes would give
+        codes, first = np.unique(table.codes['platform'], return_index=True)
+        for code in codes[np.argsort(first)]:
+            p = table.categories['platform'][code] if code >= 0 else None
+            b = conf.get(p) or {}
+            out[p] = (float(b.get('min_pct', 0)), float(b.get('max_pct', 100)))
+        return out
+
+    def evaluate(self, selected: Iterable[str], budget: float, risk_max: float) -> Dict:
+        """Cost, risk, covered node count and feasibility of a selection under the constraints."""
+        selected = list(selected)
+        table = self.table
+        cost = float(table.values('cost', selected).sum())
+        risk = float(table.values('risk', selected).sum())
+        covered = set()
+        for n in selected:
+            covered |= self._closed_neighborhood(n)
+        bounds = self._platform_bounds()
+        count = {p: 0 for p in bounds}
+        for p in table.labels('platform', selected):
+            count[p] += 1
+        platforms_ok = all(bounds[p][0] * len(selected) <= 100 * c + 1e-9 and 100 * c <= bounds[p][1] * len(selected) + 1e-9
+                           for p, c in count.items())
+        feasible = (cost <= budget + 1e-9 and risk <= risk_max + 1e-9 and platforms_ok
+                    and all(self._is_candidate(n) for n in selected))
+        return {'cost': cost, 'risk': risk, 'covered': len(covered), 'feasible': feasible}
+
+    def _is_candidate(self, n) -> bool:
+        return self.candidates is None or n in self.candidates
+
+    def cancel(self) -> None:
+        """Request an in-flight solve to stop as soon as possible.
+
+        Gurobi is interrupted through `Model.terminate()` and returns its current
+        incumbent; the greedy path is fast enough to simply run to completion.
+        """
+        self._cancelled = True
+        if self._model is not None:
+            try:
+                self._model.terminate()
+            except Exception:
+                pass
+
+    def solve(self, budget: float, risk_max: float, coverage: float, time_limit: int = 60,
+              starts: Optional[List[List[str]]] = None, restarts: int = 1, portfolio: bool = False,
+              lazy_reach: Optional[bool] = None) -> Dict:
+        # returns dict with selection and stats; `starts` are earlier selections
+        # (e.g. the previous result or similar scenarios) used as warm starts.
+        # A cancel only applies to the solve it interrupts
+        self._cancelled = False
+        if portfolio:
+            return self.solve_portfolio(budget, risk_max, coverage, time_limit=time_limit, starts=starts)
+        ls_time = self._local_search_time(time_limit)
         if self.use_gurobi:
             try:
-                return self._solve_gurobi(budget, risk_max, coverage, time_limit)
+                res = self._solve_gurobi(budget, risk_max, coverage, time_limit, starts=starts, lazy_reach=lazy_reach)
+                # A proven-optimal MILP answer is kept as is. Otherwise local search may
+                # polish the incumbent; it maximizes reach, so the polished set is only
+                # kept when it also lowers the MILP objective
+                if res.get('selected') and res.get('status') not in (self.gp.GRB.OPTIMAL, 'cancelled'):
+                    self._polish_incumbent(res, budget, risk_max, coverage, ls_time)
+                return res
             except NotImplementedError:
                 logger.warning("Gurobi solver interface not implemented; falling back to greedy")
-        # Fallback
-        selection = self.greedy_seed(budget)
+        # Fallback: several randomized greedy starts on idle cores, racing the repaired
+        # warm starts; with a single start, polish the best repaired start when given
+        # (re-solves after small edits then only need a few local moves), else the greedy
+        repaired = [r for r in (self.repair(st, budget, risk_max) for st in starts or []) if r]
+        if restarts > 1:
+            res = self.multi_start(budget, risk_max, starts=restarts, time_limit=time_limit, seeds=repaired)
+            return {'selected': res['selected'], 'objective': 0.0, 'diversity': res['diversity']}
+        if repaired:
+            best = max(repaired, key=lambda sel: self.evaluate(sel, budget, risk_max)['covered'])
+            return {'selected': self.local_search(best, budget, risk_max, time_limit=ls_time), 'objective': 0.0}
+        selection = self.local_search(self.constrained_greedy(budget, risk_max), budget, risk_max, time_limit=ls_time)
         return {'selected': selection, 'objective': 0.0}
 
-    def _solve_gurobi(self, budget: float, risk_max: float, coverage: float, time_limit: int = 60) -> Dict:
+    def _objective(self, stats: Dict, coverage: float) -> float:
+        """MILP objective of `evaluate` stats: cost minus coverage (the reach weight) times covered."""
+        return stats['cost'] - float(coverage) * stats['covered']
+
+    def _polish_incumbent(self, res: Dict, budget: float, risk_max: float, coverage: float, ls_time: float) -> None:
+        """Replace a non-optimal MILP incumbent in `res` by its local search when that scores better."""
+        before = self._objective(self.evaluate(res['selected'], budget, risk_max), coverage)
+        polished = self.local_search(res['selected'], budget, risk_max, time_limit=ls_time)
+        stats = self.evaluate(polished, budget, risk_max)
+        meets = stats['covered'] >= float(coverage) * len(self.graph) - 1e-9
+        objective = self._objective(stats, coverage)
+        if stats['feasible'] and meets and objective < before - 1e-9:
+            reached = set()
+            for n in polished:
+                reached |= self._closed_neighborhood(n)
+            res.update(selected=polished, reached=[n for n in self.graph.nodes() if n in reached], objective=objective)
+        else:
+            res['objective'] = before
+
+    def solve_campaigns(self, campaigns: List[Campaign], capacity: int = 1, time_limit: int = 60) -> Dict:
+        """Jointly select influencers for several concurrent campaigns on this graph.
+
+        Each campaign keeps its own budget, risk_max, coverage target, reach_weight
+        (the reach multiplier of its objective, like `coverage` in `solve`) and
+        platform list; an influencer takes part in at most `capacity` campaigns
+        (overridable per node with a `capacity` attribute). The reach index and twin
+        groups are built once and shared. With Gurobi one MILP with x[n, c]
+        variables is solved, warm-started from a round-robin greedy; without it (or
+        when the MILP finds nothing) the round-robin greedy answer is returned.
+
+        Returns {'assignments': {name: selection}, 'campaigns': {name: evaluate()
+        stats}, 'engine': 'milp' | 'greedy', 'status', 'objective'}.
+        """
+        cap = {n: int(self.graph.nodes[n].get('capacity', capacity)) for n in self.graph.nodes()}
+        greedy = self._campaigns_greedy(campaigns, cap, time_limit=self._local_search_time(time_limit))
+        res = {'assignments': greedy, 'engine': 'greedy', 'status': 'greedy', 'objective': None}
+        if self.use_gurobi and campaigns:
+            milp = self._solve_campaigns_gurobi(campaigns, cap, time_limit, starts=greedy)
+            if milp.get('assignments') is not None:
+                res = milp
+        res['campaigns'] = {}
+        for c in campaigns:
+            sel = res['assignments'][c.name]
+            stats = self._campaign_optimizer(c).evaluate(sel, c.budget, c.risk_max)
+            stats['meets_coverage'] = stats['covered'] >= float(c.coverage) * len(self.graph) - 1e-9
+            res['campaigns'][c.name] = stats
+        return res
+
+    def _campaign_optimizer(self, campaign: Campaign, exclude: Iterable[str] = ()) -> 'Optimizer':
+        """Optimizer restricted to a campaign's platforms, sharing this graph's reach index."""
+        allowed = set(campaign.platforms) if campaign.platforms else None
+        excluded = set(exclude)
+        plat = self.table.labels('platform')
+        cands = [n for n, p in zip(self.table.ids, plat) if self._is_candidate(n) and n not in excluded
+                 and (allowed is None or p in allowed)]
+        opt = Optimizer(self.graph, candidates=cands, hops=self.hops, min_prob=self.min_prob)
+        opt.use_gurobi = False
+        return opt
+
+    def _campaigns_greedy(self, campaigns: List[Campaign], cap: Dict, time_limit: float = 1.0) -> Dict[str, List[str]]:
+        """Round-robin lazy greedy: campaigns take turns picking their best remaining influencer.
+
+        Each campaign keeps its own cover counts and lazy heap of reach gain per unit
+        of its budget/risk share; an influencer leaves every heap once it reaches its
+        capacity. Each selection is then repaired for platform bounds and polished by
+        local search over the influencers still free.
+        """
+        index = self.reach
+        nodes = index.nodes
+        cost = self.table.values('cost', nodes)
+        risk = self.table.values('risk', nodes)
+        plat = self.table.labels('platform', nodes)
+        usage = {n: 0 for n in nodes}
+        state = []
+        for c in campaigns:
+            allowed = set(c.platforms) if c.platforms else None
+            res_w = 0.5 * cost / max(float(c.budget), 1e-9) + 0.5 * risk / max(float(c.risk_max), 1e-9)
+            res_w = np.maximum(res_w, 1e-12)
+            heap = [(-index.count(n) / res_w[i], i) for i, n in enumerate(nodes)
+                    if self._is_candidate(n) and (allowed is None or plat[i] in allowed)]
+            heapq.heapify(heap)
+            state.append({'heap': heap, 'res': res_w, 'covered': np.zeros(len(nodes), dtype=np.int32),
+                          'selected': [], 'cost': 0.0, 'risk': 0.0})
+
+        def pick(c: Campaign, st: Dict) -> Optional[int]:
+            heap = st['heap']
+            while heap:
+                neg, i = heapq.heappop(heap)
+                n = nodes[i]
+                if usage[n] >= cap[n] or st['cost'] + cost[i] > c.budget + 1e-9 \
+                        or st['risk'] + risk[i] > c.risk_max + 1e-9:
+                    continue  # never fits again: budgets only shrink and capacity only fills
+                row = index.row(n)
+                score = np.count_nonzero(st['covered'][row] == 0) / st['res'][i]
+                if score <= 0:
+                    continue
+                if heap and -heap[0][0] > score + 1e-12:
+                    heapq.heappush(heap, (-score, i))
+                    continue
+                return i
+            return None
+
+        active = list(range(len(campaigns)))
+        while active:
+            still = []
+            for k in active:
+                c, st = campaigns[k], state[k]
+                i = pick(c, st)
+                if i is None:
+                    continue
+                n = nodes[i]
+                usage[n] += 1
+                st['selected'].append(n)
+                st['cost'] += cost[i]
+                st['risk'] += risk[i]
+                st['covered'][index.row(n)] += 1
+                still.append(k)
+            active = still
+
+        out: Dict[str, List[str]] = {}
+        for c, st in zip(campaigns, state):
+            for n in st['selected']:
+                usage[n] -= 1
+            full = [n for n in nodes if usage[n] >= cap[n]]
+            opt = self._campaign_optimizer(c, exclude=full)
+            sel = opt.repair(st['selected'], c.budget, c.risk_max)
+            sel = opt.local_search(sel, c.budget, c.risk_max, time_limit=time_limit / max(len(campaigns), 1))
+            for n in sel:
+                usage[n] += 1
+            out[c.name] = sel
+        return out
+
+    def _solve_campaigns_gurobi(self, campaigns: List[Campaign], cap: Dict, time_limit: int = 60,
+                                starts: Optional[Dict[str, List[str]]] = None) -> Dict:
+        """One MILP over all campaigns: x[n, c], per-campaign rows and shared capacity rows."""
+        gp = self.gp
+        try:
+            model = gp.Model("influence_campaigns")
+            model.setParam('OutputFlag', 0)
+        except Exception as e:
+            logger.warning("Gurobi environment error (%s); keeping the greedy assignment", e)
+            return {'assignments': None, 'status': 'gurobi_unavailable'}
+        model.setParam('TimeLimit', time_limit)
+        model.setParam('MIPGap', 0.02)
+
+        nodes = list(self.graph.nodes())
+        groups = self._twin_groups()
+        weight = [len(members) if closed else 1 for members, _, closed in groups]
+        cost = self.table.mapping('cost', nodes)
+        risk = self.table.mapping('risk', nodes)
+        platform = self.table.mapping('platform', nodes)
+        bounds = self._platform_bounds()
+        xs, obj = [], 0
+        for k, c in enumerate(campaigns):
+            allowed = set(c.platforms) if c.platforms else None
+            x = {n: model.addVar(vtype=gp.GRB.BINARY, name=f"x_{n}_{k}",
+                                 ub=1.0 if self._is_candidate(n) and (allowed is None or platform[n] in allowed) else 0.0)
+                 for n in nodes}
+            z = [model.addVar(vtype=gp.GRB.BINARY if closed else gp.GRB.INTEGER, ub=1.0 if closed else len(members),
+                              name=f"z_{members[0]}_{k}") for members, _, closed in groups]
+            model.update()
+            reached = gp.quicksum(weight[g] * z[g] for g in range(len(groups)))
+            spend = gp.quicksum(cost[n] * x[n] for n in nodes)
+            obj += spend - float(c.reach_weight) * reached
+            model.addConstr(spend <= c.budget, name=f"budget_{k}")
+            model.addConstr(gp.quicksum(risk[n] * x[n] for n in nodes) <= c.risk_max, name=f"risk_{k}")
+            for g, group in enumerate(groups):
+                model.addConstr(z[g] <= self._reach_row(x, group), name=f"reach_{group[0][0]}_{k}")
+            model.addConstr(reached >= float(c.coverage) * len(nodes), name=f"coverage_{k}")
+            S = gp.quicksum(x[n] for n in nodes)
+            for p, (min_pct, max_pct) in bounds.items():
+                lhs = gp.quicksum(x[n] for n in nodes if platform[n] == p) * 100
+                model.addConstr(lhs >= min_pct * S, name=f"plat_min_{p}_{k}")
+                model.addConstr(lhs <= max_pct * S, name=f"plat_max_{p}_{k}")
+            xs.append(x)
+        # Shared capacity: an influencer serves at most cap[n] campaigns
+        if len(campaigns) > 1:
+            for n in nodes:
+                if cap[n] < len(campaigns):
+                    model.addConstr(gp.quicksum(x[n] for x in xs) <= cap[n], name=f"cap_{n}")
+        model.setObjective(obj, gp.GRB.MINIMIZE)
+        if starts:
+            for c, x in zip(campaigns, xs):
+                chosen = set(starts.get(c.name, []))
+                for n in nodes:
+                    x[n].Start = 1.0 if n in chosen else 0.0
+
+        model.update()
+        if self._cancelled:
+            return {'assignments': None, 'status': 'cancelled'}
+        self._model = model
+        model.optimize()
+        self._model = None
+        if model.SolCount == 0:
+            return {'assignments': None, 'status': model.Status}
+        assignments = {c.name: [n for n in nodes if x[n].X > 0.5] for c, x in zip(campaigns, xs)}
+        return {'assignments': assignments, 'engine': 'milp', 'status': model.Status, 'objective': model.ObjVal}
+
+    @staticmethod
+    def _local_search_time(time_limit: float) -> float:
+        """Share of a solve's time limit given to the local-search phase."""
+        return min(2.0, 0.1 * float(time_limit))
+
+    def _solve_gurobi(self, budget: float, risk_max: float, coverage: float, time_limit: int = 60,
+                      starts: Optional[List[List[str]]] = None, lazy_reach: Optional[bool] = None,
+                      twins: bool = True) -> Dict:
+        """Solve the coverage MILP with Gurobi.
+
+        With `lazy_reach` (default: graphs above LAZY_REACH_NODES nodes) the per-node
+        `reach_{f}` rows are not built up front. The model starts from their sum,
+        `sum z <= sum_i |N[i]| x_i`, and a MIPSOL callback adds `z_f <= sum x_i` as a
+        lazy constraint only for nodes an incumbent claims without selecting any of
+        their closed neighborhood. Most rows never bind, so the LP stays small.
+
+        With `twins` nodes sharing a neighborhood are merged into one weighted reach
+        variable (see `_twin_groups`), shrinking star-heavy graphs several-fold.
+        The result lists the per-node `reached` set and the number of `groups`.
+        """
         gp = self.gp
         try:
             model = gp.Model("influence_opt")
             model.setParam('OutputFlag', 0)
         except Exception as e:
             logger.warning("Gurobi environment error (%s); falling back to greedy", e)
-            return {'selected': self.greedy_seed(budget), 'objective': None, 'status': 'gurobi_unavailable'}
+            return {'selected': self.constrained_greedy(budget, risk_max), 'objective': None, 'status': 'gurobi_unavailable'}
         model.setParam('TimeLimit', time_limit)
         model.setParam('MIPGap', 0.02)
 
+        if lazy_reach is None:
+            lazy_reach = len(self.graph) > self.LAZY_REACH_NODES
+        nodes, x, z, groups = self._build_gurobi_model(model, budget, risk_max, coverage, lazy_reach, twins)
+        callback = self._lazy_reach_callback(nodes, x, z, groups) if lazy_reach else None
+
+        # MIP starts: the caller's earlier selections repaired for the new constraints,
+        # else the constraint-aware greedy improved by local search
+        seeds = [r for r in (self.repair(st, budget, risk_max) for st in starts or []) if r]
+        if not seeds:
+            seeds = [self.local_search(self.constrained_greedy(budget, risk_max), budget, risk_max,
+                                       time_limit=self._local_search_time(time_limit))]
+        model.NumStart = len(seeds)
+        model.update()
+        for k, seed in enumerate(seeds):
+            model.setParam('StartNumber', k)
+            chosen = set(seed)
+            for n in nodes:
+                x[n].Start = 1.0 if n in chosen else 0.0
+
+        model.update()
+        if self._cancelled:
+            return {'selected': [], 'objective': None, 'status': 'cancelled'}
+        self._model = model
+        if callback is not None:
+            model.optimize(callback)
+        else:
+            model.optimize()
+        self._model = None
+
+        status = model.Status
+        selected = []
+        if status in (gp.GRB.OPTIMAL, gp.GRB.TIME_LIMIT, gp.GRB.SUBOPTIMAL):
+            for n in nodes:
+                try:
+                    if x[n].X > 0.5:
+                        selected.append(n)
+                except Exception:
+                    pass
+        # Selection variables are per node, so only reach needs mapping back to nodes
+        reached_nodes = set()
+        for n in selected:
+            reached_nodes |= self._closed_neighborhood(n)
+        return {
+            'selected': selected,
+            'reached': [n for n in nodes if n in reached_nodes],
+            'groups': len(groups),
+            'objective': model.ObjVal if model.SolCount > 0 else None,
+            'status': status,
+            'runtime': model.Runtime,
+        }
+
+    def sensitivity(self, budget: float, risk_max: float, coverage: float, twins: bool = False) -> Dict:
+        """Shadow prices from the LP relaxation of the `_solve_gurobi` model.
+
+        `duals[name]` is the change of the relaxed objective (cost - coverage x reach)
+        per unit increase of the right-hand side of row `name`: 'budget', 'risk',
+        'coverage' (in reached nodes) and 'plat_min_<p>' / 'plat_max_<p>'.
+        `ranges[name]` is the (low, high) right-hand side interval over which that
+        price holds. Uses Gurobi when available, else scipy's HiGHS `linprog`
+        (duals only, `ranges` None); `status` is 'unavailable' without either.
+
+        The platform rows read `100 x selected on p - pct x selected >= 0` (or
+        `<=`), so their prices are per unit of that left side. `selection_size` is
+        the number selected in the relaxed solution: raising a platform bound by
+        one percentage point moves its row by that many units.
+
+        The relaxation keeps one reach row per node by default. With `twins` the
+        rows of twin groups are aggregated as in the MILP; that relaxation is
+        weaker, so its prices can differ from those of the per-node model. The
+        report's `relaxation` is 'per_node' or 'aggregated' accordingly.
+        """
+        if self.use_gurobi:
+            gp = self.gp
+            try:
+                model = gp.Model("influence_opt_lp")
+                model.setParam('OutputFlag', 0)
+            except Exception as e:
+                logger.warning("Gurobi environment error (%s); trying scipy for sensitivity", e)
+            else:
+                self._build_gurobi_model(model, budget, risk_max, coverage, lazy_reach=False, twins=twins)
+                model.update()
+                relaxed = model.relax()
+                relaxed.optimize()
+                if relaxed.Status != gp.GRB.OPTIMAL:
+                    return {'backend': 'gurobi', 'status': relaxed.Status, 'objective': None, 'duals': {}, 'ranges': {}}
+
+                def finite(v: float) -> float:
+                    return float(v) if abs(v) < gp.GRB.INFINITY else (float('inf') if v > 0 else float('-inf'))
+
+                rows = [c for c in relaxed.getConstrs() if c.ConstrName in ('budget', 'risk', 'coverage')
+                        or c.ConstrName.startswith('plat_')]
+                return {
+                    'backend': 'gurobi',
+                    'status': 'optimal',
+                    'relaxation': 'aggregated' if twins else 'per_node',
+                    'objective': relaxed.ObjVal,
+                    'selection_size': sum(v.X for v in relaxed.getVars() if v.VarName.startswith('x_')),
+                    'duals': {c.ConstrName: float(c.Pi) + 0.0 for c in rows},
+                    'ranges': {c.ConstrName: (finite(c.SARHSLow), finite(c.SARHSUp)) for c in rows},
+                }
+        try:
+            from scipy.optimize import linprog  # optional
+            import scipy.sparse as sp
+        except ImportError:
+            return {'backend': None, 'status': 'unavailable', 'objective': None, 'duals': {}, 'ranges': {}}
+        return self._sensitivity_highs(budget, risk_max, coverage, twins, linprog, sp)
+
+    def _sensitivity_highs(self, budget: float, risk_max: float, coverage: float, twins: bool, linprog, sp) -> Dict:
+        """LP relaxation in `A_ub x <= b_ub` form for scipy's HiGHS; `>=` rows are negated.
+
+        Columns are the nodes, the reach groups and `S`, the selection size, so a
+        platform row only holds that platform's nodes and `S`.
+        """
         nodes = list(self.graph.nodes())
-        # binary selection variables
-        x = {n: model.addVar(vtype=gp.GRB.BINARY, name=f"x_{n}") for n in nodes}
-        # reached follower vars (binary)
-        z = {n: model.addVar(vtype=gp.GRB.BINARY, name=f"z_{n}") for n in nodes}
+        n = len(nodes)
+        idx = {v: i for i, v in enumerate(nodes)}
+        groups = self._twin_groups() if twins else [([v], list(self._closed_neighborhood(v) - {v}), True) for v in nodes]
+        m = len(groups)
+        cost = self.table.values('cost', nodes)
+        risk = self.table.values('risk', nodes)
+        weight = np.array([len(members) if closed else 1 for members, _, closed in groups], dtype=float)
+        lam = float(coverage)
+        size = n + m  # column of S
+        c = np.concatenate([cost, -lam * weight, [0.0]])
+
+        rows, cols, vals, b_ub, names, sign = [], [], [], [], [], []
+
+        def add_row(entries, rhs, name=None, flip=1.0):
+            r = len(b_ub)
+            for col, val in entries:
+                rows.append(r)
+                cols.append(col)
+                vals.append(val)
+            b_ub.append(rhs)
+            names.append(name)
+            sign.append(flip)
+
+        add_row(((i, cost[i]) for i in range(n)), budget, 'budget')
+        add_row(((i, risk[i]) for i in range(n)), risk_max, 'risk')
+        for g, (members, outer, closed) in enumerate(groups):
+            w = 1.0 if closed else float(len(members))
+            entries = [(n + g, 1.0)] + [(idx[v], -w) for v in outer] + [(idx[v], -1.0) for v in members]
+            add_row(entries, 0.0)
+        add_row(((n + g, -weight[g]) for g in range(m)), -float(coverage) * n, 'coverage', -1.0)
+        platforms: Dict = {}
+        for v, p in zip(nodes, self.table.labels('platform', nodes)):
+            platforms.setdefault(p, []).append(idx[v])
+        bounds = self._platform_bounds()
+        for p, members in platforms.items():
+            min_pct, max_pct = bounds[p]
+            add_row([(i, -100.0) for i in members] + [(size, min_pct)], 0.0, f"plat_min_{p}", -1.0)
+            add_row([(i, 100.0) for i in members] + [(size, -max_pct)], 0.0, f"plat_max_{p}")
+
+        A = sp.csr_matrix((vals, (rows, cols)), shape=(len(b_ub), n + m + 1))
+        # S = sum of x
+        A_eq = sp.csr_matrix((np.r_[np.ones(n), -1.0], (np.zeros(n + 1, dtype=np.int64), np.r_[np.arange(n), size])),
+                             shape=(1, n + m + 1))
+        ub = [1.0 if self._is_candidate(v) else 0.0 for v in nodes] + \
+             [1.0 if closed else float(len(members)) for members, _, closed in groups] + [float(n)]
+        res = linprog(c, A_ub=A, b_ub=np.array(b_ub), A_eq=A_eq, b_eq=[0.0],
+                      bounds=list(zip([0.0] * (n + m + 1), ub)), method='highs')
+        if res.status != 0:
+            return {'backend': 'highs', 'status': res.message, 'objective': None, 'duals': {}, 'ranges': {}}
+        marginals = res.ineqlin.marginals
+        return {
+            'backend': 'highs',
+            'status': 'optimal',
+            'relaxation': 'aggregated' if twins else 'per_node',
+            'objective': float(res.fun),
+            'selection_size': float(res.x[size]),
+            'duals': {name: float(f * marginals[r]) + 0.0 for r, (name, f) in enumerate(zip(names, sign)) if name},
+            'ranges': None,
+        }
+
+    def _build_gurobi_model(self, model, budget: float, risk_max: float, coverage: float,
+                            lazy_reach: bool = False, twins: bool = True) -> Tuple[List, Dict, List, List]:
+        """Add the coverage MILP variables and rows to `model`; returns (nodes, x, z, groups)."""
+        gp = self.gp
+        nodes = list(self.graph.nodes())
+        # binary selection variables (filtered-out nodes are fixed to 0)
+        x = {n: model.addVar(vtype=gp.GRB.BINARY, ub=1.0 if self._is_candidate(n) else 0.0, name=f"x_{n}") for n in nodes}
+        # reached follower vars, one per twin group: binary for closed groups (all members
+        # are reached together), integer count of reached members for open groups
+        groups = self._twin_groups() if twins else [([n], list(self._closed_neighborhood(n) - {n}), True) for n in nodes]
+        z = [model.addVar(vtype=gp.GRB.BINARY if closed else gp.GRB.INTEGER, ub=1.0 if closed else len(members),
+                          name=f"z_{members[0]}") for members, _, closed in groups]
+        reached = gp.quicksum((len(members) if closed else 1) * z[g] for g, (members, _, closed) in enumerate(groups))
 
         model.update()
 
         # Objective: minimize cost - lambda * reach; here 'coverage' acts as reach weight (lambda)
         lam = float(coverage)
-        obj = gp.quicksum(float(self.graph.nodes[n].get('cost', 0.0)) * x[n] for n in nodes) - lam * gp.quicksum(z[n] for n in nodes)
+        cost = self.table.values('cost', nodes).tolist()
+        risk = self.table.values('risk', nodes).tolist()
+        xs = [x[n] for n in nodes]
+        obj = gp.LinExpr(cost, xs) - lam * reached
         model.setObjective(obj, gp.GRB.MINIMIZE)
 
         # Budget and risk constraints
-        model.addConstr(gp.quicksum(float(self.graph.nodes[n].get('cost', 0.0)) * x[n] for n in nodes) <= budget, name='budget')
-        model.addConstr(gp.quicksum(float(self.graph.nodes[n].get('risk', 0.0)) * x[n] for n in nodes) <= risk_max, name='risk')
+        model.addConstr(gp.LinExpr(cost, xs) <= budget, name='budget')
+        model.addConstr(gp.LinExpr(risk, xs) <= risk_max, name='risk')
 
-        # z_f <= sum_{i in N(f) U {f}} x_i
-        for f in nodes:
-            nbrs = list(self.graph.neighbors(f)) + [f]
-            model.addConstr(z[f] <= gp.quicksum(x[i] for i in nbrs), name=f"reach_{f}")
+        if lazy_reach:
+            # Aggregated relaxation of the reach rows; violated rows are separated lazily
+            model.addConstr(reached <= gp.quicksum(self.reach.count(n) * x[n] for n in nodes), name='reach_total')
+            model.setParam('LazyConstraints', 1)
+        else:
+            # closed group: z_g <= sum_{i in N[g]} x_i; open group: z_g <= w * sum_{i in N(g)} x_i + sum_{i in g} x_i
+            for g, group in enumerate(groups):
+                model.addConstr(z[g] <= self._reach_row(x, group), name=f"reach_{group[0][0]}")
 
-        # Coverage: sum z_f >= coverage * |V|
-        model.addConstr(gp.quicksum(z[n] for n in nodes) >= float(coverage) * len(nodes), name='coverage')
+        # Coverage: weighted reached nodes >= coverage * |V|
+        model.addConstr(reached >= float(coverage) * len(nodes), name='coverage')
 
         # Platform min/max percentage constraints (read from graph.graph['platform_bounds'] if present)
         S = gp.quicksum(x[n] for n in nodes)
         platforms = {}
-        for n in nodes:
-            p = self.graph.nodes[n].get('platform')
+        for n, p in zip(nodes, self.table.labels('platform', nodes)):
             platforms.setdefault(p, []).append(n)
+        bounds = self._platform_bounds()
         for p, lst in platforms.items():
-            min_pct = 0
-            max_pct = 100
-            if self.graph.graph.get('platform_bounds') and p in self.graph.graph['platform_bounds']:
-                b = self.graph.graph['platform_bounds'][p]
-                min_pct = b.get('min_pct', 0)
-                max_pct = b.get('max_pct', 100)
+            min_pct, max_pct = bounds[p]
             lhs = gp.quicksum(x[n] for n in lst) * 100
             model.addConstr(lhs >= min_pct * S, name=f"plat_min_{p}")
             model.addConstr(lhs <= max_pct * S, name=f"plat_max_{p}")
+        return nodes, x, z, groups
 
-        # Warm start with greedy seed
-        seed = self.greedy_seed(budget)
-        for n in seed:
-            if n in x:
-                x[n].start = 1.0
+    def _twin_groups(self) -> List[Tuple[List, List, bool]]:
+        """Group nodes by hashed neighborhood into (members, outer neighbors, closed).
 
-        model.update()
-        model.optimize()
+        True twins share the closed neighborhood N[v] and are pairwise adjacent, so
+        selecting any neighbor reaches all of them at once (closed=True). False twins,
+        e.g. leaf followers of the same influencer, share the open neighborhood N(v)
+        but are not adjacent: a shared neighbor reaches all of them, a selected member
+        only itself (closed=False). Remaining nodes are closed groups of one.
+        Neighborhoods are the k-hop reach sets of `self.reach`.
+        """
+        by_closed: Dict[frozenset, List] = {}
+        for n in self.graph.nodes():
+            by_closed.setdefault(frozenset(self._closed_neighborhood(n)), []).append(n)
+        groups = []
+        by_open: Dict[frozenset, List] = {}
+        for key, members in by_closed.items():
+            if len(members) > 1:
+                groups.append((members, [v for v in key if v not in set(members)], True))
+            else:
+                by_open.setdefault(key - {members[0]}, []).append(members[0])
+        for key, members in by_open.items():
+            groups.append((members, list(key), len(members) == 1))
+        return groups
 
-        status = model.Status
-        selected = []
-        if status in (gp.GRB.OPTIMAL, gp.GRB.TIME_LIMIT, gp.GRB.SUBOPTIMAL):
-            for n in nodes:
-                try:
-                    if x[n].X > 0.5:
-                        selected.append(n)
-                except Exception:
-                    pass
+    def _reach_row(self, x: Dict, group: Tuple[List, List, bool]):
+        """Right-hand side bounding a twin group's reach variable."""
+        gp = self.gp
+        members, outer, closed = group
+        if closed:
+            return gp.quicksum(x[i] for i in members + outer)
+        return len(members) * gp.quicksum(x[i] for i in outer) + gp.quicksum(x[i] for i in members)
+
+    def _lazy_reach_callback(self, nodes: List, x: Dict, z: List, groups: List[Tuple[List, List, bool]]):
+        """MIPSOL callback adding the `reach_{g}` rows violated by a new incumbent."""
+        gp = self.gp
+        idx = {n: i for i, n in enumerate(nodes)}
+        xs = [x[n] for n in nodes]
+        # flattened (group, node) pairs for members and outer neighbors
+        member_g = np.fromiter((g for g, grp in enumerate(groups) for _ in grp[0]), dtype=np.int64)
+        member_i = np.fromiter((idx[n] for grp in groups for n in grp[0]), dtype=np.int64)
+        outer_g = np.fromiter((g for g, grp in enumerate(groups) for _ in grp[1]), dtype=np.int64)
+        outer_i = np.fromiter((idx[n] for grp in groups for n in grp[1]), dtype=np.int64)
+        size = np.array([len(grp[0]) for grp in groups], dtype=np.int64)
+        closed = np.array([grp[2] for grp in groups], dtype=bool)
+
+        def callback(model, where):
+            if where != gp.GRB.Callback.MIPSOL:
+                return
+            xv = np.asarray(model.cbGetSolution(xs)) > 0.5
+            zv = np.rint(model.cbGetSolution(z))
+            inner = np.bincount(member_g, weights=xv[member_i], minlength=len(groups))
+            hit = np.bincount(outer_g, weights=xv[outer_i], minlength=len(groups))
+            cap = np.where(closed, (inner + hit) > 0, size * hit + inner)
+            for g in np.flatnonzero(zv > cap):
+                model.cbLazy(z[g] <= self._reach_row(x, groups[g]))
+
+        return callback
+
+    @property
+    def reach(self) -> ReachIndex:
+        """Reachability index of the graph for this optimizer's `hops` and `min_prob`.
+
+        Resolved once per optimizer: the staleness check of `get_reach_index` walks
+        the whole graph, too slow for the per-node lookups of the solvers. Deltas
+        patch the cached index in place; after other topology changes build a new
+        optimizer.
+        """
+        if self._reach is None:
+            self._reach = get_reach_index(self.graph, self.hops, self.min_prob)
+        return self._reach
+
+    def _closed_neighborhood(self, n) -> set:
+        """Nodes reached when `n` is selected: `n` itself plus everything within `hops`."""
+        return self.reach.neighborhood(n)
+
+    def precheck(self, budget: float, risk_max: float, coverage: float) -> Dict:
+        """Fast bounds telling whether a coverage target is reachable before a full solve.
+
+        - `coverage_upper`: LP-style upper bound on the reachable fraction of nodes,
+          from fractional knapsacks over closed-neighborhood sizes (overlap ignored)
+          under the budget and under the risk limit separately.
+        - `coverage_greedy`: fraction actually reached by a lazy greedy selection
+          that respects both budget and risk (a feasible lower bound).
+        - `min_cost_lower`: fractional lower bound on the spend needed to hit the target.
+        - `min_cost_greedy`: spend of the greedy selection that first hits the target
+          (ignoring the budget), or None if the risk limit makes it unreachable.
+
+        `status` is 'infeasible' when the bounds prove the target unreachable,
+        'slack' when the greedy selection already meets it within budget and
+        'tight' otherwise.
+        """
+        nodes = list(self.graph.nodes())
+        total = len(nodes)
+        if total == 0:
+            return {'status': 'infeasible', 'target': 0.0, 'coverage_upper': 0.0, 'coverage_greedy': 0.0,
+                    'min_cost_lower': None, 'min_cost_greedy': None}
+        target = float(coverage) * total
+        cost = self.table.mapping('cost', nodes)
+        risk = self.table.mapping('risk', nodes)
+        size = {n: self.reach.count(n) for n in nodes}
+        selectable = [n for n in nodes if self._is_candidate(n)]
+
+        def fractional_knapsack(weight: Dict, capacity: float) -> float:
+            value = 0.0
+            for n in sorted(selectable, key=lambda n: size[n] / weight[n] if weight[n] > 0 else float('inf'), reverse=True):
+                if weight[n] > 0 and capacity <= 0:
+                    break
+                if weight[n] <= capacity:
+                    capacity -= weight[n]
+                    value += size[n]
+                else:
+                    value += size[n] * capacity / weight[n]
+                    break
+            return value
+
+        upper = min(total, fractional_knapsack(cost, budget), fractional_knapsack(risk, risk_max))
+
+        # Fractional covering: cheapest cost per covered node first
+        min_cost_lower = None
+        acc = 0.0
+        spent = 0.0
+        for n in sorted(selectable, key=lambda n: cost[n] / size[n]):
+            if acc + size[n] >= target:
+                min_cost_lower = spent + cost[n] * (target - acc) / size[n]
+                break
+            acc += size[n]
+            spent += cost[n]
+
+        # Lazy greedy on marginal coverage per unit cost; keeps going past the
+        # budget to find the spend at which the target is first hit
+        covered = set()
+        spent = 0.0
+        risk_used = 0.0
+        within_budget = 0
+        min_cost_greedy = None
+        heap = [(-size[n] / max(cost[n], 1e-9), n) for n in selectable]
+        heapq.heapify(heap)
+        while heap and (min_cost_greedy is None or spent <= budget):
+            _, n = heapq.heappop(heap)
+            if risk_used + risk[n] > risk_max:
+                continue
+            gain = len(self._closed_neighborhood(n) - covered)
+            if gain == 0:
+                continue
+            score = -gain / max(cost[n], 1e-9)
+            if heap and score > heap[0][0]:
+                heapq.heappush(heap, (score, n))
+                continue
+            covered |= self._closed_neighborhood(n)
+            spent += cost[n]
+            risk_used += risk[n]
+            if spent <= budget:
+                within_budget = len(covered)
+            if min_cost_greedy is None and len(covered) >= target:
+                min_cost_greedy = spent
+
+        if upper < target or (min_cost_lower is not None and min_cost_lower > budget) or min_cost_lower is None:
+            status = 'infeasible'
+        elif within_budget >= target:
+            status = 'slack'
+        else:
+            status = 'tight'
         return {
-            'selected': selected,
-            'objective': model.ObjVal if model.SolCount > 0 else None,
             'status': status,
-            'runtime': model.Runtime,
+            'target': float(coverage),
+            'coverage_upper': upper / total,
+            'coverage_greedy': within_budget / total,
+            'min_cost_lower': min_cost_lower,
+            'min_cost_greedy': min_cost_greedy,
         }
 
     def monte_carlo_robustness(self, selected: List[str], trials: int = 100, perturb: float = 0.1) -> List[float]:
@@ -132,7 +1409,7 @@ class Optimizer:
         """
         results = []
         nodes = list(self.graph.nodes())
-        followers = {n: int(self.graph.nodes[n].get('followers', 0)) for n in nodes}
+        followers = dict(zip(nodes, self.table.values('followers', nodes).astype(np.int64).tolist()))
         for _ in range(trials):
             success_edges = set()
             for u, v, d in self.graph.edges(data=True):
@@ -157,3 +1434,49 @@ class Optimizer:
             total_followers = sum(followers.get(n, 0) for n in reached)
             results.append(total_followers)
         return results
+
+
+# Per-process optimizer used by `multi_start` and `solve_portfolio` pool workers
+_POOL_OPTIMIZER: Optional[Optimizer] = None
+# graph.graph caches that pool workers rebuild for themselves instead of receiving pickled
+POOL_SKIPPED_CACHES = ('reach_index', 'attribute_index', 'deferred_attributes')
+
+
+def _pool_graph(graph: nx.Graph) -> nx.Graph:
+    """Copy of `graph` for pickling to pool workers, without POOL_SKIPPED_CACHES."""
+    light = graph.__class__()
+    light.add_nodes_from(graph.nodes(data=True))
+    light.add_edges_from(graph.edges(data=True))
+    light.graph.update((k, v) for k, v in graph.graph.items() if k not in POOL_SKIPPED_CACHES)
+    return light
+
+
+def _init_pool_worker(graph: nx.Graph, candidates, hops: int = 1, min_prob: float = 0.0) -> None:
+    global _POOL_OPTIMIZER
+    _POOL_OPTIMIZER = Optimizer(graph, candidates=candidates, hops=hops, min_prob=min_prob)
+
+
+def _greedy_start(job: Tuple, opt: Optional[Optimizer] = None) -> Tuple[List[str], Dict]:
+    """One randomized greedy + local search run; `job` is (budget, risk_max, seed, noise, ls_time)."""
+    budget, risk_max, seed, noise, ls_time = job
+    opt = opt or _POOL_OPTIMIZER
+    rng = random.Random(seed) if seed is not None else None
+    sel = opt.constrained_greedy(budget, risk_max, rng=rng, noise=noise)
+    sel = opt.local_search(sel, budget, risk_max, time_limit=ls_time)
+    return sel, opt.evaluate(sel, budget, risk_max)
+
+
+def _run_engine(job: Tuple, opt: Optional[Optimizer] = None) -> List[str]:
+    """Run one portfolio backend; `job` is (engine, budget, risk_max, coverage, time_limit, incumbent)."""
+    engine, budget, risk_max, coverage, time_limit, incumbent = job
+    opt = opt or _POOL_OPTIMIZER
+    if engine == 'milp':
+        return opt._solve_gurobi(budget, risk_max, coverage, max(1, int(time_limit)), starts=[incumbent])['selected']
+    if engine == 'multistart':
+        return opt.multi_start(budget, risk_max, workers=1, time_limit=time_limit)['selected']
+    if engine == 'evolve':
+        return opt.evolve(budget, risk_max, time_limit=time_limit)['selected']
+    if engine == 'greedy':
+        return opt.local_search(opt.constrained_greedy(budget, risk_max), budget, risk_max,
+                                time_limit=opt._local_search_time(time_limit))
+    raise ValueError(f"Unknown engine: {engine}")
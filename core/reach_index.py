@@ -0,0 +1,174 @@
+"""k-hop reachability index for multi-hop coverage.
+
+Row `v` holds every node a campaign reaches when `v` is selected: `v` itself plus
+all nodes within `hops` edges, optionally only along paths whose probability (the
+product of edge `prob` values) is at least `min_prob`. Rows are stored once per
+graph as CSR arrays of sorted node positions, so solvers and summary metrics share
+one compact structure instead of walking the graph on every evaluation.
+"""
+from typing import Dict, Iterable, List, Tuple
+
+import networkx as nx
+import numpy as np
+
+
+class ReachIndex:
+    """CSR index of k-hop closed neighborhoods over `graph`.
+
+    `indices[indptr[i]:indptr[i + 1]]` are the sorted positions reached from node
+    `nodes[i]` and `prob` the best path probability to each of them (1 for `i`).
+    With `hops=1` and `min_prob=0` a row is exactly the closed neighborhood N[v].
+    """
+
+    def __init__(self, graph: nx.Graph, hops: int = 1, min_prob: float = 0.0):
+        if hops < 1:
+            raise ValueError("hops must be at least 1")
+        self.hops = int(hops)
+        self.min_prob = float(min_prob)
+        self.nodes: List = list(graph.nodes())
+        self.pos: Dict = {n: i for i, n in enumerate(self.nodes)}
+        self.size = len(self.nodes)
+        self.edges = graph.number_of_edges()
+        adj = [[(self.pos[v], float(d.get('prob', 1.0))) for v, d in graph[n].items()] for n in self.nodes]
+        indptr = np.zeros(self.size + 1, dtype=np.int64)
+        rows: List[np.ndarray] = []
+        probs: List[np.ndarray] = []
+        for i in range(self.size):
+            best = self._reach_from(i, adj)
+            row = np.fromiter(best.keys(), dtype=np.int32, count=len(best))
+            order = np.argsort(row)
+            rows.append(row[order])
+            probs.append(np.fromiter(best.values(), dtype=float, count=len(best))[order])
+            indptr[i + 1] = indptr[i] + len(best)
+        self.indptr = indptr
+        self.indices = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32)
+        self.prob = np.concatenate(probs) if probs else np.zeros(0, dtype=float)
+
+    def _reach_from(self, i: int, adj: List[List[Tuple[int, float]]]) -> Dict[int, float]:
+        """Best path probability to every node within `hops` of `i` (hop-bounded max-product)."""
+        best = {i: 1.0}
+        frontier = {i: 1.0}
+        for _ in range(self.hops):
+            nxt: Dict[int, float] = {}
+            for u, pu in frontier.items():
+                for v, pe in adj[u]:
+                    p = pu * pe
+                    if p >= self.min_prob and p > best.get(v, -1.0):
+                        best[v] = p
+                        nxt[v] = p
+            if not nxt:
+                break
+            frontier = nxt
+        return best
+
+    def refresh(self, graph: nx.Graph, changed: Iterable) -> List:
+        """Patch the index after nodes in `changed` were added/removed or had edges changed.
+
+        Only rows that could reach a changed node before or after the change (those
+        within `hops`) are recomputed; every other row is copied with its positions
+        remapped. Returns the node ids whose rows were recomputed.
+        """
+        changed = set(changed)
+        nodes = list(graph.nodes())
+        pos = {n: i for i, n in enumerate(nodes)}
+        # Rows are symmetric in membership, so old rows of changed nodes list every
+        # node that reached them; a hop-bounded walk finds the new ones
+        affected = set()
+        for n in changed:
+            if n in self.pos:
+                affected.update(self.nodes[j] for j in self.row(n))
+        frontier = {n for n in changed if n in pos}
+        affected |= frontier
+        for _ in range(self.hops):
+            frontier = {v for u in frontier for v in graph[u]} - affected
+            affected |= frontier
+        affected = {n for n in affected if n in pos}
+
+        # Copy unaffected rows, remapping old positions to new ones
+        remap = np.full(self.size, -1, dtype=np.int64)
+        for n, i in self.pos.items():
+            remap[i] = pos.get(n, -1)
+        kept_old = np.array([i for n, i in self.pos.items() if n in pos and n not in affected], dtype=np.int64)
+        lens = np.zeros(len(nodes), dtype=np.int64)
+        old_lens = np.diff(self.indptr)
+        lens[remap[kept_old]] = old_lens[kept_old]
+        adj = _LazyAdjacency(graph, pos)
+        rows = {}
+        for n in affected:
+            best = self._reach_from(pos[n], adj)
+            row = np.fromiter(best.keys(), dtype=np.int32, count=len(best))
+            order = np.argsort(row)
+            rows[pos[n]] = (row[order], np.fromiter(best.values(), dtype=float, count=len(best))[order])
+            lens[pos[n]] = len(best)
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(lens, out=indptr[1:])
+        indices = np.empty(int(indptr[-1]), dtype=np.int32)
+        prob = np.empty(int(indptr[-1]), dtype=float)
+        if len(kept_old):
+            starts = self.indptr[kept_old]
+            take = np.repeat(starts - (np.cumsum(old_lens[kept_old]) - old_lens[kept_old]), old_lens[kept_old]) \
+                + np.arange(int(old_lens[kept_old].sum()))
+            row_of = np.repeat(kept_old, old_lens[kept_old])
+            dest = indptr[remap[row_of]] + (take - self.indptr[row_of])
+            # Removal keeps relative order and additions go last, so rows stay sorted
+            indices[dest] = remap[self.indices[take]]
+            prob[dest] = self.prob[take]
+        for i, (row, p) in rows.items():
+            indices[indptr[i]:indptr[i + 1]] = row
+            prob[indptr[i]:indptr[i + 1]] = p
+        self.nodes, self.pos, self.size = nodes, pos, len(nodes)
+        self.edges = graph.number_of_edges()
+        self.indptr, self.indices, self.prob = indptr, indices, prob
+        return sorted(affected, key=pos.get)
+
+    def row(self, n) -> np.ndarray:
+        """Sorted positions reached from node `n`."""
+        i = self.pos[n]
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def neighborhood(self, n) -> set:
+        """Node ids reached from node `n` (including `n`)."""
+        return {self.nodes[j] for j in self.row(n)}
+
+    def count(self, n) -> int:
+        """Number of nodes reached from node `n` alone."""
+        i = self.pos[n]
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def covered_mask(self, selected: Iterable) -> np.ndarray:
+        """Boolean mask (in `self.nodes` order) of nodes reached by `selected`."""
+        mask = np.zeros(self.size, dtype=bool)
+        for n in selected:
+            if n in self.pos:
+                mask[self.row(n)] = True
+        return mask
+
+    def reached(self, selected: Iterable) -> List:
+        """Node ids reached by `selected`."""
+        return [self.nodes[j] for j in np.flatnonzero(self.covered_mask(selected))]
+
+
+class _LazyAdjacency(dict):
+    """`_reach_from` adjacency built only for the nodes a walk visits."""
+
+    def __init__(self, graph: nx.Graph, pos: Dict):
+        super().__init__()
+        self.graph = graph
+        self.pos = pos
+        self.nodes = list(pos)
+
+    def __missing__(self, i: int) -> List[Tuple[int, float]]:
+        n = self.nodes[i]
+        self[i] = adj = [(self.pos[v], float(d.get('prob', 1.0))) for v, d in self.graph[n].items()]
+        return adj
+
+
+def get_reach_index(graph: nx.Graph, hops: int = 1, min_prob: float = 0.0) -> ReachIndex:
+    """Return the index for (`hops`, `min_prob`) cached on `graph.graph`, rebuilding it when stale."""
+    cache = graph.graph.setdefault('reach_index', {})
+    key = (int(hops), float(min_prob))
+    index = cache.get(key)
+    if index is None or index.size != graph.number_of_nodes() or index.edges != graph.number_of_edges():
+        index = ReachIndex(graph, hops=hops, min_prob=min_prob)
+        cache[key] = index
+    return index
@@ -54,13 +54,33 @@ class ScenarioStore:
             metrics['roi'].append(r.get('roi', 0.0))
         return metrics
 
+    def most_similar(self, params: Dict[str, Any], k: int = 1) -> List[Scenario]:
+        """Return up to `k` stored scenarios with a selection, closest to `params` first.
+
+        Distance is the sum of relative differences in budget, risk_max and coverage,
+        so scenarios that only moved one slider a little rank first.
+        """
+        def rel(a: float, b: float) -> float:
+            return abs(a - b) / max(abs(a), abs(b), 1e-9)
+
+        keys = ('budget', 'risk_max', 'coverage')
+        scored = []
+        for i, s in enumerate(self.scenarios):
+            if not (s.result or {}).get('selected'):
+                continue
+            d = sum(rel(float(params.get(key, 0.0)), float(s.params.get(key, 0.0))) for key in keys)
+            scored.append((d, i, s))
+        scored.sort(key=lambda t: (t[0], t[1]))
+        return [s for _, _, s in scored[:k]]
+
 
 def make_session_dict(graph: nx.Graph, params: Dict[str, Any], store: ScenarioStore) -> Dict[str, Any]:
     """Serialize graph, params and scenarios into a JSON-serializable dict."""
+    from core.lazy_attributes import all_node_attributes
     nodes = []
-    for n, d in graph.nodes(data=True):
+    for n, d in all_node_attributes(graph):
         nd = {'id': n}
-        nd.update({k: d[k] for k in d})
+        nd.update(d)
         nodes.append(nd)
     edges = []
     for u, v, d in graph.edges(data=True):
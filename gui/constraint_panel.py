@@ -1,7 +1,7 @@
 """Enhanced constraint panel with visual feedback and real-time validation."""
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, 
                              QProgressBar, QDockWidget, QGroupBox, QHBoxLayout,
-                             QFrame, QSizePolicy)
+                             QFrame, QSizePolicy, QCheckBox, QSpinBox)
 from PyQt5.QtCore import pyqtSignal, Qt, QTimer
 from PyQt5.QtGui import QColor, QPalette, QFont
 
@@ -86,10 +86,31 @@ class ConstraintPanel(QWidget):
     """Enhanced constraint panel with visual feedback."""
     
     solveRequested = pyqtSignal()
+    liveSolveRequested = pyqtSignal()
+    
+    # Quiet period after the last slider change before a live re-solve is launched
+    LIVE_DEBOUNCE_MS = 250
+    # Quiet period after the last constraint change before the feasibility pre-check runs
+    PRECHECK_DEBOUNCE_MS = 100
     
     def __init__(self, parent=None):
         super().__init__(parent)
         
+        # Debounce timer for live what-if mode (restarted on every change)
+        self._live_timer = QTimer(self)
+        self._live_timer.setSingleShot(True)
+        self._live_timer.setInterval(self.LIVE_DEBOUNCE_MS)
+        self._live_timer.timeout.connect(self.liveSolveRequested.emit)
+        
+        # Feasibility pre-check runs in the background against the loaded graph
+        self._graph = None
+        self._precheck_worker = None
+        self._retired_prechecks = []
+        self._precheck_timer = QTimer(self)
+        self._precheck_timer.setSingleShot(True)
+        self._precheck_timer.setInterval(self.PRECHECK_DEBOUNCE_MS)
+        self._precheck_timer.timeout.connect(self._start_precheck)
+        
         main_layout = QVBoxLayout()
         main_layout.setSpacing(10)
         
@@ -165,8 +186,19 @@ class ConstraintPanel(QWidget):
         self.coverage = CoverageDial()
         self.coverage.dial.valueChanged.connect(self._validate_constraints)
         
+        # Reach depth: 1 counts direct followers, higher values follow reshares
+        hops_row = QHBoxLayout()
+        hops_row.addWidget(QLabel("Reach depth (hops):"))
+        self.hops = QSpinBox()
+        self.hops.setRange(1, 3)
+        self.hops.setToolTip("Count followers reached within this many hops of a selected influencer")
+        self.hops.valueChanged.connect(self._validate_constraints)
+        hops_row.addWidget(self.hops)
+        hops_row.addStretch()
+        
         audience_layout.addWidget(self.audience)
         audience_layout.addWidget(self.coverage)
+        audience_layout.addLayout(hops_row)
         
         audience_group.setLayout(audience_layout)
         main_layout.addWidget(audience_group)
@@ -230,6 +262,12 @@ class ConstraintPanel(QWidget):
         self.solve_btn.clicked.connect(self.solveRequested.emit)
         main_layout.addWidget(self.solve_btn)
         
+        # Live what-if mode: re-solve in the background while sliders move
+        self.live_check = QCheckBox("Live what-if (re-solve while dragging)")
+        self.live_check.setToolTip("Automatically re-optimize shortly after budget, risk or coverage changes")
+        self.live_check.toggled.connect(self._on_live_toggled)
+        main_layout.addWidget(self.live_check)
+        
         # Progress bar
         self.progress = QProgressBar()
         self.progress.setValue(0)
@@ -310,6 +348,61 @@ class ConstraintPanel(QWidget):
         
         # Quality status (placeholder)
         self.quality_status.set_status('info')
+        
+        # Schedule a debounced live re-solve
+        if self.live_check.isChecked():
+            self._live_timer.start()
+        
+        # Schedule the feasibility pre-check for the new values
+        if self._graph is not None and len(self._graph) > 0:
+            self._precheck_timer.start()
+    
+    def set_graph(self, graph):
+        """Attach the campaign graph used by the feasibility pre-check and re-validate."""
+        self._graph = graph
+        self._validate_constraints()
+    
+    def _start_precheck(self):
+        """Launch a PrecheckWorker for the current constraint values."""
+        from gui.solve_worker import PrecheckWorker
+        self._retired_prechecks = [w for w in self._retired_prechecks if w.isRunning()]
+        if self._precheck_worker is not None and self._precheck_worker.isRunning():
+            self._retired_prechecks.append(self._precheck_worker)
+        self._precheck_worker = PrecheckWorker(self._graph, self.as_dict())
+        self._precheck_worker.finished.connect(self._on_precheck_finished)
+        self._precheck_worker.start()
+    
+    def _on_precheck_finished(self, res: dict):
+        """Show infeasible/tight/slack on the status lights before any solve."""
+        if self.sender() is not self._precheck_worker:
+            return
+        status = res.get('status')
+        target = res.get('target', 0.0) * 100
+        upper = res.get('coverage_upper', 0.0) * 100
+        min_cost = res.get('min_cost_lower')
+        if status == 'infeasible':
+            self.coverage_status.set_status('error')
+            if min_cost is not None and min_cost > self.budget.value():
+                self.budget_status.set_status('error')
+                self.info_label.setText(f"⛔ Coverage {target:.0f}% needs at least ${min_cost:,.0f}.")
+            else:
+                self.info_label.setText(f"⛔ Coverage {target:.0f}% unreachable: at most {upper:.0f}% within budget and risk.")
+        elif status == 'tight':
+            self.coverage_status.set_status('warning')
+            self.info_label.setText(f"⚠️ Coverage {target:.0f}% is tight (upper bound {upper:.0f}%); the solver may struggle.")
+        elif status == 'slack':
+            self.coverage_status.set_status('ok')
+        else:
+            # The check failed: clear the lights of the previous check rather than keep them
+            self.coverage_status.set_status('info')
+            self.info_label.setText(f"⚠️ Feasibility pre-check failed: {res.get('error', status)}")
+    
+    def _on_live_toggled(self, checked: bool):
+        """Start a live solve right away when enabled, stop pending ones when disabled."""
+        if checked:
+            self._live_timer.start()
+        else:
+            self._live_timer.stop()
     
     def update_metrics(self, cost: float, reach: int, roi: float):
         """Update metric displays after solving."""
@@ -346,6 +439,7 @@ class ConstraintPanel(QWidget):
             'platforms': self.platforms.selected_platforms(),
             'platform_bounds': self.platforms.bounds(),
             'conv_value': float(self.roi.conv_value()),
+            'hops': int(self.hops.value()),
         }
     
     def load_from_dict(self, d: dict):
@@ -359,6 +453,8 @@ class ConstraintPanel(QWidget):
                 self.coverage.dial.setValue(int(float(d['coverage']) * 100))
             if 'conv_value' in d:
                 self.roi.conv.setValue(float(d['conv_value']))
+            if 'hops' in d:
+                self.hops.setValue(int(d['hops']))
             if 'platforms' in d:
                 p = d['platforms']
                 self.platforms.ig.setChecked(p.get('IG', True))
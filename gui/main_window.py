@@ -12,6 +12,14 @@ import os
 class MainWindow (QMainWindow):
     """Enhanced main window with modern UI and improved workflow."""
     
+    # Solver time limit (seconds) for live what-if re-solves
+    LIVE_TIME_LIMIT = 1
+    # Graphs with fewer nodes solve without multi-start restarts: spawning the
+    # process pool and pickling the graph would cost more than the restarts find
+    RESTART_MIN_NODES = 5000
+    # Dataset files may be compressed; ingestion detects the format from the content
+    DATA_FILTER = "CSV Files (*.csv *.csv.gz *.csv.bz2 *.csv.xz *.csv.zst);;All Files (*)"
+    
     def __init__(self):
         super().__init__()
         self.dark_mode = True 
@@ -286,6 +294,7 @@ class MainWindow (QMainWindow):
         # Import enhanced network view
         from gui.network_view import NetworkView
         self.network_view = NetworkView()
+        self.network_view.selectionChanged.connect(self._on_manual_selection_changed)
         
         # Layout controls
         layout_controls = QHBoxLayout()
@@ -323,6 +332,8 @@ class MainWindow (QMainWindow):
         self.constraint_dock = ConstraintDock(self)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.constraint_dock)
         self.constraint_dock.panel.solveRequested.connect(self._on_solve_requested)
+        self.constraint_dock.panel.liveSolveRequested.connect(self._on_live_solve_requested)
+        self.constraint_dock.panel.set_graph(self.network_view.graph)
         self._create_statusbar()
         
     def _create_menus(self):
@@ -342,6 +353,10 @@ class MainWindow (QMainWindow):
         open_action.triggered.connect(self._open_dataset)
         file_menu.addAction(open_action)
         
+        delta_action = QAction("Apply &Delta...", self)
+        delta_action.triggered.connect(self._apply_delta)
+        file_menu.addAction(delta_action)
+        
         file_menu.addSeparator()
         
         save_action = QAction("&Save Session", self)
@@ -414,6 +429,16 @@ class MainWindow (QMainWindow):
         optimize_action.triggered.connect(self._on_solve_requested)
         tools_menu.addAction(optimize_action)
         
+        portfolio_action = QAction("Optimize with &Portfolio Race", self)
+        portfolio_action.setToolTip("Run MILP and heuristics in parallel and keep the best answer")
+        portfolio_action.triggered.connect(self._on_portfolio_solve_requested)
+        tools_menu.addAction(portfolio_action)
+        
+        sensitivity_action = QAction("&Sensitivity Report", self)
+        sensitivity_action.setToolTip("Marginal value of budget, risk, coverage and platform limits (LP relaxation)")
+        sensitivity_action.triggered.connect(self._run_sensitivity)
+        tools_menu.addAction(sensitivity_action)
+        
         robustness_action = QAction("&Robustness Analysis", self)
         robustness_action.triggered.connect(self._run_robustness)
         tools_menu.addAction(robustness_action)
@@ -547,6 +572,7 @@ class MainWindow (QMainWindow):
         self.network_view.load_demo()
         self._update_status_counts()
         self._update_stats()
+        self.constraint_dock.panel.set_graph(self.network_view.graph)
         self.status_label.setText("Demo dataset loaded")
         QTimer.singleShot(3000, lambda: self.status_label.setText("Ready"))
     
@@ -562,27 +588,55 @@ class MainWindow (QMainWindow):
             self.network_view._layout_and_draw()
             self._update_status_counts()
             self._update_stats()
+            self.constraint_dock.panel.set_graph(self.network_view.graph)
             self.status_label.setText("New campaign started")
     
     def _open_dataset(self):
         """Open dataset from CSV files."""
         users_path, _ = QFileDialog.getOpenFileName(
-            self, "Open Users CSV", "", "CSV Files (*.csv)"
+            self, "Open Users CSV", "", self.DATA_FILTER
         )
         if users_path:
-            self.network_view.load_users(users_path)
-            self._update_status_counts()
+            from core.ingest import IngestError
+            from core.lazy_attributes import is_wide
             edges_path, _ = QFileDialog.getOpenFileName(
-                self, "Open Edges CSV", "", "CSV Files (*.csv)"
+                self, "Open Edges CSV", "", self.DATA_FILTER
             )
-            if edges_path:
-                self.network_view.load_edges(edges_path)
-                self._update_status_counts()
+            try:
+                # Wide vendor files load only the drawn/solver columns up front; others
+                # reopen through the compiled (memory-mapped) cache
+                self.network_view.load_dataset(users_path, edges_path or None, lazy=is_wide(users_path))
+            except (IngestError, OSError) as e:
+                QMessageBox.warning(self, "Invalid Dataset", str(e))
+                return
             self.network_view._layout_and_draw()
             self._update_status_counts()
             self._update_stats()
+            self.constraint_dock.panel.set_graph(self.network_view.graph)
             self.status_label.setText("Dataset loaded")
     
+    def _apply_delta(self):
+        """Patch the loaded dataset from users and/or edges delta CSVs."""
+        users_path, _ = QFileDialog.getOpenFileName(
+            self, "Users Delta CSV (cancel to skip)", "", self.DATA_FILTER
+        )
+        edges_path, _ = QFileDialog.getOpenFileName(
+            self, "Edges Delta CSV (cancel to skip)", "", self.DATA_FILTER
+        )
+        if not users_path and not edges_path:
+            return
+        from core.ingest import IngestError
+        try:
+            report = self.network_view.apply_delta(users_path or None, edges_path or None)
+        except IngestError as e:
+            QMessageBox.warning(self, "Invalid Delta", str(e))
+            return
+        if report:
+            self._update_status_counts()
+            self._update_stats()
+            self.constraint_dock.panel.set_graph(self.network_view.graph)
+        self.status_label.setText(f"Delta applied: {report.summary()}")
+    
     def _save_session(self):
         """Quick save session."""
         if hasattr(self, '_current_session_path'):
@@ -632,6 +686,7 @@ class MainWindow (QMainWindow):
                 self.scenario_manager._refresh_table()
                 self._current_session_path = path
                 self._update_stats()
+                self.constraint_dock.panel.set_graph(self.network_view.graph)
                 self.status_label.setText(f"Session loaded: {os.path.basename(path)}")
             except Exception as e:
                 QMessageBox.warning(self, "Load Error", f"Failed to load: {str(e)}")
@@ -655,13 +710,29 @@ class MainWindow (QMainWindow):
     
     def _on_solve_requested(self):
         """Handle solve request."""
+        self._start_solve()
+    
+    def _on_portfolio_solve_requested(self):
+        """Race all available solver backends and keep the best answer."""
+        self._start_solve({'portfolio': True})
+    
+    def _start_solve(self, extra: Optional[dict] = None):
+        """Launch a full background solve with the current constraints."""
         params = self.constraint_dock.panel.as_dict()
+        params.update(extra or {})
         
         from gui.solve_worker import SolveWorker
         if hasattr(self, 'worker') and self.worker.isRunning():
             QMessageBox.information(self, "Busy", "Optimization already running")
             return
         
+        self._cancel_live_solve()
+        # Without Gurobi, spend idle cores on randomized greedy restarts (large graphs only)
+        params['restarts'] = 1
+        if len(self.network_view.graph) >= self.RESTART_MIN_NODES:
+            params['restarts'] = os.cpu_count() or 1
+        params['starts'] = self._warm_starts(params)
+        
         self.constraint_dock.panel.progress.setVisible(True)
         self.constraint_dock.panel.progress.setValue(0)
         self.constraint_dock.panel.solve_btn.setEnabled(False)
@@ -672,16 +743,75 @@ class MainWindow (QMainWindow):
         self.worker.finished.connect(self._on_solve_finished)
         self.worker.start()
     
-    def _on_solve_finished(self, result: dict):
-        """Handle solve completion."""
+    def _on_live_solve_requested(self):
+        """Launch a warm-started background re-solve for live what-if mode.
+        
+        A newer request cancels the in-flight live solve; its result is dropped
+        when it arrives.
+        """
+        if len(self.network_view.graph) == 0:
+            return
+        if hasattr(self, 'worker') and self.worker.isRunning():
+            return
+        
+        from gui.solve_worker import SolveWorker
+        self._cancel_live_solve()
+        
+        params = self.constraint_dock.panel.as_dict()
+        params['time_limit'] = self.LIVE_TIME_LIMIT
+        params['starts'] = self._warm_starts(params)
+        
+        self.live_worker = SolveWorker(self.network_view.graph, params)
+        self.live_worker.finished.connect(self._on_live_solve_finished)
+        self.live_worker.start()
+        self.status_label.setText("Live re-solving...")
+    
+    def _warm_starts(self, params: dict) -> list:
+        """Earlier selections to warm-start a solve: the last result, then the closest saved scenario.
+
+        The optimizer repairs each one for the new constraints before using it.
+        """
+        starts = []
+        last = getattr(self, 'last_result', {})
+        if last.get('selected'):
+            starts.append(list(last['selected']))
+        for scenario in self.scenario_manager.store.most_similar(params, k=1):
+            sel = list(scenario.result['selected'])
+            if sel not in starts:
+                starts.append(sel)
+        return starts
+    
+    def _cancel_live_solve(self):
+        """Cancel the running live solve, keeping a reference until its thread exits."""
+        if not hasattr(self, '_retired_workers'):
+            self._retired_workers = []
+        self._retired_workers = [w for w in self._retired_workers if w.isRunning()]
+        live = getattr(self, 'live_worker', None)
+        if live is not None and live.isRunning():
+            live.cancel()
+            self._retired_workers.append(live)
+        self.live_worker = None
+    
+    def _on_live_solve_finished(self, result: dict):
+        """Stream a live result into the metrics and network highlight."""
+        if self.sender() is not self.live_worker or result.get('cancelled'):
+            return
+        self._apply_result(result)
+        self.status_label.setText(
+            f"Live: {len(result.get('selected', []))} influencers, "
+            f"{result.get('reached_followers', 0):,} reach, ROI: ${result.get('roi', 0):,.2f}"
+        )
+    
+    def _apply_result(self, result: dict):
+        """Highlight a solve result on the canvas and update the metric displays."""
         selected = set(result.get('selected', []))
         
-        # Calculate reached followers
-        reached = set(selected)
-        for n in selected:
-            for neighbor in self.network_view.graph.neighbors(n):
-                reached.add(neighbor)
+        # Calculate reached followers with the reach depth the result was solved for
+        from core.reach_index import get_reach_index
+        index = get_reach_index(self.network_view.graph, result.get('hops', 1))
+        reached = set(index.reached(selected))
         
+        self.network_view.reach_hops = result.get('hops', 1)
         self.network_view.highlight_selection(selected, reached)
         
         # Update metrics
@@ -691,22 +821,52 @@ class MainWindow (QMainWindow):
         
         self.constraint_dock.panel.update_metrics(cost, reach, roi)
         
+        self.last_result = result
+    
+    def _on_manual_selection_changed(self, selected: set):
+        """Update metrics after a hand toggle on the canvas and suggest the next pick."""
+        params = self.constraint_dock.panel.as_dict()
+        ev = self.network_view.manual_evaluator()
+        summary = ev.summary(params.get('conv_value', 0.0))
+        summary['hops'] = ev.index.hops
+        self.constraint_dock.panel.update_metrics(summary['total_cost'], summary['reached_followers'], summary['roi'])
+        self.last_result = summary
+        
+        best = ev.best_next(params['budget'], params['risk_max'])
+        hint = ""
+        if best is not None:
+            from core.lazy_attributes import node_attributes
+            name = node_attributes(self.network_view.graph, best[0]).get('name', best[0])
+            hint = f" | Best next: {name} (+{best[1]:,.0f} reach)"
+        self.status_label.setText(
+            f"Manual: {len(selected)} influencers, {summary['reached_followers']:,.0f} reach, "
+            f"ROI: ${summary['roi']:,.2f}{hint}"
+        )
+    
+    def _on_solve_finished(self, result: dict):
+        """Handle solve completion."""
+        self._apply_result(result)
+        selected = set(result.get('selected', []))
+        cost = result.get('total_cost', 0)
+        reach = result.get('reached_followers', 0)
+        roi = result.get('roi', 0)
+        
         self.constraint_dock.panel.progress.setVisible(False)
         self.constraint_dock.panel.solve_btn.setEnabled(True)
         
-        self.last_result = result
-        
         # Show summary
         self.status_label.setText(
             f"✓ Optimized: {len(selected)} influencers, {reach:,} reach, ROI: ${roi:,.2f}"
         )
         
+        engine = f"\nWinning engine: {result['engine']}" if result.get('engine') else ""
         QMessageBox.information(
             self, "Optimization Complete",
             f"Selected {len(selected)} influencers\n"
             f"Estimated reach: {reach:,}\n"
             f"Total cost: ${cost:,.2f}\n"
             f"ROI: ${roi:,.2f}"
+            f"{engine}"
         )
     
     def _run_robustness(self):
@@ -737,6 +897,61 @@ class MainWindow (QMainWindow):
         
         self.status_label.setText("Ready")
     
+    def _run_sensitivity(self):
+        """Show shadow prices of the current constraints without what-if re-solves."""
+        if len(self.network_view.graph) == 0:
+            QMessageBox.warning(self, "No Data", "Please load a dataset first")
+            return
+        
+        if hasattr(self, 'sensitivity_worker') and self.sensitivity_worker.isRunning():
+            return
+        
+        from gui.solve_worker import SensitivityWorker
+        self.status_label.setText("Computing sensitivity report...")
+        self.sensitivity_worker = SensitivityWorker(self.network_view.graph, self.constraint_dock.panel.as_dict())
+        self.sensitivity_worker.finished.connect(self._on_sensitivity_finished)
+        self.sensitivity_worker.start()
+    
+    def _on_sensitivity_finished(self, report: dict):
+        """Show the report computed by SensitivityWorker."""
+        self.status_label.setText("Ready")
+        if report['status'] != 'optimal':
+            QMessageBox.warning(self, "Sensitivity Report",
+                                f"LP relaxation not solved ({report['status']}); "
+                                "check the constraints or install Gurobi/scipy.")
+            return
+        
+        duals = report['duals']
+        ranges = report['ranges'] or {}
+        
+        def valid(name):
+            if name not in ranges:
+                return ""
+            lo, hi = ranges[name]
+            return f"  (valid for {lo:,.4g} .. {hi:,.4g})"
+        
+        one_pct = 0.01 * len(self.network_view.graph)
+        lines = [
+            f"Objective (cost - coverage x reach): {report['objective']:,.2f}",
+            "",
+            f"+$1,000 budget: {1000 * duals.get('budget', 0.0):+,.2f}{valid('budget')}",
+            f"+0.01 risk limit: {0.01 * duals.get('risk', 0.0):+,.2f}{valid('risk')}",
+            f"+1% coverage target: {one_pct * duals.get('coverage', 0.0):+,.2f}{valid('coverage')}",
+        ]
+        # A platform row moves by the selection size per percentage point of its bound
+        size = report.get('selection_size', 0.0)
+        for name, value in sorted(duals.items()):
+            if name.startswith('plat_') and abs(value) > 1e-9:
+                span = ""
+                if name in ranges and size > 0:
+                    lo, hi = ranges[name]
+                    span = f"  (valid for {lo / size:+,.4g} .. {hi / size:+,.4g} points)"
+                lines.append(f"+1 point {name}: {size * value:+,.2f}{span}")
+        relaxation = report.get('relaxation', 'per_node').replace('_', '-')
+        lines += ["", f"Negative values lower the objective (better). Backend: {report['backend']} "
+                      f"({relaxation} LP relaxation)"]
+        QMessageBox.information(self, "Sensitivity Report", "\n".join(lines))
+    
     def _save_current_scenario(self):
         """Save current state as scenario."""
         self.scenario_manager._on_save()
@@ -759,8 +974,11 @@ class MainWindow (QMainWindow):
             self, "Export CSV", "selection.csv", "CSV Files (*.csv)"
         )
         if path:
+            from core.data_models import get_influencer_table
             from utils.exporters import export_selection_csv
-            export_selection_csv(path, self.last_result['selected'])
+            graph = self.network_view.graph
+            export_selection_csv(path, self.last_result['selected'], table=get_influencer_table(graph),
+                                 deferred=graph.graph.get('deferred_attributes'))
             self.status_label.setText(f"Exported to {os.path.basename(path)}")
     
     def _export_pptx(self):
@@ -8,10 +8,17 @@ from PyQt5.QtWidgets import (QGraphicsView, QGraphicsScene, QGraphicsEllipseItem
 from PyQt5.QtCore import QRectF, Qt, QPointF, pyqtSignal, QTimer
 from PyQt5.QtGui import QColor, QBrush, QPen, QPainter, QFont, QRadialGradient, QLinearGradient, QImage
 import networkx as nx
-import csv
 import math
+import numpy as np
 from typing import Dict, Optional, Set
 
+from core.compiled_graph import load_graph_cached
+from core.data_models import get_influencer_table, set_node_attributes
+from core.delta import DeltaReport, apply_delta
+from core.ingest import add_edges, add_users, read_edges, read_users
+from core.lazy_attributes import load_graph_lazy, node_attributes
+from core.incremental import IncrementalEvaluator
+
 
 PLATFORM_COLORS = {
     "IG": {
@@ -56,6 +63,12 @@ def get_risk_color(risk_value: float) -> QColor:
         return RISK_COLORS['critical']
 
 
+def _drawn_attributes(graph: nx.Graph, n) -> dict:
+    """Influencer table row of node `n` overlaid with its node dict (no deferred columns)."""
+    table = get_influencer_table(graph)
+    return {**table.record(n), **graph.nodes[n]}
+
+
 class InteractiveNodeItem(QGraphicsEllipseItem):
     """Enhanced node item with hover effects, context menu, and visual states."""
     
@@ -76,7 +89,7 @@ class InteractiveNodeItem(QGraphicsEllipseItem):
     
     def _update_appearance(self):
         """Update visual appearance based on node state."""
-        attrs = self.graph.nodes[self.node_id]
+        attrs = _drawn_attributes(self.graph, self.node_id)
         platform = attrs.get('platform', 'IG')
         colors = PLATFORM_COLORS.get(platform, PLATFORM_COLORS['IG'])
         
@@ -139,14 +152,16 @@ class InteractiveNodeItem(QGraphicsEllipseItem):
         self.is_hovered = True
         self._update_appearance()
         
-        attrs = self.graph.nodes[self.node_id]
+        attrs = node_attributes(self.graph, self.node_id)
+        eng_rate = attrs.get('eng_rate')
+        engagement = f"{eng_rate * 100:.2f}%" if eng_rate is not None else "N/A"
         tooltip = f"""<b>{attrs.get('name', self.node_id)}</b><br>
 Platform: {attrs.get('platform', 'N/A')}<br>
-Followers: {attrs.get('followers', 0):,}<br>
-Cost: ${attrs.get('cost', 0):,.2f}<br>
-Risk: {attrs.get('risk', 0)*100:.1f}%<br>
-Fake: {attrs.get('fake', 0)*100:.1f}%<br>
-Engagement: {attrs.get('eng_rate', 0)*100:.2f}%"""
+Followers: {attrs.get('followers') or 0:,}<br>
+Cost: ${attrs.get('cost') or 0:,.2f}<br>
+Risk: {(attrs.get('risk') or 0)*100:.1f}%<br>
+Fake: {(attrs.get('fake') or 0)*100:.1f}%<br>
+Engagement: {engagement}"""
         
         QToolTip.setFont(QFont('Arial', 10))
         QToolTip.showText(event.screenPos(), tooltip)
@@ -185,6 +200,10 @@ Engagement: {attrs.get('eng_rate', 0)*100:.2f}%"""
     
     def _toggle_selection(self):
         """Toggle manual selection state."""
+        if self.scene() and self.scene().views() and hasattr(self.scene().views()[0], 'toggle_node'):
+            # The view updates this item, the reach highlight and the running totals
+            self.scene().views()[0].toggle_node(self.node_id)
+            return
         self.is_selected_influencer = not self.is_selected_influencer
         self._update_appearance()
 
@@ -202,7 +221,7 @@ class NodeEditDialog(QDialog):
         layout = QVBoxLayout()
         form = QFormLayout()
         
-        attrs = graph.nodes[node_id]
+        attrs = node_attributes(graph, node_id)
         
         self.name_edit = QLineEdit(attrs.get('name', node_id))
         form.addRow("Name:", self.name_edit)
@@ -240,7 +259,7 @@ class NodeEditDialog(QDialog):
         self.eng_spin = QDoubleSpinBox()
         self.eng_spin.setRange(0, 1)
         self.eng_spin.setSingleStep(0.001)
-        self.eng_spin.setValue(float(attrs.get('eng_rate', 0)))
+        self.eng_spin.setValue(float(attrs.get('eng_rate') or 0))
         self.eng_spin.setSuffix(" %")
         form.addRow("Engagement:", self.eng_spin)
         
@@ -260,13 +279,14 @@ class NodeEditDialog(QDialog):
     
     def _save(self):
         """Save edited properties to graph."""
-        self.graph.nodes[self.node_id]['name'] = self.name_edit.text()
-        self.graph.nodes[self.node_id]['platform'] = self.platform_combo.currentText()
-        self.graph.nodes[self.node_id]['followers'] = self.followers_spin.value()
-        self.graph.nodes[self.node_id]['cost'] = self.cost_spin.value()
-        self.graph.nodes[self.node_id]['risk'] = self.risk_spin.value()
-        self.graph.nodes[self.node_id]['fake'] = self.fake_spin.value()
-        self.graph.nodes[self.node_id]['eng_rate'] = self.eng_spin.value()
+        set_node_attributes(self.graph, self.node_id,
+                            name=self.name_edit.text(),
+                            platform=self.platform_combo.currentText(),
+                            followers=self.followers_spin.value(),
+                            cost=self.cost_spin.value(),
+                            risk=self.risk_spin.value(),
+                            fake=self.fake_spin.value(),
+                            eng_rate=self.eng_spin.value())
         self.accept()
 
 
@@ -303,6 +323,10 @@ class NetworkView(QGraphicsView):
         self._animation_timer = QTimer()
         self._animation_timer.timeout.connect(self._animate_reach)
         self._animation_step = 0
+        
+        # Incremental totals for hand-picked selections (built on first toggle)
+        self.reach_hops = 1
+        self._evaluator = None
     
     def wheelEvent(self, event):
         """Handle mouse wheel for zooming."""
@@ -331,28 +355,52 @@ class NetworkView(QGraphicsView):
         self._layout_and_draw()
     
     def load_users(self, users_csv: str):
-        """Load users from CSV."""
+        """Load users from CSV, replacing the current graph."""
+        users = read_users(users_csv)
         self.graph.clear()
-        with open(users_csv, newline='', encoding='utf-8') as f:
-            r = csv.DictReader(f)
-            for row in r:
-                node_id = row['id']
-                row['followers'] = int(row.get('followers', 0))
-                row['cost'] = float(row.get('cost', 0))
-                row['risk'] = float(row.get('risk', 0))
-                row['fake'] = float(row.get('fake', 0))
-                row['eng_rate'] = float(row.get('eng_rate', 0))
-                self.graph.add_node(node_id, **row)
+        add_users(self.graph, users)
     
     def load_edges(self, edges_csv: str):
         """Load edges from CSV."""
-        with open(edges_csv, newline='', encoding='utf-8') as f:
-            r = csv.DictReader(f)
-            for row in r:
-                weight = float(row.get('weight', 1.0))
-                prob = float(row.get('prob', 1.0))
-                self.graph.add_edge(row['source'], row['target'], 
-                                   weight=weight, prob=prob)
+        add_edges(self.graph, read_edges(edges_csv))
+    
+    def load_dataset(self, users_csv: str, edges_csv: Optional[str] = None, lazy: bool = False):
+        """Load users and edges, replacing the current graph.
+
+        By default this goes through the compiled cache; `lazy` parses only the
+        columns needed to draw and solve and reads the others on demand.
+        """
+        graph = load_graph_lazy(users_csv, edges_csv) if lazy else load_graph_cached(users_csv, edges_csv)
+        self.graph.clear()
+        self.graph.update(graph)
+    
+    def apply_delta(self, users_csv: Optional[str] = None, edges_csv: Optional[str] = None) -> DeltaReport:
+        """Patch the loaded graph from delta CSVs, keeping the current layout.
+
+        New nodes are placed at the centroid of their already placed neighbors
+        (or at random) instead of re-running the layout; the manual selection is kept.
+        """
+        report = apply_delta(self.graph, users_csv, edges_csv)
+        if not report:
+            return report
+        selected = {n for n, item in self.node_items.items() if item.is_selected_influencer and n in self.graph}
+        for n in report.removed:
+            self.pos.pop(n, None)
+        rng = np.random.default_rng()
+        for n in self.graph.nodes():
+            if n in self.pos:
+                continue
+            placed = [self.pos[v] for v in self.graph[n] if v in self.pos]
+            if placed:
+                self.pos[n] = np.mean(placed, axis=0) + rng.normal(0.0, 0.05, 2)
+            else:
+                self.pos[n] = rng.uniform(-1.0, 1.0, 2)
+        self._evaluator = None
+        self._draw()
+        for n in selected:
+            self.node_items[n].is_selected_influencer = True
+            self.node_items[n]._update_appearance()
+        return report
     
     def load_session(self, session: dict):
         """Load graph from session dictionary."""
@@ -373,7 +421,20 @@ class NetworkView(QGraphicsView):
         if len(self.graph) == 0:
             return
         
-        pos = nx.spring_layout(self.graph, k=2, iterations=50)  # Better layout
+        # Drop the filter and reach indexes whenever the data may have changed;
+        # they are rebuilt on first use (after any deferred attributes are read)
+        self.graph.graph.pop('attribute_index', None)
+        self.graph.graph.pop('reach_index', None)
+        self._evaluator = None
+        
+        self.pos = nx.spring_layout(self.graph, k=2, iterations=50)  # Better layout
+        self._draw()
+    
+    def _draw(self) -> None:
+        """Draw the graph at the positions in `self.pos`."""
+        self.scene().clear()
+        self.node_items.clear()
+        pos = self.pos
         scale = 500
         
         # Draw edges first
@@ -398,7 +459,7 @@ class NetworkView(QGraphicsView):
         
         # Draw nodes with better sizing and coloring
         for n, p in pos.items():
-            attrs = self.graph.nodes[n]
+            attrs = _drawn_attributes(self.graph, n)
             
             # Size based on followers (logarithmic)
             followers = attrs.get('followers', 1000)
@@ -434,12 +495,34 @@ class NetworkView(QGraphicsView):
             item.is_selected_influencer = n in selected_ids
             item.is_reached = reached_ids and n in reached_ids
             item._update_appearance()
+        if self._evaluator is not None:
+            self._evaluator.reset(selected_ids)
         
         # Start animation for reach propagation
         if reached_ids:
             self._animation_step = 0
             self._animation_timer.start(100)
     
+    def manual_evaluator(self) -> IncrementalEvaluator:
+        """Running totals of the highlighted selection, for the current reach depth."""
+        if self._evaluator is None or self._evaluator.graph is not self.graph \
+                or self._evaluator.index.hops != self.reach_hops or self._evaluator.index.size != len(self.graph):
+            self._evaluator = IncrementalEvaluator(self.graph, hops=self.reach_hops)
+            self._evaluator.reset(n for n, item in self.node_items.items() if item.is_selected_influencer)
+        return self._evaluator
+    
+    def toggle_node(self, node_id: str):
+        """Add or remove one influencer by hand, repainting only the nodes whose reach changed."""
+        ev = self.manual_evaluator()
+        selected, changed = ev.toggle(node_id)
+        for n in [node_id] + changed:
+            item = self.node_items.get(n)
+            if item is not None:
+                item.is_selected_influencer = n in ev.selected
+                item.is_reached = ev.is_reached(n)
+                item._update_appearance()
+        self.selectionChanged.emit(set(ev.selected))
+    
     def _animate_reach(self):
         """Animate the reach propagation effect."""
         self._animation_step += 1
@@ -1,47 +1,75 @@
 """Worker to run optimizer in background thread with cancel support."""
 from PyQt5.QtCore import QThread, pyqtSignal
 from core.optimizer import Optimizer
+from core.attribute_index import get_attribute_index
+from core.data_models import get_influencer_table
+from core.reach_index import get_reach_index
 
 
-class SolveWorker(QThread):
-    progress = pyqtSignal(int)
-    finished = pyqtSignal(dict)
+class GraphWorker(QThread):
+    """Base of the optimizer workers: resolves the graph's caches in the constructor.
+
+    Building the attribute index, influencer table and reach index stores them on
+    `graph.graph`, so that happens here, on the GUI thread; `run` only reads
+    them, and several workers can share one graph.
+    """
 
     def __init__(self, graph, params: dict):
         super().__init__()
         self.graph = graph
         self.params = params
+        self.hops = int(params.get('hops', 1))
+        self.candidates = get_attribute_index(graph).candidates(params)
+        self.table = get_influencer_table(graph)
+        self.reach = get_reach_index(graph, self.hops)
+
+    def optimizer(self) -> Optimizer:
+        """An optimizer over the caches resolved in the constructor."""
+        return Optimizer(self.graph, candidates=self.candidates, hops=self.hops, table=self.table, reach=self.reach)
+
+
+class SolveWorker(GraphWorker):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(dict)
+
+    def __init__(self, graph, params: dict):
+        super().__init__(graph, params)
         self._cancel = False
+        # Created up front so a cancel arriving before `run` always reaches it
+        self._opt = self.optimizer()
 
     def run(self) -> None:
-        opt = Optimizer(self.graph)
+        opt = self._opt
         # simple progress simulation for greedy fallback
         self.progress.emit(10)
+        # Optimizer.solve clears its cancel flag, so a cancel that came earlier is handled here
+        if self._cancel:
+            self.finished.emit({'selected': [], 'cancelled': True})
+            return
+        res = opt.solve(self.params.get('budget', 0), self.params.get('risk_max', 1.0), self.params.get('coverage', 0.0),
+                        time_limit=self.params.get('time_limit', 60), starts=self.params.get('starts'),
+                        restarts=self.params.get('restarts', 1), portfolio=self.params.get('portfolio', False),
+                        lazy_reach=self.params.get('lazy_reach'))
         if self._cancel:
-            self.finished.emit({'selected': []})
+            self.finished.emit({'selected': [], 'cancelled': True})
             return
-        res = opt.solve(self.params.get('budget', 0), self.params.get('risk_max', 1.0), self.params.get('coverage', 0.0))
         # compute simple summary: total cost, reached followers estimate and ROI
         selected = res.get('selected', [])
-        total_cost = sum(float(self.graph.nodes[n].get('cost', 0.0)) for n in selected)
-        # estimate reach as selected + one-hop neighbors
-        reached = set(selected)
-        for n in selected:
-            for v in self.graph.neighbors(n):
-                reached.add(v)
-        total_followers = sum(int(self.graph.nodes[n].get('followers', 0)) for n in reached)
+        table = self.table
+        total_cost = float(table.values('cost', selected).sum())
+        # estimate reach as selected + everything within `hops`
+        reached = self.reach.reached(selected)
+        followers = table.values('followers', reached)
+        total_followers = int(followers.astype('int64').sum())
         # expected conversions using eng_rate per user
-        expected_conversions = 0.0
-        for n in reached:
-            er = self.graph.nodes[n].get('eng_rate')
-            if er:
-                expected_conversions += float(self.graph.nodes[n].get('followers', 0)) * float(er)
+        expected_conversions = float((followers * table.values('eng_rate', reached)).sum())
         conv_value = float(self.params.get('conv_value', 0.0))
         roi = conv_value * expected_conversions - total_cost
 
         res.update({
             'total_cost': total_cost,
             'reached_followers': total_followers,
+            'hops': self.hops,
             'expected_conversions': expected_conversions,
             'roi': roi,
         })
@@ -49,4 +77,32 @@ class SolveWorker(QThread):
         self.finished.emit(res)
 
     def cancel(self) -> None:
-        self._cancel = True
\ No newline at end of file
+        self._cancel = True
+        self._opt.cancel()
+
+
+class PrecheckWorker(GraphWorker):
+    """Compute cheap feasibility bounds for the current constraints off the GUI thread."""
+    finished = pyqtSignal(dict)
+
+    def run(self) -> None:
+        try:
+            opt = self.optimizer()
+            res = opt.precheck(self.params.get('budget', 0), self.params.get('risk_max', 1.0), self.params.get('coverage', 0.0))
+        except Exception as e:
+            res = {'status': 'error', 'error': str(e)}
+        self.finished.emit(res)
+
+
+class SensitivityWorker(GraphWorker):
+    """Solve the LP relaxation behind the sensitivity report off the GUI thread."""
+    finished = pyqtSignal(dict)
+
+    def run(self) -> None:
+        try:
+            opt = self.optimizer()
+            res = opt.sensitivity(self.params.get('budget', 0), self.params.get('risk_max', 1.0),
+                                  self.params.get('coverage', 0.0))
+        except Exception as e:
+            res = {'backend': None, 'status': f"error: {e}", 'objective': None, 'duals': {}, 'ranges': {}}
+        self.finished.emit(res)
@@ -2,6 +2,8 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTreeWidget, QTreeWidgetItem, QLabel, QSlider
 from PyQt5.QtCore import Qt
 
+from core.attribute_index import AGE_LABELS
+
 
 class AudienceFilter(QWidget):
     def __init__(self, parent=None):
@@ -12,7 +14,7 @@ class AudienceFilter(QWidget):
         self.tree.setHeaderHidden(True)
         # Age groups
         ages = QTreeWidgetItem(self.tree, ["Age"])
-        for a in ["18-24", "25-34", "35-44", "45+"]:
+        for a in AGE_LABELS:
             item = QTreeWidgetItem(ages, [a])
             item.setCheckState(0, Qt.Checked)
         regions = QTreeWidgetItem(self.tree, ["Region"])
@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture
+def write_file(tmp_path):
+    """Write text (UTF-8, newlines as given) to a file in `tmp_path`; returns its path."""
+    def write(name, text):
+        p = tmp_path / name
+        p.write_bytes(text.encode('utf-8'))
+        return str(p)
+    return write
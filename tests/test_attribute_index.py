@@ -0,0 +1,41 @@
+import networkx as nx
+from core.attribute_index import AttributeIndex, get_attribute_index
+from core.optimizer import Optimizer
+
+
+def _graph():
+    G = nx.Graph()
+    G.add_node('a', platform='IG', region='NA', gender='F', age=25, fake=0.02, risk=0.05, cost=10, followers=1000)
+    G.add_node('b', platform='TT', region='EU', gender='M', age=40, fake=0.4, risk=0.25, cost=10, followers=5000)
+    G.add_node('c', platform='IG', region='AS', gender='M', age=19, fake=0.1, risk=0.15, cost=10, followers=3000)
+    G.add_node('d', platform='YT', cost=10, followers=100)  # missing demographics
+    G.add_edge('a', 'b')
+    return G
+
+
+def test_filters_combine_and_missing_passes():
+    idx = AttributeIndex(_graph())
+    params = {'platforms': {'IG': True, 'TT': False, 'YT': True, 'TW': True},
+              'audience': {'age': ['18-24', '25-34'], 'region': ['NA', 'EU', 'AS'], 'gender': ['M', 'F']}}
+    assert sorted(idx.candidates(params)) == ['a', 'c', 'd']
+    assert idx.candidates({'audience': {'gender': ['M']}, 'fake_bands': ['clean', 'suspect']}) == ['c', 'd']
+
+
+def test_under_age_bucket_is_a_panel_choice():
+    from PyQt5.QtWidgets import QApplication
+    from gui.widgets.audience_filter import AudienceFilter
+    app = QApplication.instance() or QApplication([])
+    G = _graph()
+    G.add_node('e', platform='IG', age=16, cost=10, followers=10)
+    # The default (all boxes checked) audience keeps under-18 influencers
+    ages = AudienceFilter().selected_filters()['age']
+    assert '<18' in ages
+    assert 'e' in AttributeIndex(G).candidates({'audience': {'age': ages}})
+    assert 'e' not in AttributeIndex(G).candidates({'audience': {'age': ['18-24']}})
+
+
+def test_candidates_restrict_solver():
+    G = _graph()
+    cands = get_attribute_index(G).candidates({'platforms': {'IG': False, 'TT': True, 'YT': False}})
+    sel = Optimizer(G, candidates=cands).greedy_seed(budget=100)
+    assert sel == ['b']
@@ -0,0 +1,48 @@
+from core.catalog import InfluencerCatalog
+from core.ingest import load_graph
+from core.lazy_attributes import node_attributes
+
+
+HEADER = "id,name,platform,followers,cost,risk,fake,age,region,gender,eng_rate\n"
+ROWS = {
+    'a': "a,Ann,TT,5000,10,0.1,0.0,31,EU,F,0.02\n",
+    'b': "b,,IG,200,2,0.3,,,,,\n",
+    'c': "c,Cy,TT,90000,50,0.05,0.2,45,US,M,\n",
+    'd': "d,Di,TT,100,1,0.0,0.0,22,US,F,0.1\n",
+}
+EDGES = "source,target,weight,prob\na,b,0.5,0.9\na,c,1,0.4\nc,d,,\nd,x,1,1\n"
+
+
+def test_query_matches_prefiltered_csv(tmp_path, write_file):
+    users = write_file('u.csv', HEADER + ''.join(ROWS.values()))
+    edges = write_file('e.csv', EDGES)
+    with InfluencerCatalog(str(tmp_path / 'catalog.db')) as catalog:
+        assert catalog.import_csv(users, edges, chunksize=2) == (4, 4)
+        assert len(catalog) == 4 and catalog.platforms() == ['IG', 'TT']
+        assert catalog.count(platforms=['TT'], min_followers=1000) == 2
+
+        G = catalog.load_graph(platforms=['TT'], min_followers=1000)
+        expected = load_graph(write_file('fu.csv', HEADER + ROWS['a'] + ROWS['c']),
+                              write_file('fe.csv', "source,target,weight,prob\na,c,1,0.4\n"))
+        assert dict(G.nodes(data=True)) == dict(expected.nodes(data=True))
+        assert list(G.edges(data=True)) == list(expected.edges(data=True))
+        assert list(G.graph['influencer_table'].values('cost')) == [10.0, 50.0]
+
+        # a missing region passes a region filter; risk and follower bounds are inclusive
+        snap = catalog.query(regions=['EU'], max_risk=0.3, max_followers=5000)
+        assert list(snap.ids) == ['a', 'b']
+        assert snap.edges[['source', 'target']].values.tolist() == [['a', 'b']]
+
+
+def test_reimport_replaces_rows(tmp_path, write_file):
+    with InfluencerCatalog(str(tmp_path / 'catalog.db')) as catalog:
+        catalog.import_csv(write_file('u.csv', HEADER + ROWS['a'] + ROWS['b']),
+                           write_file('e.csv', "source,target,prob\na,b,0.9\n"))
+        catalog.import_csv(write_file('u2.csv', "id,cost,platform\na,99,YT\n"),
+                           write_file('e2.csv', "source,target,prob\na,b,0.1\n"))
+        G = catalog.load_graph()
+        assert len(catalog) == 2 and G.number_of_edges() == 1
+        assert list(G.nodes()) == ['b', 'a']
+        a = node_attributes(G, 'a')
+        assert a['cost'] == 99.0 and a['platform'] == 'YT'
+        assert G.edges['a', 'b']['prob'] == 0.1
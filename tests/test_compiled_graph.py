@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+
+from core.compiled_graph import open_compiled, load_graph_cached
+from core.ingest import load_graph
+
+
+USERS = ("id,name,platform,followers,cost,risk,fake,age,region,gender,eng_rate\n"
+         "a,Ann,TT,100,10,0.1,0.0,31,NA,F,0.02\n"
+         "b,,,,,,,,,,\n")
+EDGES = "source,target,weight,prob,delay_hours\na,b,0.5,0.9,24\nb,c,,,\n"
+
+
+def test_compiled_graph_round_trips(tmp_path, write_file):
+    users = write_file('u.csv', USERS)
+    edges = write_file('e.csv', EDGES)
+    cache = str(tmp_path / 'cache')
+    G = load_graph_cached(users, edges, cache_dir=cache)
+    expected = load_graph(users, edges)
+    assert dict(G.nodes(data=True)) == dict(expected.nodes(data=True))
+    assert {frozenset(e[:2]): e[2] for e in G.edges(data=True)} == \
+        {frozenset(e[:2]): e[2] for e in expected.edges(data=True)}
+
+    compiled = open_compiled(users, edges, cache_dir=cache)
+    indptr, indices, prob = compiled.csr()
+    assert isinstance(indices, np.memmap)
+    assert list(indptr) == [0, 1, 3, 4]
+    assert list(compiled.column('platform')) == ['TT', 'IG']
+
+
+def test_compiled_graph_is_reused_and_invalidated(tmp_path, write_file):
+    users = write_file('u.csv', USERS)
+    edges = write_file('e.csv', EDGES)
+    cache = str(tmp_path / 'cache')
+    open_compiled(users, edges, cache_dir=cache)
+    stamp = os.stat(os.path.join(cache, 'indptr.npy')).st_mtime_ns
+
+    # Touching a file without changing it keeps the compiled arrays
+    os.utime(edges, ns=(stamp + 10**9, stamp + 10**9))
+    open_compiled(users, edges, cache_dir=cache)
+    assert os.stat(os.path.join(cache, 'indptr.npy')).st_mtime_ns == stamp
+
+    write_file('e.csv', EDGES + "a,c,1,0.5,\n")
+    G = open_compiled(users, edges, cache_dir=cache).to_networkx()
+    assert G.has_edge('a', 'c')
+
+
+def test_unwritable_cache_falls_back_to_parsing(tmp_path, write_file, caplog):
+    users = write_file('u.csv', USERS)
+    edges = write_file('e.csv', EDGES)
+    blocker = write_file('blocker', "")
+    G = load_graph_cached(users, edges, cache_dir=os.path.join(blocker, 'cache'))
+    expected = load_graph(users, edges)
+    assert dict(G.nodes(data=True)) == dict(expected.nodes(data=True))
+    assert list(G.edges(data=True)) == list(expected.edges(data=True))
+    assert 'Cannot write the compiled graph cache' in caplog.text
@@ -13,3 +13,23 @@ def test_as_dict_contains_keys(app):
     cp = ConstraintPanel()
     d = cp.as_dict()
     assert 'budget' in d and 'risk_max' in d and 'coverage' in d and 'platforms' in d and 'conv_value' in d
+
+
+def test_live_mode_debounces_changes(app):
+    cp = ConstraintPanel()
+    cp.budget.setValue(1234)
+    assert not cp._live_timer.isActive()
+    cp.live_check.setChecked(True)
+    cp.budget.setValue(2345)
+    assert cp._live_timer.isActive()
+    cp.live_check.setChecked(False)
+    assert not cp._live_timer.isActive()
+
+
+def test_precheck_error_replaces_previous_result(app):
+    cp = ConstraintPanel()
+    cp._on_precheck_finished({'status': 'infeasible', 'target': 0.9, 'coverage_upper': 0.5})
+    assert '#e74c3c' in cp.coverage_status.indicator.styleSheet()
+    cp._on_precheck_finished({'status': 'error', 'error': 'no graph'})
+    assert '#3498db' in cp.coverage_status.indicator.styleSheet()
+    assert 'no graph' in cp.info_label.text()
@@ -10,3 +10,52 @@ def test_user_dataclass():
 def test_campaign():
     c = Campaign('c', 10000, 0.1, 0.8, 1.0)
     assert c.budget == 10000
+
+
+def test_influencer_table_columns():
+    import networkx as nx
+    from core.data_models import get_influencer_table
+    G = nx.Graph()
+    G.add_node('a', name='Ann', platform='TT', followers=100, cost=10.0, risk=0.1, fake=0.0, region='NA')
+    G.add_node('b', platform='IG', followers=50, cost=5.0, risk=0.2, fake=0.1, eng_rate=None)
+    G.add_edge('a', 'c')
+    t = get_influencer_table(G)
+    assert get_influencer_table(G) is t
+    assert list(t.values('cost')) == [10.0, 5.0, 0.0]
+    assert list(t.labels('platform', ['c', 'a'])) == [None, 'TT']
+    assert t.codes['region'].tolist() == [0, -1, -1]
+    assert t.user('a') == User('a', 'Ann', 'TT', 100, 10.0, 0.1, 0.0, region='NA')
+    t.update('b', platform='YT', cost=7.0)
+    assert t.mapping('platform', ['b']) == {'b': 'YT'}
+    assert t.user('b').cost == 7.0
+    G.add_node('d', cost=2.0)
+    assert get_influencer_table(G) is t and t.mapping('cost', ['d']) == {'d': 2.0}
+    G.remove_node('b')
+    assert get_influencer_table(G) is t and list(t.ids) == ['a', 'c', 'd']
+
+
+def test_influencer_table_from_frame_matches_graph():
+    import pandas as pd
+    from core.data_models import InfluencerTable
+    users = pd.DataFrame({'id': ['a', 'b'], 'name': ['Ann', None], 'platform': ['TT', 'IG'],
+                          'followers': [100, 50], 'cost': [10.0, 5.0], 'age': pd.array([31, None], dtype='Int64')})
+    t = InfluencerTable.from_frame(users, ['b', 'a', 'x'])
+    assert list(t.labels('platform')) == ['IG', 'TT', None]
+    assert list(t.values('followers')) == [50.0, 100.0, 0.0]
+    assert t.user('a').age == 31 and t.user('b').name == 'b'
+
+
+def test_set_node_attributes_keeps_the_table_in_step():
+    import networkx as nx
+    import pandas as pd
+    from core.data_models import InfluencerTable, set_node_attributes
+    G = nx.Graph()
+    G.add_nodes_from(['a', 'b'])
+    G.graph['influencer_table'] = InfluencerTable.from_frame(pd.DataFrame({'id': ['a', 'b'], 'cost': [1.0, 2.0]}))
+    set_node_attributes(G, 'a', cost=5.0, platform='TT', handle='@a')
+    G.add_node('c')
+    set_node_attributes(G, 'c', cost=3.0)
+    t = G.graph['influencer_table']
+    assert t.mapping('cost', ['a', 'b', 'c']) == {'a': 5.0, 'b': 2.0, 'c': 3.0}
+    assert t.record('a') == {'platform': 'TT', 'cost': 5.0}
+    assert G.nodes['a'] == {'handle': '@a'} and G.nodes['c'] == {}
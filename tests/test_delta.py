@@ -0,0 +1,81 @@
+import pytest
+
+from core.attribute_index import AttributeIndex, get_attribute_index
+from core.data_models import get_influencer_table
+from core.delta import apply_delta, read_user_delta
+from core.ingest import IngestError, load_graph
+from core.lazy_attributes import node_attributes
+from core.reach_index import ReachIndex, get_reach_index
+
+
+def _base(write_file):
+    users = write_file('u.csv', "id,name,platform,followers,cost,risk,region\n"
+                                "a,Ann,IG,100,10,0.1,NA\nb,Bob,TT,50,5,0.2,EU\n"
+                                "c,Cid,YT,20,2,0.0,EU\nd,Dee,IG,10,1,0.0,NA\n")
+    edges = write_file('e.csv', "source,target,prob\na,b,0.5\nb,c,0.5\nc,d,0.5\n")
+    return load_graph(users, edges)
+
+
+def _rows(index):
+    return {index.nodes[i]: sorted(index.nodes[j] for j in index.indices[index.indptr[i]:index.indptr[i + 1]])
+            for i in range(index.size)}
+
+
+def test_delta_patches_graph_and_reports_changes(write_file):
+    G = _base(write_file)
+    users = write_file('ud.csv', "op,id,name,cost,followers\n"
+                                 ",a,,12,\nupsert,e,Eve,3,70\ndelete,d,,,\nupsert,b,,5,\n")
+    edges = write_file('ed.csv', "op,source,target,prob\n"
+                                 "upsert,e,a,0.9\ndelete,b,c,\nupsert,a,b,0.75\nupsert,c,f,\n")
+    report = apply_delta(G, users, edges)
+    assert report.added == ['e', 'f']
+    assert report.updated == ['a']
+    assert report.removed == ['d']
+    assert report.edges_removed == [('d', 'c'), ('b', 'c')]
+    assert report.edges_added == [('e', 'a'), ('c', 'f')]
+    assert report.edges_updated == [('a', 'b')]
+    assert report.changed == {'a', 'b', 'c', 'd', 'e', 'f'}
+    assert node_attributes(G, 'a')['cost'] == 12.0 and node_attributes(G, 'a')['name'] == 'Ann'
+    assert node_attributes(G, 'e') == {'name': 'Eve', 'platform': 'IG', 'followers': 70, 'cost': 3.0, 'risk': 0.0,
+                                       'fake': 0.0}
+    assert G.nodes['e'] == {} and node_attributes(G, 'f') == {}
+    assert G.edges['c', 'f'] == {'weight': 1.0, 'prob': 1.0}
+    assert 'd' not in G and not G.has_edge('b', 'c')
+
+
+@pytest.mark.parametrize('hops', [1, 2])
+def test_delta_patches_cached_indexes(write_file, hops):
+    G = _base(write_file)
+    table = get_influencer_table(G)
+    attrs = get_attribute_index(G)
+    reach = get_reach_index(G, hops)
+    users = write_file('ud.csv', "op,id,platform,risk,cost\n,c,TT,0.25,\nupsert,e,YT,,4\ndelete,a,,,\n")
+    edges = write_file('ed.csv', "op,source,target,prob\nupsert,e,b,0.9\nupsert,d,g,0.5\ndelete,c,d,\n")
+    apply_delta(G, users, edges)
+    # The same dataset loaded from scratch
+    expected = load_graph(write_file('u2.csv', "id,name,platform,followers,cost,risk,region\n"
+                                               "b,Bob,TT,50,5,0.2,EU\nc,Cid,TT,20,2,0.25,EU\n"
+                                               "d,Dee,IG,10,1,0.0,NA\ne,,YT,,4,,\n"),
+                          write_file('e2.csv', "source,target,prob\nb,c,0.5\ne,b,0.9\nd,g,0.5\n"))
+
+    assert get_influencer_table(G) is table
+    fresh = get_influencer_table(expected)
+    assert list(fresh.ids) == list(G.nodes())
+    for col in ('cost', 'risk', 'followers'):
+        assert table.mapping(col, G.nodes()) == fresh.mapping(col, G.nodes())
+    assert table.mapping('platform', G.nodes()) == fresh.mapping('platform', G.nodes())
+
+    assert get_attribute_index(G) is attrs
+    rebuilt = AttributeIndex(expected)
+    assert attrs.nodes == rebuilt.nodes
+    for params in ({'platforms': ['TT']}, {'platforms': ['YT', 'IG']}, {'risk_bands': ['high']},
+                   {'audience': {'region': ['EU']}}):
+        assert attrs.candidates(params) == rebuilt.candidates(params)
+
+    assert get_reach_index(G, hops) is reach
+    assert _rows(reach) == _rows(ReachIndex(G, hops))
+
+
+def test_invalid_delta_op(write_file):
+    with pytest.raises(IngestError, match='unknown op'):
+        read_user_delta(write_file('ud.csv', "op,id\nmerge,a\n"))
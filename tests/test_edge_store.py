@@ -0,0 +1,45 @@
+import numpy as np
+
+from core.edge_store import build_edge_store
+from core.ingest import load_graph
+from core.optimizer import Optimizer
+
+
+def _dataset(write_file):
+    users = write_file('u.csv', "id,followers,cost,risk\n"
+                                "hub,100,10,0.1\na,10,1,0.0\nb,20,1,0.0\nc,30,1,0.0\nd,40,5,0.0\n")
+    edges = write_file('e.csv', "source,target,prob\n"
+                                "hub,a,0.5\nhub,b,0.5\nc,hub,0.5\nd,e,1.0\nd,e,0.25\nd,d,1.0\n")
+    return users, edges
+
+
+def test_store_rows_match_graph(tmp_path, write_file):
+    users, edges = _dataset(write_file)
+    store = build_edge_store(edges, str(tmp_path / 'store'), users, chunk_entries=2, chunksize=2)
+    G = load_graph(users, edges)
+    ids = [str(i) for i in store.ids]
+    assert ids == ['hub', 'a', 'b', 'c', 'd', 'e']
+    assert len(store.manifest['chunks']) > 1
+    assert [ids[i] for i in store.order[:1]] == ['hub']  # highest degree first
+    rows = {}
+    for r_nodes, indptr, indices, prob in store.chunks():
+        for r, i in enumerate(r_nodes):
+            rows[ids[i]] = {ids[j]: float(p) for j, p in zip(indices[indptr[r]:indptr[r + 1]], prob[indptr[r]:indptr[r + 1]])}
+    assert rows == {n: {v: d['prob'] for v, d in G[n].items() if v != n} for n in G}
+    assert list(store.coverage_scores()) == [4, 2, 2, 2, 2, 2]
+
+
+def test_streaming_analyses(tmp_path, write_file):
+    users, edges = _dataset(write_file)
+    store = build_edge_store(edges, str(tmp_path / 'store'), users, chunk_entries=2, chunksize=2)
+    G = load_graph(users, edges)
+    assert store.coverage(['hub', 'd']) == Optimizer(G).evaluate(['hub', 'd'], 100, 1)['covered'] == 6
+    followers = store.column('followers')
+    assert store.coverage(['hub'], followers) == 160
+    assert store.greedy(budget=10, risk_max=1.0, weight=followers, candidates=['hub', 'd']) == ['hub']
+    # hub exceeds the risk limit; the rest go by reach gain per unit of cost
+    assert store.greedy(budget=100, risk_max=0.05, weight=followers,
+                        candidates=['hub', 'a', 'b', 'c', 'd']) == ['c', 'b', 'a', 'd']
+    runs = store.monte_carlo(['d'], trials=20, seed=1)
+    assert runs == [40.0] * 20  # e has no users row, so it adds no followers
+    assert np.mean(store.monte_carlo(['hub'], trials=200, seed=1)) > 100
@@ -19,3 +19,15 @@ def test_export_pptx_skips_if_no_lib(tmp_path):
     except RuntimeError:
         pytest.skip("python-pptx not available")
     assert p.exists()
+
+
+def test_export_csv_with_table_columns(tmp_path):
+    import networkx as nx
+    from core.data_models import get_influencer_table
+    G = nx.Graph()
+    G.add_node('a', name='Ann', platform='TT', followers=100, cost=10.0, risk=0.1, fake=0.0, eng_rate=0.02)
+    G.add_node('b', name='Bob', platform='IG', followers=50, cost=5.0, risk=0.2, fake=0.1)
+    p = tmp_path / "sel.csv"
+    export_selection_csv(str(p), ['b', 'a'], table=get_influencer_table(G), columns=('name', 'platform', 'followers', 'eng_rate'))
+    assert p.read_text(encoding='utf-8').splitlines() == ['id,name,platform,followers,eng_rate',
+                                                          'b,Bob,IG,50,', 'a,Ann,TT,100,0.02']
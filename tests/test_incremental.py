@@ -0,0 +1,33 @@
+import networkx as nx
+
+from core.incremental import IncrementalEvaluator
+
+
+def _graph():
+    G = nx.star_graph(3)  # hub 0 with leaves 1..3
+    G.add_edge(3, 4)
+    for n in G.nodes():
+        G.nodes[n].update(cost=10, risk=0.1, followers=100 * (n + 1), eng_rate=0.1)
+    return G
+
+
+def test_toggle_updates_totals_incrementally():
+    ev = IncrementalEvaluator(_graph())
+    selected, changed = ev.toggle(0)
+    assert selected and sorted(changed) == [0, 1, 2, 3]
+    assert ev.toggle(3) == (True, [4])
+    assert ev.summary(conv_value=2.0) == {
+        'selected': [0, 3], 'total_cost': 20.0, 'total_risk': 0.2, 'covered': 5,
+        'reached_followers': 1500, 'expected_conversions': 150.0, 'roi': 280.0}
+    assert sorted(ev.remove(0)) == [1, 2]
+    assert ev.covered == 3 and ev.reached_followers == 1000
+
+
+def test_best_next_tracks_removals_and_budget():
+    ev = IncrementalEvaluator(_graph())
+    assert ev.best_next() == (0, 1000.0)
+    ev.add(0)
+    assert ev.best_next()[1] == 500.0  # node 4, directly or via 3
+    assert ev.best_next(budget=15) is None
+    ev.remove(0)
+    assert ev.best_next() == (0, 1000.0)
@@ -0,0 +1,107 @@
+import pytest
+
+from core.data_models import set_node_attributes
+from core.graph_builder import build_graph_from_csv
+from core.ingest import IngestError, load_snapshot, read_users
+from core.lazy_attributes import node_attributes
+
+
+def test_missing_values_are_normalised(write_file):
+    users = write_file('u.csv', "id,name,platform,followers,cost,risk,fake,age,region,gender,eng_rate\n"
+                                "a,Ann,TT,100,10,0.1,0.0,31,NA,F,0.02\n"
+                                "b,,,,,,,,,,\n")
+    edges = write_file('e.csv', "source,target,weight,prob\na,b,0.5,0.9\nb,c,,\n")
+    G = build_graph_from_csv(users, edges)
+    assert node_attributes(G, 'a') == {'name': 'Ann', 'platform': 'TT', 'followers': 100, 'cost': 10.0,
+                                       'risk': 0.1, 'fake': 0.0, 'age': 31, 'region': 'NA', 'gender': 'F',
+                                       'eng_rate': 0.02}
+    assert node_attributes(G, 'b') == {'name': 'b', 'platform': 'IG', 'followers': 0, 'cost': 0.0, 'risk': 0.0,
+                                       'fake': 0.0}
+    assert node_attributes(G, 'c') == {}  # only referenced by an edge
+    # The influencer table holds the users columns; node dicts do not copy them
+    assert G.nodes['a'] == {}
+    set_node_attributes(G, 'a', name='Annie', cost=12.0)
+    assert node_attributes(G, 'a')['name'] == 'Annie' and G.nodes['a'] == {}
+    assert G.edges['b', 'c'] == {'weight': 1.0, 'prob': 1.0}
+
+
+def test_snapshot_interns_edges_as_csr(write_file):
+    users = write_file('u.csv', "id,cost\na,1\nb,2\nc,3\n")
+    edges = write_file('e.csv', "source,target,prob\na,b,0.5\nc,a,0.25\n")
+    snap = load_snapshot(users, edges, chunksize=1)
+    assert list(snap.ids) == ['a', 'b', 'c']
+    indptr, indices, prob = snap.csr()
+    assert list(indptr) == [0, 2, 3, 4]
+    assert list(indices) == [1, 2, 0, 0]
+    assert list(prob) == [0.5, 0.25, 0.5, 0.25]
+
+
+def test_invalid_values_are_rejected(write_file):
+    with pytest.raises(IngestError, match='missing required column'):
+        read_users(write_file('u.csv', "name,cost\nAnn,1\n"))
+    with pytest.raises(IngestError, match='risk out of range'):
+        read_users(write_file('u.csv', "id,risk\na,1.5\n"))
+    with pytest.raises(IngestError):
+        read_users(write_file('u.csv', "id,cost\na,abc\n"))
+
+
+def test_parallel_edge_parsing_matches_serial(write_file):
+    from core.ingest import read_edges_parallel
+    users = write_file('u.csv', "id,cost\na,1\nb,2\n")
+    rows = ''.join(f"x{i % 7},{'ab'[i % 2]},0.5,{(i % 10) / 10}\n" for i in range(200)) + "b,y,,"
+    edges = write_file('e.csv', "source,target,weight,prob\n" + rows)
+    serial = load_snapshot(users, edges, workers=1)
+    parallel = load_snapshot(users, edges, workers=2)
+    assert list(parallel.ids) == list(serial.ids)
+    assert parallel.src.tolist() == serial.src.tolist() and parallel.dst.tolist() == serial.dst.tolist()
+    assert parallel.edges.equals(serial.edges)
+    # in-process range parsing, ranges far smaller than the file
+    endpoints, src, dst, values = read_edges_parallel(edges, workers=1, chunk_bytes=64)
+    assert list(endpoints[src]) == serial.edges['source'].tolist()
+    assert values['prob'].tolist() == serial.edges['prob'].tolist()
+    pooled = read_edges_parallel(edges, workers=2, chunk_bytes=256)
+    assert list(pooled[0]) == list(endpoints) and pooled[1].tolist() == src.tolist()
+
+
+def test_parallel_edge_parsing_reports_invalid_rows(write_file):
+    from core.ingest import read_edges_parallel
+    edges = write_file('e.csv', "source,target,prob\na,b,0.5\n" + "c,d,0.1\n" * 20 + "e,f,1.5\n")
+    with pytest.raises(IngestError, match='prob outside'):
+        read_edges_parallel(edges, workers=1, chunk_bytes=32)
+
+
+@pytest.mark.parametrize('module', ['gzip', 'bz2', 'lzma'])
+def test_compressed_inputs_match_plain(tmp_path, write_file, module):
+    import importlib
+    from core.ingest import compression, read_edges_parallel
+    opener = importlib.import_module(module).open
+    users_text = "id,name,cost,region\na,Ann,10,NA\nb,,2,\n"
+    edges_text = "source,target,prob\na,b,0.5\nb,c,\n"
+    plain = build_graph_from_csv(write_file('u.csv', users_text), write_file('e.csv', edges_text))
+    # Detection uses the leading bytes, not the extension
+    users, edges = str(tmp_path / 'uz.csv'), str(tmp_path / 'ez.dat')
+    for path, text in ((users, users_text), (edges, edges_text)):
+        with opener(path, 'wt', encoding='utf-8') as f:
+            f.write(text)
+    assert compression(users) == {'gzip': 'gzip', 'bz2': 'bz2', 'lzma': 'xz'}[module]
+    G = build_graph_from_csv(users, edges)
+    assert dict(G.nodes(data=True)) == dict(plain.nodes(data=True))
+    assert list(G.edges(data=True)) == list(plain.edges(data=True))
+    endpoints, src, dst, values = read_edges_parallel(edges, workers=2)
+    assert list(endpoints[src]) == ['a', 'b'] and values['prob'].tolist() == [0.5, 1.0]
+
+
+def test_truncated_or_unsupported_compression_is_rejected(tmp_path):
+    import gzip
+    data = gzip.compress(b"id,cost\n" + b"a,1\n" * 1000)
+    broken = tmp_path / 'u.csv.gz'
+    broken.write_bytes(data[:len(data) // 2])
+    with pytest.raises(IngestError):
+        read_users(str(broken))
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        zst = tmp_path / 'u.csv.zst'
+        zst.write_bytes(b'\x28\xb5\x2f\xfd' + b'\x00' * 16)
+        with pytest.raises(IngestError, match='optional package'):
+            read_users(str(zst))
@@ -0,0 +1,54 @@
+from core.attribute_index import get_attribute_index
+from core.data_models import get_influencer_table, set_node_attributes
+from core.ingest import load_graph
+from core.lazy_attributes import is_wide, line_spans, load_graph_lazy, node_attributes
+from core.optimizer import Optimizer
+from utils.exporters import export_selection_csv
+
+
+USERS = ("id,name,platform,followers,cost,risk,fake,age,region,gender,eng_rate,handle,tier,niche,score\r\n"
+         "a,Ann,TT,100,10,0.1,0.0,31,NA,F,0.02,@ann,gold,food,7\r\n"
+         "\r\n"
+         "b,,,,,,,,,,,,,,\r\n"
+         "c,Cy,YT,5,1,0.2,0.5,40,EU,M,0.1,@cy,silver,tech,3")
+EDGES = "source,target,prob\na,b,0.5\nb,c,0.9\nc,d,1\n"
+
+
+def test_line_spans_skip_header_and_blank_lines(write_file):
+    path = write_file('u.csv', "id\nx\n\ny\r\nz")
+    starts, ends = line_spans(path, block_bytes=3)
+    data = open(path, 'rb').read()
+    assert [data[s:e] for s, e in zip(starts, ends)] == [b'x', b'y', b'z']
+
+
+def test_lazy_graph_fetches_deferred_columns(tmp_path, write_file):
+    users, edges = write_file('u.csv', USERS), write_file('e.csv', EDGES)
+    full = load_graph(users, edges)
+    G = load_graph_lazy(users, edges)
+    assert is_wide(users)
+    assert get_influencer_table(G).record('a') == {'name': 'Ann', 'platform': 'TT', 'followers': 100, 'cost': 10.0,
+                                                   'risk': 0.1, 'fake': 0.0, 'eng_rate': 0.02}
+    assert list(G.edges()) == list(full.edges())
+    for n in full:
+        assert node_attributes(G, n) == node_attributes(full, n)
+
+    # Exporters read only the selected rows
+    out = tmp_path / 'sel.csv'
+    export_selection_csv(str(out), ['c', 'a'], table=get_influencer_table(G),
+                         columns=('name', 'region', 'eng_rate', 'handle'),
+                         deferred=G.graph['deferred_attributes'])
+    assert out.read_text(encoding='utf-8').splitlines() == ['id,name,region,eng_rate,handle',
+                                                            'c,Cy,EU,0.1,@cy', 'a,Ann,NA,0.02,@ann']
+
+    # Edited values win over the file
+    set_node_attributes(G, 'c', region='US')
+    assert node_attributes(G, 'c')['region'] == 'US'
+
+    # Filters read the audience columns from the file; nothing is loaded into the graph
+    index = get_attribute_index(G)
+    # Missing values pass (b has an empty row, d no row); c's edited region wins over the file
+    assert index.candidates({'audience': {'region': ['EU']}}) == ['b', 'd']
+    assert index.candidates({'audience': {'region': ['US'], 'gender': ['M'], 'age': ['35-44']}}) == ['b', 'c', 'd']
+    Optimizer(G)
+    assert 'deferred_attributes' in G.graph and G.nodes['a'] == {}
+    assert 'age' not in get_influencer_table(G).record('a')
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from core.ingest import IngestError
+from core.lazy_attributes import node_attributes
+from core.multi_source import load_merged_graph, merge_edges, read_identity
+
+
+HEADER = "id,name,platform,followers,cost,risk,fake,age,region,gender,eng_rate\n"
+
+
+def test_accounts_merge_into_creators(write_file):
+    ig = write_file('ig.csv', HEADER + "ig_ann,Ann,IG,1000,10,0.1,0.1,30,EU,F,0.02\nig_bob,Bob,IG,50,1,0,0,,,,\n")
+    tt = write_file('tt.csv', HEADER + "tt_ann,Annie,TT,3000,20,0.3,0.3,,,,0.06\ntt_cy,Cy,TT,10,1,0,0,,US,,\n")
+    identity = write_file('id.csv', "id,creator\nig_ann,ann\ntt_ann,ann\n")
+    edges = write_file('e.csv', "source,target,prob\nig_ann,ig_bob,0.5\ntt_ann,ig_bob,0.5\n"
+                                "ig_ann,tt_ann,1\ntt_cy,tt_ann,0.2\n")
+    G = load_merged_graph([ig, tt], identity, [edges])
+    assert list(G.nodes()) == ['ann', 'ig_bob', 'tt_cy']
+    ann = node_attributes(G, 'ann')
+    assert (ann['name'], ann['platform'], ann['followers'], ann['cost'], ann['risk']) == ('Ann', 'TT', 4000, 30.0, 0.3)
+    assert ann['fake'] == pytest.approx(0.25) and ann['eng_rate'] == pytest.approx(0.05)
+    assert (ann['age'], ann['region'], ann['gender']) == (30, 'EU', 'F')
+    assert (ann['IG_id'], ann['IG_followers'], ann['TT_id'], ann['TT_cost']) == ('ig_ann', 1000, 'tt_ann', 20.0)
+    assert G.nodes['tt_cy']['IG_id'] is None and G.nodes['tt_cy']['TT_followers'] == 10
+    # the ann/ann edge is gone; both ann-bob edges combine into one
+    assert G.number_of_edges() == 2
+    assert G.edges['ann', 'ig_bob'] == {'weight': 2.0, 'prob': pytest.approx(0.75)}
+    assert list(G.graph['influencer_table'].values('followers')) == [4000.0, 50.0, 10.0]
+
+
+def test_edges_without_identity_are_kept(tmp_path):
+    edges = pd.DataFrame({'source': ['a', 'b'], 'target': ['b', 'a'], 'weight': [1.0, 1.0],
+                          'prob': [0.5, 0.5], 'delay_hours': [5.0, 2.0]})
+    merged = merge_edges(edges)
+    assert merged.to_dict('records') == [{'source': 'a', 'target': 'b', 'weight': 2.0, 'prob': 0.75,
+                                          'delay_hours': 2.0}]
+
+
+def test_repeated_account_edges_are_not_combined():
+    edges = pd.DataFrame({'source': ['a', 'x', 'a', 'y'], 'target': ['b', 'b', 'b', 'b'],
+                          'weight': [1.0, 1.0, 3.0, 1.0], 'prob': [0.5, 0.5, 0.2, 0.5]})
+    identity = pd.DataFrame({'id': ['x', 'y'], 'creator': ['c', 'c']})
+    merged = merge_edges(edges, identity)
+    # a-b appears twice: the later row wins; x-b and y-b are two accounts of c, combined
+    assert merged.to_dict('records') == [{'source': 'c', 'target': 'b', 'weight': 2.0, 'prob': 0.75},
+                                         {'source': 'a', 'target': 'b', 'weight': 3.0, 'prob': 0.2}]
+
+
+def test_ambiguous_identity_is_rejected(write_file):
+    with pytest.raises(IngestError, match='several creators'):
+        read_identity(write_file('id.csv', "id,creator\nx,a\nx,b\n"))
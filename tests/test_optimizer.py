@@ -1,3 +1,4 @@
+import pytest
 import networkx as nx
 from core.optimizer import Optimizer
 
@@ -19,3 +20,212 @@ def test_solve_returns_selected():
     res = opt.solve(budget=60, risk_max=1.0, coverage=0.0)
     assert isinstance(res, dict)
     assert 'selected' in res
+
+
+def test_precheck_flags_unreachable_coverage():
+    G = nx.star_graph(4)  # hub 0 reaches everyone
+    for n in G.nodes():
+        G.nodes[n].update(cost=100 if n == 0 else 10, risk=0.1)
+    opt = Optimizer(G)
+    assert opt.precheck(budget=100, risk_max=1.0, coverage=1.0)['status'] == 'slack'
+    res = opt.precheck(budget=15, risk_max=1.0, coverage=1.0)
+    assert res['status'] == 'infeasible'
+    assert res['coverage_upper'] < 1.0
+
+
+def test_constrained_greedy_respects_risk_and_platform_bounds():
+    G = nx.Graph()
+    for i in range(6):
+        G.add_node(f'ig{i}', platform='IG', followers=1000, cost=10, risk=0.1)
+        G.add_node(f'tt{i}', platform='TT', followers=500, cost=10, risk=0.1)
+    for i in range(5):
+        G.add_edge(f'ig{i}', f'ig{i + 1}')
+    G.graph['platform_bounds'] = {'TT': {'min_pct': 40}}
+    opt = Optimizer(G)
+    sel = opt.constrained_greedy(budget=100, risk_max=0.5)
+    ev = opt.evaluate(sel, budget=100, risk_max=0.5)
+    assert ev['feasible']
+    assert sum(1 for n in sel if n.startswith('tt')) * 100 >= 40 * len(sel)
+    assert len(sel) == 5
+
+
+def test_local_search_two_for_one_swap():
+    G = nx.Graph()
+    G.add_node('h', cost=10)
+    for i in range(4):
+        G.add_edge('h', f'h{i}')
+    for n in ('a', 'b'):
+        G.add_node(n, cost=5)
+        G.add_edge(n, 'c1')
+        G.add_edge(n, 'c2')
+    for n in G.nodes():
+        G.nodes[n].setdefault('cost', 100)
+    opt = Optimizer(G)
+    greedy = opt.constrained_greedy(budget=10, risk_max=1.0)
+    assert sorted(greedy) == ['a', 'b']
+    improved = opt.local_search(greedy, budget=10, risk_max=1.0)
+    assert improved == ['h']
+    assert opt.evaluate(improved, 10, 1.0)['covered'] == 5
+
+
+def test_multi_start_keeps_best_and_reports_diversity():
+    G = nx.barabasi_albert_graph(60, 2, seed=3)
+    for n in G.nodes():
+        G.nodes[n].update(cost=10 + (n * 7) % 40, risk=0.01, platform='IG')
+    opt = Optimizer(G)
+    single = opt.evaluate(opt.local_search(opt.constrained_greedy(100, 1.0), 100, 1.0), 100, 1.0)
+    res = opt.multi_start(budget=100, risk_max=1.0, starts=4, workers=1)
+    assert res['feasible']
+    assert res['covered'] >= single['covered']
+    assert res['diversity']['starts'] == 4
+    assert 0.0 <= res['diversity']['mean_jaccard_distance'] <= 1.0
+
+
+def test_evolve_returns_feasible_selection_for_each_objective():
+    G = nx.barabasi_albert_graph(80, 2, seed=5)
+    for u, v in G.edges():
+        G.edges[u, v]['prob'] = 0.5
+    for n in G.nodes():
+        G.nodes[n].update(cost=10 + n % 30, risk=0.02, platform='IG', followers=100 * (n + 1), eng_rate=0.02, fake=0.1)
+    opt = Optimizer(G)
+    greedy = opt.evaluate(opt.constrained_greedy(150, 1.0), 150, 1.0)
+    for objective in ('coverage', 'expected_reach', 'roi', 'fake_adjusted'):
+        res = opt.evolve(budget=150, risk_max=1.0, objective=objective, population=16, generations=20, conv_value=2.0)
+        assert res['feasible']
+        assert res['generations'] == 20
+    res = opt.evolve(budget=150, risk_max=1.0, population=16, generations=20)
+    assert res['fitness'] >= greedy['covered']
+
+
+def test_solve_portfolio_reports_winning_engine():
+    G = nx.barabasi_albert_graph(50, 2, seed=7)
+    for n in G.nodes():
+        G.nodes[n].update(cost=10 + n % 20, risk=0.01, platform='IG')
+    opt = Optimizer(G)
+    res = opt.solve_portfolio(budget=80, risk_max=1.0, coverage=0.2, time_limit=2,
+                              engines=['greedy', 'multistart', 'evolve'], workers=1)
+    assert res['engine'] in ('greedy', 'multistart', 'evolve')
+    assert set(res['engines']) == {'greedy', 'multistart', 'evolve'}
+    assert opt.evaluate(res['selected'], 80, 1.0)['feasible']
+
+
+def test_repair_and_warm_start_after_budget_cut():
+    G = nx.star_graph(5)
+    for n in G.nodes():
+        G.nodes[n].update(cost=50 if n == 0 else 10, risk=0.1)
+    opt = Optimizer(G, candidates=[0, 1, 2, 3])
+    repaired = opt.repair([0, 1, 2, 5, 'ghost'], budget=55, risk_max=1.0)
+    assert repaired == [0]
+    assert opt.evaluate(repaired, 55, 1.0)['feasible']
+    # The greedy fallback polishes the repaired start (with Gurobi and coverage 0 the
+    # MILP optimum is the empty selection)
+    opt.use_gurobi = False
+    res = opt.solve(budget=55, risk_max=1.0, coverage=0.0, starts=[[0, 1, 2]])
+    assert opt.evaluate(res['selected'], 55, 1.0)['covered'] == 6
+
+
+def test_warm_starts_race_the_restarts():
+    G = nx.star_graph(5)
+    for n in G.nodes():
+        G.nodes[n].update(cost=10, risk=0.1)
+    opt = Optimizer(G)
+    opt.use_gurobi = False
+    res = opt.solve(budget=10, risk_max=1.0, coverage=0.0, starts=[[1]], restarts=3)
+    assert res['diversity']['starts'] == 4
+    assert res['selected'] == [0]
+
+
+def test_polished_incumbent_kept_only_when_objective_improves():
+    def star(hub_cost):
+        G = nx.star_graph(5)
+        for n in G.nodes():
+            G.nodes[n].update(cost=hub_cost if n == 0 else 10, risk=0.1)
+        return Optimizer(G)
+
+    opt = star(10)
+    res = {'selected': [1], 'objective': 123.0}
+    opt._polish_incumbent(res, budget=10, risk_max=1.0, coverage=0.5, ls_time=1.0)
+    assert res['selected'] == [0] and res['objective'] == pytest.approx(10 - 0.5 * 6)
+    assert sorted(res['reached']) == list(range(6))
+    # Reach goes up, but so does the cost-weighted objective
+    opt = star(100)
+    res = {'selected': [1], 'objective': 123.0}
+    opt._polish_incumbent(res, budget=100, risk_max=1.0, coverage=0.5, ls_time=1.0)
+    assert res['selected'] == [1] and res['objective'] == pytest.approx(10 - 0.5 * 2)
+
+
+def test_pool_graph_leaves_caches_behind():
+    import pickle
+    from core.optimizer import _pool_graph
+    G = nx.path_graph(4)
+    for n in G.nodes():
+        G.nodes[n].update(cost=10, risk=0.1)
+    G.graph['platform_bounds'] = {'IG': {'min_pct': 0, 'max_pct': 100}}
+    opt = Optimizer(G)
+    opt.reach.count(0)
+    assert 'reach_index' in G.graph
+    light = _pool_graph(G)
+    light.nodes[2]['cost'] = 99
+    assert G.nodes[2]['cost'] == 10
+    light = pickle.loads(pickle.dumps(_pool_graph(G)))
+    assert 'reach_index' not in light.graph and light.graph['platform_bounds'] == G.graph['platform_bounds']
+    assert list(light.edges()) == list(G.edges()) and light.nodes[2]['cost'] == 10
+
+
+def test_twin_groups_merge_leaf_followers():
+    G = nx.star_graph(4)  # leaves 1..4 are false twins of each other
+    G.add_edge('p', 'q')  # p and q are true twins
+    groups = {tuple(sorted(map(str, m))): closed for m, _, closed in Optimizer(G)._twin_groups()}
+    assert groups == {('0',): True, ('1', '2', '3', '4'): False, ('p', 'q'): True}
+
+
+def test_sensitivity_reports_binding_risk_dual():
+    pytest.importorskip('scipy')
+    G = nx.star_graph(4)
+    for n in G.nodes():
+        G.nodes[n].update(cost=15 if n == 0 else 10, risk=0.5 if n == 0 else 0.1)
+    opt = Optimizer(G)
+    opt.use_gurobi = False
+    rep = opt.sensitivity(budget=100, risk_max=0.3, coverage=0.8)
+    assert rep['backend'] == 'highs' and rep['status'] == 'optimal'
+    assert rep['duals']['budget'] == 0.0
+    assert rep['duals']['risk'] < 0.0  # a looser risk limit lowers cost - coverage x reach
+    assert set(rep['duals']) >= {'budget', 'risk', 'coverage'}
+
+
+def test_sensitivity_platform_price_per_point():
+    pytest.importorskip('scipy')
+    G = nx.Graph()
+    for n in range(6):
+        G.add_node(n, cost=1 if n < 3 else 10, risk=0.0, platform='IG' if n < 3 else 'TT')
+    reports = []
+    for pct in (50, 51):
+        G.graph['platform_bounds'] = {'IG': {'min_pct': 0, 'max_pct': pct}}
+        opt = Optimizer(G)
+        opt.use_gurobi = False
+        reports.append(opt.sensitivity(budget=100, risk_max=1.0, coverage=0.5))
+    # One more point of IG share is worth selection_size units of the plat_max_IG row
+    per_point = reports[0]['selection_size'] * reports[0]['duals']['plat_max_IG']
+    assert per_point == pytest.approx(reports[1]['objective'] - reports[0]['objective'])
+
+
+def test_solve_campaigns_shares_influencer_capacity():
+    from core.data_models import Campaign
+    G = nx.Graph()
+    for h, platform in (('ig', 'IG'), ('tt', 'TT'), ('yt', 'YT')):
+        G.add_node(h, cost=10, risk=0.1, platform=platform)
+        for k in range(4):
+            G.add_node(f'{h}{k}', cost=10, risk=0.1, platform=platform)
+            G.add_edge(h, f'{h}{k}')
+    campaigns = [Campaign('a', 10, 1.0, 0.0, 0.0), Campaign('b', 10, 1.0, 0.0, 0.0, platforms=['TT', 'YT'])]
+    opt = Optimizer(G)
+    opt.use_gurobi = False
+    res = opt.solve_campaigns(campaigns)
+    assert res['engine'] == 'greedy'
+    a, b = res['assignments']['a'], res['assignments']['b']
+    assert len(a) == 1 and len(b) == 1 and a != b
+    assert G.nodes[b[0]]['platform'] in ('TT', 'YT')
+    assert res['campaigns']['a']['covered'] == res['campaigns']['b']['covered'] == 5
+    G.nodes[a[0]]['capacity'] = 2
+    res = opt.solve_campaigns(campaigns)
+    assert res['assignments']['a'] == a and res['campaigns']['b']['feasible']
@@ -27,4 +27,76 @@ def test_solve_gurobi_if_available():
     # call internal gurobi solver directly
     res = opt._solve_gurobi(budget=60, risk_max=1.0, coverage=0.1, time_limit=10)
     assert isinstance(res, dict)
-    assert 'selected' in res
\ No newline at end of file
+    assert 'selected' in res
+
+
+def test_cancel_does_not_outlive_its_solve():
+    pytest.importorskip('gurobipy')
+    G = nx.star_graph(4)
+    for n in G.nodes():
+        G.nodes[n].update(cost=10, risk=0.1)
+    opt = Optimizer(G)
+    opt.cancel()
+    res = opt.solve(budget=20, risk_max=1.0, coverage=1.0, time_limit=10)
+    assert res.get('status') != 'cancelled' and opt.evaluate(res['selected'], 20, 1.0)['covered'] == len(G)
+
+
+def test_solve_gurobi_lazy_reach_matches_full_model():
+    gp = pytest.importorskip('gurobipy')
+    G = nx.star_graph(6)
+    G.add_edge(5, 6)
+    for n in G.nodes():
+        G.nodes[n].update(cost=30 if n == 0 else 10, risk=0.1)
+    opt = Optimizer(G)
+    full = opt._solve_gurobi(budget=40, risk_max=1.0, coverage=1.0, time_limit=10, lazy_reach=False)
+    lazy = opt._solve_gurobi(budget=40, risk_max=1.0, coverage=1.0, time_limit=10, lazy_reach=True)
+    assert lazy['objective'] == pytest.approx(full['objective'])
+    assert opt.evaluate(lazy['selected'], 40, 1.0)['covered'] == len(G)
+
+
+def test_solve_gurobi_twin_aggregation_keeps_objective():
+    pytest.importorskip('gurobipy')
+    G = nx.Graph()
+    for h in range(3):
+        G.add_node(f'h{h}', cost=30, risk=0.1)
+        for k in range(5):
+            G.add_edge(f'h{h}', f'f{h}_{k}')
+    for n in G.nodes():
+        G.nodes[n].setdefault('cost', 5)
+    opt = Optimizer(G)
+    plain = opt._solve_gurobi(budget=70, risk_max=1.0, coverage=0.6, time_limit=10, twins=False)
+    merged = opt._solve_gurobi(budget=70, risk_max=1.0, coverage=0.6, time_limit=10)
+    assert merged['groups'] < plain['groups']
+    assert merged['objective'] == pytest.approx(plain['objective'])
+    assert len(merged['reached']) >= 0.6 * len(G)
+
+
+def test_sensitivity_gurobi_matches_highs_duals():
+    pytest.importorskip('gurobipy')
+    pytest.importorskip('scipy')
+    G = nx.star_graph(4)
+    for n in G.nodes():
+        G.nodes[n].update(cost=15 if n == 0 else 10, risk=0.5 if n == 0 else 0.1)
+    opt = Optimizer(G)
+    grb = opt.sensitivity(budget=100, risk_max=0.3, coverage=0.8)
+    opt.use_gurobi = False
+    highs = opt.sensitivity(budget=100, risk_max=0.3, coverage=0.8)
+    assert grb['ranges']['risk'][0] <= 0.3 <= grb['ranges']['risk'][1]
+    for name, value in grb['duals'].items():
+        assert highs['duals'][name] == pytest.approx(value, abs=1e-6)
+    assert highs['selection_size'] == pytest.approx(grb['selection_size'])
+
+
+def test_solve_campaigns_milp_respects_capacity():
+    pytest.importorskip('gurobipy')
+    from core.data_models import Campaign
+    G = nx.star_graph(5)
+    G.add_edges_from([(10, 11), (10, 12)])
+    for n in G.nodes():
+        G.nodes[n].update(cost=10, risk=0.1)
+    campaigns = [Campaign('a', 10, 1.0, 0.5, 1.0), Campaign('b', 10, 1.0, 0.2, 1.0)]
+    res = Optimizer(G).solve_campaigns(campaigns, time_limit=10)
+    assert res['engine'] == 'milp'
+    assert res['assignments']['a'] == [0]
+    assert 0 not in res['assignments']['b']
+    assert all(stats['feasible'] and stats['meets_coverage'] for stats in res['campaigns'].values())
@@ -0,0 +1,60 @@
+import networkx as nx
+
+from core.optimizer import Optimizer
+from core.reach_index import ReachIndex, get_reach_index
+
+
+def test_rows_follow_hops_and_probability_threshold():
+    G = nx.path_graph(5)
+    G.add_edge(3, 4, prob=0.2)
+    one = ReachIndex(G)
+    assert one.neighborhood(2) == {1, 2, 3}
+    two = ReachIndex(G, hops=2)
+    assert two.neighborhood(2) == {0, 1, 2, 3, 4}
+    assert list(two.row(2)) == [0, 1, 2, 3, 4]
+    strict = ReachIndex(G, hops=2, min_prob=0.5)
+    assert strict.neighborhood(2) == {0, 1, 2, 3}
+    assert strict.reached([0]) == [0, 1, 2]
+
+
+def test_index_is_cached_until_graph_changes():
+    G = nx.path_graph(3)
+    first = get_reach_index(G, hops=2)
+    assert get_reach_index(G, hops=2) is first
+    G.add_edge(2, 3)
+    assert get_reach_index(G, hops=2) is not first
+
+
+def test_optimizer_counts_two_hop_coverage():
+    G = nx.path_graph(5)
+    for n in G.nodes():
+        G.nodes[n].update(cost=10, risk=0.1)
+    opt = Optimizer(G, hops=2)
+    assert opt.evaluate([2], budget=10, risk_max=1.0)['covered'] == 5
+    assert opt.constrained_greedy(budget=10, risk_max=1.0) == [2]
+
+
+def test_optimizer_resolves_index_once(monkeypatch):
+    import core.optimizer
+    calls = []
+
+    def counting(*args):
+        calls.append(args)
+        return get_reach_index(*args)
+
+    monkeypatch.setattr(core.optimizer, 'get_reach_index', counting)
+    G = nx.path_graph(6)
+    opt = Optimizer(G, hops=2)
+    opt.constrained_greedy(budget=10, risk_max=1.0)
+    opt.evaluate([0, 3], budget=10, risk_max=1.0)
+    assert len(calls) == 1
+
+
+def test_optimizer_uses_given_caches():
+    from core.data_models import InfluencerTable
+    G = nx.path_graph(6)
+    table, reach = InfluencerTable.from_graph(G), ReachIndex(G, hops=2)
+    opt = Optimizer(G, hops=2, table=table, reach=reach)
+    opt.evaluate(opt.constrained_greedy(budget=10, risk_max=1.0), budget=10, risk_max=1.0)
+    assert opt.table is table and opt.reach is reach
+    assert 'reach_index' not in G.graph and 'influencer_table' not in G.graph
@@ -20,3 +20,12 @@ def test_compare_metrics():
     m = store.compare_metrics([0, 1])
     assert m['budget'] == [100, 200]
     assert m['reach'] == [1200, 2200]
+
+
+def test_most_similar_skips_scenarios_without_selection():
+    store = ScenarioStore()
+    store.add(Scenario('far', {'budget': 1000, 'risk_max': 0.5}, {'selected': ['a']}))
+    store.add(Scenario('empty', {'budget': 110, 'risk_max': 0.2}, {}))
+    store.add(Scenario('near', {'budget': 120, 'risk_max': 0.2}, {'selected': ['b']}))
+    best = store.most_similar({'budget': 100, 'risk_max': 0.2}, k=2)
+    assert [s.name for s in best] == ['near', 'far']
@@ -1,14 +1,49 @@
 """Export helpers for InfluenceOpt"""
 import csv
-from typing import Iterable
+from typing import Iterable, Sequence
 
 
-def export_selection_csv(path: str, selected_ids: Iterable[str]) -> None:
+# Attribute columns written next to the ids when an InfluencerTable is given
+SELECTION_COLUMNS = ('name', 'platform', 'followers', 'cost', 'risk', 'fake', 'eng_rate')
+
+
+def export_selection_csv(path: str, selected_ids: Iterable[str], table=None,
+                         columns: Sequence[str] = SELECTION_COLUMNS, deferred=None) -> None:
+    """Write the selected ids, plus their attribute `columns` read from `table` when given.
+
+    With a lazily loaded dataset, `deferred` (its `DeferredAttributes`) supplies
+    the columns the table does not hold yet; only the selected rows are read.
+    """
+    selected_ids = list(selected_ids)
+    if table is not None:
+        selected_ids = [i for i in selected_ids if i in table]
+        idx = table.index(selected_ids)
+        extra = [c for c in columns if deferred is not None and c in deferred.columns]
+        lazy = deferred.frame(selected_ids, extra).set_index('id').reindex(selected_ids) if extra else None
+        values = []
+        for c in columns:
+            if c == 'name':
+                col = table.names[idx].tolist()
+            elif c in table.codes:
+                col = table.labels(c, selected_ids).tolist()
+            elif c in table.numeric:
+                col = [None if v != v else (int(v) if c == 'followers' else v)
+                       for v in table.values(c, selected_ids, default=None).tolist()]
+            else:
+                col = [None] * len(selected_ids)
+            if c in extra:
+                fill = lazy[c].astype(object).where(lazy[c].notna(), None).tolist()
+                col = [f if v is None else v for v, f in zip(col, fill)]
+            values.append(['' if v is None else v for v in col])
     with open(path, 'w', newline='', encoding='utf-8') as f:
         w = csv.writer(f)
-        w.writerow(['id'])
-        for i in selected_ids:
-            w.writerow([i])
+        if table is None:
+            w.writerow(['id'])
+            for i in selected_ids:
+                w.writerow([i])
+        else:
+            w.writerow(['id', *columns])
+            w.writerows(zip(selected_ids, *values))
 
 
 def export_brief_pptx(path: str, scenario, screenshot_path: str | None = None) -> None: